@@ -0,0 +1,153 @@
+import operator
+import random
+from avl import AVLNode, AVL
+
+
+def _same_value(value: object) -> object:
+    """
+    The default measure: every value contributes itself to the aggregate.
+
+    :param value: A value of the tree.
+    :return: The value.
+    """
+    return value
+
+
+# AggregateAVLNode is an AVL node that also stores the aggregate of its subtree.
+class AggregateAVLNode(AVLNode):
+    def __init__(self, value: object) -> None:
+        """
+        Initialize an AggregateAVL node. The aggregate is filled in when the node is linked into the tree.
+
+        :param value: The value to be stored in the node.
+        """
+        super().__init__(value)
+        self.aggregate = None  # The combined measure of every value in the subtree rooted at this node
+
+    def __str__(self) -> str:
+        """
+        String representation of an AggregateAVL node.
+
+        :return: A string representation of the node.
+        """
+        return 'AggregateAVL Node: {} ({})'.format(self.value, self.aggregate)
+
+
+# AggregateAVL is an AVL tree augmented with subtree aggregates of a monoid.
+class AggregateAVL(AVL):
+    """
+    AggregateAVL Class.
+
+    This class keeps, in every node, the aggregate of its subtree under a user-supplied monoid: an associative
+    combine function with an identity element, applied to a measure of each value (for example sum, min, max
+    or count). The aggregates are refreshed wherever the AVL tree refreshes subtree sizes, so
+    aggregate(low, high) answers range queries in O(log n).
+    """
+    def __init__(self, start_tree=None, combine=operator.add, identity: object = 0, measure=_same_value,
+                 key=None) -> None:
+        """
+        Initialize an AggregateAVL.
+
+        :param start_tree: An iterable of values to initialize the tree.
+        :param combine: An associative function of two aggregates. It is applied in value order, so it does
+                        not need to be commutative.
+        :param identity: The aggregate of an empty range.
+        :param measure: A function mapping each value to its contribution to the aggregate.
+        :param key: A function mapping a value to the key it is ordered by, or None to order values directly.
+        """
+        self._combine = combine
+        self._identity = identity
+        self._measure = measure
+        super().__init__(start_tree, key)
+
+    def aggregate(self, low: object = None, high: object = None) -> object:
+        """
+        Combine the measures of the values v with low <= v <= high, in ascending order, in O(log n).
+
+        :param low: The lower bound (inclusive), or None for no lower bound.
+        :param high: The upper bound (inclusive), or None for no upper bound.
+        :return: The aggregate of the range, or the identity if it is empty.
+        """
+        if low is not None:
+            low = self._key_of(low)
+        if high is not None:
+            high = self._key_of(high)
+        return self._aggregate_range(self._root, low, high)
+
+    def _aggregate_range(self, node: AggregateAVLNode, low: object, high: object) -> object:
+        """
+        Recursive helper for aggregate(). Once a node is inside the range, one of its subtrees is bounded
+        on a single side, and every subtree that is entirely in range contributes its stored aggregate.
+
+        :param node: The root of the subtree.
+        :param low: The key of the lower bound (inclusive), or None for no lower bound.
+        :param high: The key of the upper bound (inclusive), or None for no upper bound.
+        :return: The aggregate of the values of the subtree within the bounds.
+        """
+        while node is not None:
+            if low is not None and node.key < low:  # The node and its left subtree are below the range
+                node = node.right
+            elif high is not None and high < node.key:  # The node and its right subtree are above the range
+                node = node.left
+            else:
+                break
+        if node is None:
+            return self._identity
+        if low is None:
+            left = node.left.aggregate if node.left is not None else self._identity
+        else:
+            left = self._aggregate_range(node.left, low, None)
+        if high is None:
+            right = node.right.aggregate if node.right is not None else self._identity
+        else:
+            right = self._aggregate_range(node.right, None, high)
+        return self._combine(self._combine(left, self._measure(node.value)), right)
+
+    def _create_node(self, value: object) -> AggregateAVLNode:
+        """
+        Create a detached node that can hold an aggregate.
+
+        :param value: The value to be stored in the node.
+        :return: The new node.
+        """
+        return AggregateAVLNode(value)
+
+    def _update_augment(self, node: AggregateAVLNode) -> None:
+        """
+        Updates the size and the aggregate of a node from its children.
+
+        :param node: The node to update.
+        """
+        super()._update_augment(node)
+        aggregate = self._measure(node.value)
+        if node.left is not None:
+            aggregate = self._combine(node.left.aggregate, aggregate)
+        if node.right is not None:
+            aggregate = self._combine(aggregate, node.right.aggregate)
+        node.aggregate = aggregate
+
+
+if __name__ == '__main__':
+    print("\nPDF - AggregateAVL example 1")
+    print("----------------------------")
+    tree = AggregateAVL([10, 20, 5, 15, 17, 7, 12])
+    print(tree)
+    print("Sum of [7, 17]:", tree.aggregate(7, 17))
+    tree = AggregateAVL([10, 20, 5, 15, 17, 7, 12], combine=max, identity=float('-inf'),
+                        measure=lambda value: -value)
+    print("Max of -v for v in [7, 17]:", tree.aggregate(7, 17))
+
+    print("\nPDF - AggregateAVL add() and remove() stress test")
+    print("-------------------------------------------------")
+    for _ in range(100):
+        case = list(set(random.randrange(1, 20000) for _ in range(900)))
+        tree = AggregateAVL(case[:300])
+        for value in case[300:]:
+            tree.add(value)
+        for value in case[::2]:
+            tree.remove(value)
+        values = list(tree)
+        low, high = random.randrange(1, 20000), random.randrange(1, 20000)
+        if tree.aggregate(low, high) != sum(value for value in values if low <= value <= high):
+            raise Exception("PROBLEM WITH AGGREGATE OPERATION")
+    print('add() and remove() stress test finished')
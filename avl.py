@@ -1,19 +1,23 @@
 import random
+from bisect import bisect_left, bisect_right
 from queue_ import Queue
 from stack import Stack
 from bst import BSTNode, BST
+from avl_cursor import AVLCursor
 
 class AVLNode(BSTNode):
     def __init__(self, value: object) -> None:
         """
         Initialize an AVL node with a given value. 
-        The node also has attributes for the parent (initially None) and the height (initially 0).
+        The node also has attributes for the parent (initially None), the height (initially 0) and the
+        number of nodes in its subtree (initially 1).
         
         :param value: The value to be stored in the node.
         """
         super().__init__(value)
         self.parent = None  # The parent of this node, initially None
         self.height = 0  # The height of the node within the tree, initially 0
+        self.size = 1  # The number of nodes in the subtree rooted at this node, initially 1
 
     def __str__(self) -> str:
         """
@@ -25,13 +29,63 @@ class AVLNode(BSTNode):
         return 'AVL Node: {}'.format(self.value)
 
 class AVL(BST):
-    def __init__(self, start_tree=None) -> None:
+    _distinct = True  # Duplicate values are ignored
+    _transient = ('_min_node', '_max_node')  # Caches that are not pickled
+    _min_node = None  # The node of the smallest value, or None if unknown (recomputed on demand)
+    _max_node = None  # The node of the largest value, or None if unknown (recomputed on demand)
+
+    def __init__(self, start_tree=None, key=None) -> None:
         """
-        Initialize an AVL tree. If a start_tree is provided, it is used to initialize the AVL tree.
+        Initialize an AVL tree. If a start_tree is provided, its values are sorted once (skipped when they
+        already arrive in order), de-duplicated and built bottom-up into a perfectly balanced tree in linear time.
+
+        Like sorted(), the tree can order its values by a key function. The key of a value is computed once
+        when the value is inserted and cached in its node, and each level of a search then costs at most two
+        comparisons of keys. Values with equal keys are treated as the same value.
         
-        :param start_tree: A list of values to initialize the AVL tree.
+        :param start_tree: An iterable of values to initialize the AVL tree.
+        :param key: A function mapping a value to the key it is ordered by, or None to order values directly.
+        """
+        self._key = key
+        super().__init__()
+        if start_tree is not None:
+            values = list(start_tree)
+            keys = values if key is None else [key(value) for value in values]
+            if any(keys[i] < keys[i - 1] for i in range(1, len(keys))):  # Only sort unordered input
+                values.sort(key=key)
+            self._root = self._build_balanced(self._sorted_values(values))
+
+    def _build_balanced(self, values: list) -> AVLNode:
+        """
+        Build a perfectly balanced subtree from a list of distinct values in ascending order.
+
+        :param values: The values to be stored in the subtree.
+        :return: The root of the new subtree, or None if values is empty.
+        """
+        keys = values if self._key is None else [self._key(value) for value in values]
+        return self._build_range(values, keys, 0, len(values) - 1, None)
+
+    def _build_range(self, values: list, keys: list, low: int, high: int, parent: AVLNode) -> AVLNode:
+        """
+        Recursive helper for _build_balanced. The middle value becomes the subtree root, so both halves
+        differ in size by at most one and every height can be computed on the way back up.
+
+        :param values: The values to be stored in the tree.
+        :param keys: The key of each value.
+        :param low: Index of the first value of this subtree.
+        :param high: Index of the last value of this subtree.
+        :param parent: The parent of the subtree root.
+        :return: The root of the subtree, or None if the range is empty.
         """
-        super().__init__(start_tree)
+        if low > high:
+            return None
+        middle = (low + high) // 2
+        node = self._new_node(values[middle], keys[middle])
+        node.parent = parent
+        node.left = self._build_range(values, keys, low, middle - 1, node)
+        node.right = self._build_range(values, keys, middle + 1, high, node)
+        self._update_node(node)
+        return node
 
     def __str__(self) -> str:
         """
@@ -43,6 +97,75 @@ class AVL(BST):
         super()._str_helper(self._root, values)
         return "AVL pre-order { " + ", ".join(values) + " }"
 
+    def __len__(self) -> int:
+        """
+        Return the number of values in the AVL tree in O(1) using the size stored at the root.
+
+        :return: The number of values in the tree.
+        """
+        return self._get_size(self._root)
+
+    def rank(self, value: object) -> int:
+        """
+        Count the values in the tree that are strictly less than a given value in O(log n).
+
+        :param value: The value to rank. It does not need to be in the tree.
+        :return: The number of values less than value.
+        """
+        return self._count_below(self._key_of(value), False)
+
+    def select(self, k: int) -> object:
+        """
+        Return the k-th smallest value in the tree (0-based) in O(log n).
+
+        :param k: The position of the value in sorted order.
+        :return: The value at position k.
+        :raises IndexError: If k is outside the range [0, len(tree)).
+        """
+        if k < 0 or k >= self._get_size(self._root):
+            raise IndexError("AVL index out of range")
+        node = self._root
+        while True:
+            left_size = self._get_size(node.left)
+            if k < left_size:  # The value is in the left subtree
+                node = node.left
+            elif k == left_size:  # The value is at this node
+                return node.value
+            else:  # Skip the left subtree and this node
+                k -= left_size + 1
+                node = node.right
+
+    def count_range(self, low: object, high: object) -> int:
+        """
+        Count the values v in the tree with low <= v <= high in O(log n).
+
+        :param low: The lower bound (inclusive).
+        :param high: The upper bound (inclusive).
+        :return: The number of values within the bounds.
+        """
+        low, high = self._key_of(low), self._key_of(high)
+        if high < low:
+            return 0
+        return self._count_below(high, True) - self._count_below(low, False)
+
+    def _count_below(self, key: object, inclusive: bool) -> int:
+        """
+        Count the values whose keys are less than (or, if inclusive, less than or equal to) a given key.
+
+        :param key: The key of the bound to count against.
+        :param inclusive: Whether values equal to the bound are counted.
+        :return: The number of values below the bound.
+        """
+        node = self._root
+        count = 0
+        while node is not None:
+            if node.key < key or (inclusive and not key < node.key):
+                count += self._get_size(node.left) + 1  # This node and its left subtree are below
+                node = node.right
+            else:
+                node = node.left
+        return count
+
     def print_tree(self):
         """
         Print the AVL tree by calling the helper function _print_tree_helper starting from the root.
@@ -93,7 +216,7 @@ class AVL(BST):
                     print(f"Error: Node {node.value} has an invalid balance factor ({balance_factor})")
                     return False
                 if node.parent:  # If this node has a parent
-                    if node.value < node.parent.value:  # This node should be the left child of its parent
+                    if node.key < node.parent.key:  # This node should be the left child of its parent
                         check_node = node.parent.left
                     else:  # This node should be the right child of its parent
                         check_node = node.parent.right
@@ -116,25 +239,183 @@ class AVL(BST):
 
         :param value: The value to add to the tree.
         """
-        new_node = AVLNode(value)  # Create the new node
-        node = self._root
+        self._find_or_insert(value)
+
+    def _find_or_insert(self, value: object, start: AVLNode = None) -> tuple:
+        """
+        Find the node holding a value, inserting and rebalancing a new node if there is none.
+        Both outcomes cost a single search, from the root or, given a starting node, from the lowest
+        ancestor of that node whose subtree can hold the value (see _finger_top).
+
+        :param value: The value to look for.
+        :param start: A node of the tree to search from, or None to search from the root.
+        :return: A tuple (node, inserted) with the node holding the value and whether it was just created.
+        """
+        key = value if self._key is None else self._key(value)
+        if start is None:
+            node = self._root
+            if node is not None:
+                # A new extreme goes straight below the cached node of the current one
+                last = self._last_node()
+                if last.key < key:
+                    return self._link_new_node(last, self._new_node(value, key)), True
+                first = self._first_node()
+                if key < first.key:
+                    return self._link_new_node(first, self._new_node(value, key)), True
+        else:
+            node = self._finger_top(start, key)
         parent_node = None
         while node:  # Find the correct location for the new node
             parent_node = node
-            if value < node.value:
+            if key < node.key:
                 node = node.left
-            elif value > node.value:
+            elif node.key < key:
                 node = node.right
             else:
-                return  # Value already exists in the tree
+                return node, False  # Value already exists in the tree
+        new_node = self._new_node(value, key)  # Create the new node
+        self._link_new_node(parent_node, new_node)
+        return new_node, True
+
+    def _first_node(self) -> AVLNode:
+        """
+        Get the node of the smallest value, from the cache when it is known.
+
+        :return: The left most node, or None if the tree is empty.
+        """
+        node = self._min_node
+        if node is None and self._root is not None:
+            node = self._min_node = self._leftmost(self._root)
+        return node
+
+    def _last_node(self) -> AVLNode:
+        """
+        Get the node of the largest value, from the cache when it is known.
+
+        :return: The right most node, or None if the tree is empty.
+        """
+        node = self._max_node
+        if node is None and self._root is not None:
+            node = self._max_node = self._rightmost(self._root)
+        return node
+
+    def _finger_top(self, start: AVLNode, key: object) -> AVLNode:
+        """
+        Find the lowest ancestor of a node (or the node itself) whose subtree covers a key, that is whose
+        nearest ancestors on the left and on the right hold keys below and above it. Climbing from the start
+        node, each ancestor reached through a right link bounds the subtree from below and each one reached
+        through a left link bounds it from above; only the first bound of each side needs a comparison. When
+        a bound excludes the key the climb continues past it. A search from the returned node then costs
+        O(log d) comparisons for a key d positions away from the start in the typical case, and O(log n) when
+        the two are on opposite sides of a high node.
+
+        :param start: A node of the tree.
+        :param key: The key to search for.
+        :return: The node to start the search from.
+        """
+        top = probe = start
+        below = above = False  # Whether the key is known to be above / below the bounds of top's subtree
+        while not (below and above):
+            parent = probe.parent
+            if parent is None:
+                break
+            if probe is parent.right:  # parent.key is a lower bound of probe's subtree
+                if not below:
+                    if parent.key < key:
+                        below = True
+                    else:
+                        top = parent
+            elif not above:  # parent.key is an upper bound of probe's subtree
+                if key < parent.key:
+                    above = True
+                else:
+                    top = parent
+            probe = parent
+        return top
+
+    def cursor(self, value: object = None) -> AVLCursor:
+        """
+        Create a cursor on the tree, positioned on the first value greater than or equal to a given value.
+
+        :param value: The value to position the cursor at, or None for the smallest value.
+        :return: The new cursor.
+        """
+        cursor = AVLCursor(self)
+        if value is None:
+            cursor._node = self._first_node()
+        else:
+            cursor.seek(value)
+        return cursor
+
+    def _add_near(self, value: object, start: AVLNode) -> AVLNode:
+        """
+        Add a value, searching from a node of the tree. Used by AVLCursor.insert_near().
+
+        :param value: The value to add.
+        :param start: A node of the tree to search from, or None to search from the root.
+        :return: The node holding the value.
+        """
+        return self._find_or_insert(value, start)[0]
+
+    def _remove_at(self, node: AVLNode) -> AVLNode:
+        """
+        Remove the value held by a node. Used by AVLCursor.remove_here().
+
+        :param node: A node of the tree.
+        :return: The node that holds the next value afterwards, or None if the removed value was the largest.
+        """
+        if node.left is not None and node.right is not None:  # The node takes over its successor's payload
+            self._remove_node(node)
+            return node
+        successor = self.successor(node)
+        self._remove_node(node)
+        return successor
+
+    def _new_node(self, value: object, key: object) -> AVLNode:
+        """
+        Create a detached node for a value whose key is already computed.
+
+        :param value: The value to be stored in the node.
+        :param key: The key of the value.
+        :return: The new node.
+        """
+        node = self._create_node(value)
+        node.key = key
+        return node
+
+    def _create_node(self, value: object) -> AVLNode:
+        """
+        Create a detached node for a value. Subclasses override this to use their own node type.
+
+        :param value: The value to be stored in the node.
+        :return: The new node.
+        """
+        return AVLNode(value)
+
+    def _link_new_node(self, parent_node: AVLNode, new_node: AVLNode) -> AVLNode:
+        """
+        Attach a new leaf below parent_node (or as the root when parent_node is None) and rebalance.
+        Rotations keep the left most and right most nodes in place, so only a new leaf below one of
+        them changes the cached extremes.
+
+        :param parent_node: The node that becomes the parent of the new node.
+        :param new_node: The detached node to attach.
+        :return: The new node.
+        """
         new_node.parent = parent_node  # Set the parent of the new node
         if parent_node is None:  # If the tree was empty, the new node is now the root
-            self._root = new_node
-        elif value < parent_node.value:  # Insert the new node to the correct position
+            self._root = self._min_node = self._max_node = new_node
+        elif new_node.key < parent_node.key:  # Insert the new node to the correct position
             parent_node.left = new_node
+            if parent_node is self._min_node:
+                self._min_node = new_node
         else:
             parent_node.right = new_node
-        self._rebalance(new_node)  # Rebalance the tree
+            if parent_node is self._max_node:
+                self._max_node = new_node
+        self._update_node(new_node)
+        self._retrace(parent_node)  # Rebalance the tree
+        return new_node
 
     def remove(self, value: object) -> bool:
         """
@@ -144,19 +425,51 @@ class AVL(BST):
         :param value: The value to remove from the tree.
         :return: True if the node was successfully removed, otherwise False.
         """
+        node = self._find_node(value)
+        if node is None:  # The value is not found in the tree
+            return False
+        self._remove_node(node)
+        return True
+
+    def _find_node(self, value: object) -> AVLNode:
+        """
+        Find the node holding a value.
+
+        :param value: The value to look for.
+        :return: The node holding the value, or None if the value is not in the tree.
+        """
+        key = value if self._key is None else self._key(value)
         node = self._root  # Starting from the root
-        parent_node = None
-        # Find the node with the given value
         while node is not None:
-            if node.value == value:
-                break
-            parent_node = node  # Keep track of the parent node
-            if value < node.value:  # Go to the left child
+            if key < node.key:  # Go to the left child
                 node = node.left
-            else:  # Go to the right child
+            elif node.key < key:  # Go to the right child
                 node = node.right
-        if node is None:  # The value is not found in the tree
-            return False
+            else:
+                break
+        return node
+
+    def contains(self, value: object) -> bool:
+        """
+        Check if the AVL tree contains a value.
+
+        :param value: The value to check.
+        :return: True if the tree contains the value, False otherwise.
+        """
+        return self._find_node(value) is not None
+
+    def _remove_node(self, node: AVLNode) -> None:
+        """
+        Unlink a node from the tree and rebalance. A node with two children takes over the payload of its
+        in-order successor, and the successor's node is unlinked instead.
+
+        :param node: The node to remove.
+        """
+        if node is self._min_node:  # The extremes have at most one child, so their own node is unlinked
+            self._min_node = self.successor(node)
+        if node is self._max_node:
+            self._max_node = self.predecessor(node)
+        parent_node = node.parent
         if node.left is None and node.right is None:  # The node is a leaf node
             if parent_node is None:  # The tree only has one node
                 self._root = None
@@ -166,7 +479,7 @@ class AVL(BST):
                 else:
                     parent_node.right = None
             # Rebalance the tree after removing the node
-            self._rebalance(parent_node)
+            self._retrace(parent_node)
         elif node.left is None or node.right is None:  # The node has one child
             new_node = node.left if node.left is not None else node.right
             if parent_node is None:  # The node is the root
@@ -179,7 +492,7 @@ class AVL(BST):
             if new_node is not None:
                 new_node.parent = parent_node
             # Rebalance the tree after replacing the node
-            self._rebalance(new_node)
+            self._retrace(parent_node)
         else:  # The node has two children
             # Find the in-order successor of the node
             successor = node.right
@@ -188,7 +501,9 @@ class AVL(BST):
                 successor_parent = successor
                 successor = successor.left
             # Replace the node's value with its successor's value
-            node.value = successor.value
+            self._copy_payload(node, successor)
+            if successor is self._max_node:  # The largest value now lives in this node
+                self._max_node = node
             # Remove the successor from its parent
             if successor_parent.left == successor:
                 successor_parent.left = successor.right
@@ -197,8 +512,271 @@ class AVL(BST):
             if successor.right is not None:
                 successor.right.parent = successor_parent
             # Rebalance the tree after removing the successor
-            self._rebalance(successor_parent)
-        return True
+            self._retrace(successor_parent)
+
+    def find_min(self) -> object:
+        """
+        Find the minimum value in O(1) from the cached left most node.
+
+        :return: The minimum value, or None if the tree is empty.
+        """
+        node = self._first_node()
+        return None if node is None else node.value
+
+    def find_max(self) -> object:
+        """
+        Find the maximum value in O(1) from the cached right most node.
+
+        :return: The maximum value, or None if the tree is empty.
+        """
+        node = self._last_node()
+        return None if node is None else node.value
+
+    def pop_min(self) -> object:
+        """
+        Remove and return the minimum value, so the tree can serve as a double-ended priority queue.
+        The left most node has no left child, so its removal needs no search.
+
+        :return: The minimum value.
+        :raises IndexError: If the tree is empty.
+        """
+        node = self._first_node()
+        if node is None:
+            raise IndexError("pop from an empty AVL tree")
+        value = node.value
+        self._remove_at(node)
+        return value
+
+    def pop_max(self) -> object:
+        """
+        Remove and return the maximum value.
+
+        :return: The maximum value.
+        :raises IndexError: If the tree is empty.
+        """
+        node = self._last_node()
+        if node is None:
+            raise IndexError("pop from an empty AVL tree")
+        value = node.value
+        self._remove_at(node)
+        return value
+
+    def make_empty(self) -> None:
+        """
+        Empty the AVL tree.
+        """
+        self._root = self._min_node = self._max_node = None
+
+    def successor(self, node: AVLNode) -> AVLNode:
+        """
+        Find the node that follows a node of the tree in order, following parent links instead of descending
+        from the root. Stepping through all n nodes this way visits each link at most twice, so each step costs
+        O(1) amortized.
+
+        :param node: A node of the tree.
+        :return: The next node in order, or None if node holds the largest value.
+        """
+        if node.right is not None:
+            return self._leftmost(node.right)
+        while node.parent is not None and node is node.parent.right:  # Climb out of right subtrees
+            node = node.parent
+        return node.parent
+
+    def predecessor(self, node: AVLNode) -> AVLNode:
+        """
+        Find the node that precedes a node of the tree in order, following parent links, in O(1) amortized.
+
+        :param node: A node of the tree.
+        :return: The previous node in order, or None if node holds the smallest value.
+        """
+        if node.left is not None:
+            return self._rightmost(node.left)
+        while node.parent is not None and node is node.parent.left:  # Climb out of left subtrees
+            node = node.parent
+        return node.parent
+
+    def _copy_payload(self, target: AVLNode, source: AVLNode) -> None:
+        """
+        Copy everything a node stores for its user (but not its links or derived fields) from another node.
+
+        :param target: The node receiving the payload.
+        :param source: The node whose payload is copied.
+        """
+        target.value = source.value
+        target.key = source.key
+
+    def add_many(self, values) -> int:
+        """
+        Add a batch of values. The batch is sorted once, built into a balanced tree and merged with a
+        join-based union, so the descents for neighbouring values share their path prefixes and each
+        rebalancing step is done once per merged subtree instead of once per value.
+
+        :param values: An iterable of values to add.
+        :return: The number of values that were not already in the tree.
+        """
+        batch = self._empty_like()
+        batch._root = batch._build_balanced(self._sorted_values(sorted(values, key=self._key)))
+        count = len(self)
+        self.union(batch)
+        return len(self) - count
+
+    def remove_many(self, values) -> int:
+        """
+        Remove a batch of values using the same sorted, join-based merge as add_many.
+
+        :param values: An iterable of values to remove.
+        :return: The number of values that were in the tree and have been removed.
+        """
+        batch = self._empty_like()
+        batch._root = batch._build_balanced(self._sorted_values(sorted(values, key=self._key)))
+        count = len(self)
+        self.difference(batch)
+        return count - len(self)
+
+    def contains_many(self, values) -> list:
+        """
+        Check a batch of values with one coordinated descent. The batch is sorted, and at each node it is
+        partitioned with bisect so that every node on the shared paths is visited once for the whole batch.
+
+        :param values: An iterable of values to check.
+        :return: A list of booleans, one per value in the input order, telling whether it is in the tree.
+        """
+        keys = list(values) if self._key is None else [self._key(value) for value in values]
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        probes = [keys[index] for index in order]
+        found = [False] * len(keys)
+        self._contains_batch(self._root, probes, order, 0, len(probes), found)
+        return found
+
+    def _contains_batch(self, node: AVLNode, probes: list, order: list, low: int, high: int, found: list) -> None:
+        """
+        Recursive helper for contains_many that resolves the sorted probes low..high-1 within a subtree.
+
+        :param node: The root of the subtree.
+        :param probes: The sorted keys of the batch.
+        :param order: The input position of each sorted probe.
+        :param low: The first probe to resolve.
+        :param high: One past the last probe to resolve.
+        :param found: The per-input results, updated in place.
+        """
+        while node is not None and low < high:
+            if high - low == 1:  # A single probe left, finish with a plain descent
+                probe = probes[low]
+                while node is not None:
+                    if probe < node.key:
+                        node = node.left
+                    elif node.key < probe:
+                        node = node.right
+                    else:
+                        found[order[low]] = True
+                        return
+                return
+            first_equal = bisect_left(probes, node.key, low, high)
+            after_equal = bisect_right(probes, node.key, first_equal, high)
+            for index in range(first_equal, after_equal):  # Probes equal to this node
+                found[order[index]] = True
+            self._contains_batch(node.left, probes, order, low, first_equal, found)
+            node, low = node.right, after_equal  # Continue with the larger probes in the right subtree
+
+    def copy(self) -> 'AVL':
+        """
+        Make an independent copy of the tree in linear time.
+
+        :return: A new tree with the same values (and payloads, for subclasses that store them).
+        """
+        tree = self._empty_like()
+        nodes = list(self._irange_nodes(None, None, (True, True), False))
+        tree._root = tree._build_balanced([node.value for node in nodes])
+        for new_node, node in zip(tree._irange_nodes(None, None, (True, True), False), nodes):
+            tree._copy_payload(new_node, node)
+        return tree
+
+    def split(self, value: object) -> tuple:
+        """
+        Split the tree around a value in O(log n). This tree is left empty.
+
+        :param value: The value to split around.
+        :return: A tuple (smaller, found, larger) with a tree of the values less than value, whether value
+                 was in the tree, and a tree of the values greater than value.
+        """
+        smaller, found, larger = self._split_node(self._detach_root(), self._key_of(value))
+        smaller_tree, larger_tree = self._empty_like(), self._empty_like()
+        smaller_tree._root, larger_tree._root = smaller, larger
+        return smaller_tree, found is not None, larger_tree
+
+    @classmethod
+    def join(cls, left: 'AVL', pivot: object, right: 'AVL') -> 'AVL':
+        """
+        Join two trees and a pivot value in O(|height(left) - height(right)| + 1). Every value of left must be
+        less than pivot and every value of right greater than it. Both trees are left empty.
+
+        :param left: The tree of the values less than pivot.
+        :param pivot: The value between the two trees.
+        :param right: The tree of the values greater than pivot.
+        :return: A new tree with the values of left, pivot and the values of right.
+        :raises ValueError: If the values are not ordered around the pivot.
+        """
+        key = left._key_of(pivot)
+        if (not left.is_empty() and not left._rightmost(left._root).key < key) or \
+                (not right.is_empty() and not key < right._leftmost(right._root).key):
+            raise ValueError("Values must be ordered as left < pivot < right")
+        tree = left._empty_like()
+        node = tree._new_node(pivot, key)  # Created first, so a rejected pivot leaves both trees intact
+        tree._root = tree._join_nodes(left._detach_root(), node, right._detach_root())
+        return tree
+
+    def union(self, other: 'AVL') -> None:
+        """
+        Add every value of another tree to this one in O(m log(n/m + 1)) for trees of sizes m <= n, or in
+        O(log n) when the two key ranges do not overlap. Where both trees hold a value, this tree's node is
+        kept. The other tree is left empty.
+
+        :param other: The tree whose values are added.
+        """
+        if other is self:
+            return
+        first, second = self._detach_root(), other._detach_root()
+        if first is not None and second is not None:
+            if self._rightmost(first).key < self._leftmost(second).key:  # Disjoint, second is above
+                self._root = self._concat_nodes(first, second)
+                return
+            if self._rightmost(second).key < self._leftmost(first).key:  # Disjoint, second is below
+                self._root = self._concat_nodes(second, first)
+                return
+        self._root = self._union_nodes(first, second)
+
+    def intersection(self, other: 'AVL') -> None:
+        """
+        Keep only the values that are also in another tree, in O(m log(n/m + 1)). The other tree is left empty.
+
+        :param other: The tree to intersect with.
+        """
+        if other is self:
+            return
+        self._root = self._intersection_nodes(self._detach_root(), other._detach_root())
+
+    def difference(self, other: 'AVL') -> None:
+        """
+        Remove every value of another tree from this one, in O(m log(n/m + 1)). The other tree is left empty.
+
+        :param other: The tree whose values are removed.
+        """
+        if other is self:
+            self.make_empty()
+            return
+        self._root = self._difference_nodes(self._detach_root(), other._detach_root())
+
+    def symmetric_difference(self, other: 'AVL') -> None:
+        """
+        Keep the values that are in exactly one of the two trees, in O(m log(n/m + 1)).
+        The other tree is left empty.
+
+        :param other: The tree to combine with.
+        """
+        if other is self:
+            self.make_empty()
+            return
+        self._root = self._symmetric_difference_nodes(self._detach_root(), other._detach_root())
 
     def _balance_factor(self, node: AVLNode) -> int:
         """
@@ -247,9 +825,9 @@ class AVL(BST):
         else:
             self._root = child  # Update the root if necessary
         node.parent = child
-        # Update the heights of the affected nodes
-        self._update_height(node)
-        self._update_height(child)
+        # Update the heights and sizes of the affected nodes
+        self._update_node(node)
+        self._update_node(child)
         return child
 
     def _rotate_right(self, node: AVLNode) -> AVLNode:
@@ -273,9 +851,9 @@ class AVL(BST):
         else:
             self._root = child  # Update the root if necessary
         node.parent = child
-        # Update the heights of the affected nodes
-        self._update_height(node)
-        self._update_height(child)
+        # Update the heights and sizes of the affected nodes
+        self._update_node(node)
+        self._update_node(child)
         return child
 
     def _update_height(self, node: AVLNode) -> None:
@@ -286,31 +864,366 @@ class AVL(BST):
         """
         node.height = max(self._get_height(node.left), self._get_height(node.right)) + 1
 
+    def _get_size(self, node: AVLNode) -> int:
+        """
+        Returns the number of nodes in the subtree rooted at a node.
+
+        :param node: The root of the subtree.
+        :return: The size of the subtree, 0 for an empty subtree.
+        """
+        if node is None:
+            return 0
+        else:
+            return node.size
+
+    def _update_size(self, node: AVLNode) -> None:
+        """
+        Updates the subtree size of a node from the sizes of its children.
+
+        :param node: The node to update the size for.
+        """
+        node.size = self._get_size(node.left) + self._get_size(node.right) + 1
+
+    def _update_node(self, node: AVLNode) -> None:
+        """
+        Updates every field derived from a node's children: the height, then the fields refreshed by
+        _update_augment.
+
+        :param node: The node to update.
+        """
+        left, right = node.left, node.right
+        if left is None:
+            node.height = 0 if right is None else right.height + 1
+        elif right is None or left.height > right.height:
+            node.height = left.height + 1
+        else:
+            node.height = right.height + 1
+        self._update_augment(node)
+
+    def _update_augment(self, node: AVLNode) -> None:
+        """
+        Updates the fields derived from a node's children other than the height: the subtree size, and the
+        fields subclasses add by overriding this method. Above the level where retracing stops, only these
+        fields can still change.
+
+        :param node: The node to update.
+        """
+        left, right = node.left, node.right
+        size = 1
+        if left is not None:
+            size += left.size
+        if right is not None:
+            size += right.size
+        node.size = size
+
+    def _retrace(self, node: AVLNode) -> None:
+        """
+        Rebalances the tree after one of the subtrees of a node changed, climbing towards the root.
+
+        Heights and rotations are only handled while the height of the current subtree keeps changing: once
+        a subtree (after any rotation) is as high as before, no ancestor can be out of balance. The rest of
+        the climb only refreshes the fields of _update_augment. After an insertion this stops at the first
+        rotation at the latest, and after most updates within a few levels.
+
+        :param node: The lowest node whose children changed, or None.
+        """
+        while node is not None:
+            height = node.height
+            self._update_node(node)
+            node = self._restore_balance(node)
+            if node.height == height:  # The subtree is as high as before, so the ancestors stay balanced
+                node = node.parent
+                while node is not None:
+                    self._update_augment(node)
+                    node = node.parent
+                return
+            node = node.parent  # Move up to the parent node
+
     def _rebalance(self, node: AVLNode) -> None:
         """
-        Rebalances the tree at a node.
+        Rebalances the tree at a node, updating and checking every ancestor up to the root. This is the
+        retracing used before _retrace stopped early, and is kept as its reference in tests and benchmarks.
 
         :param node: The node to start the rebalancing from.
         """
         while node is not None:
-            self._update_height(node)
-            # Check the balance factor of the node
-            if self._balance_factor(node) < -1:
-                # Left rotate at the node if its right subtree is higher and its right child's right subtree is higher or equal
-                if self._balance_factor(node.right) <= 0:
-                    node = self._rotate_left(node)
-                else:  # Right-left rotate at the node if its right subtree is higher and its right child's left subtree is higher
-                    node.right = self._rotate_right(node.right)
-                    node = self._rotate_left(node)
-            elif self._balance_factor(node) > 1:
-                # Right rotate at the node if its left subtree is higher and its left child's left subtree is higher or equal
-                if self._balance_factor(node.left) >= 0:
-                    node = self._rotate_right(node)
-                else:  # Left-right rotate at the node if its left subtree is higher and its left child's right subtree is higher
-                    node.left = self._rotate_left(node.left)
-                    node = self._rotate_right(node)
+            self._update_node(node)
+            node = self._restore_balance(node)
             node = node.parent  # Move up to the parent node
 
+    def _restore_balance(self, node: AVLNode) -> AVLNode:
+        """
+        Rotates at a node if its balance factor is outside [-1, 1], assuming both of its subtrees are valid AVL trees
+        and its own height is up to date.
+
+        :param node: The node to check.
+        :return: The root of the subtree that replaced the node (the node itself if no rotation was needed).
+        """
+        # Check the balance factor of the node
+        if self._balance_factor(node) < -1:
+            # Left rotate at the node if its right subtree is higher and its right child's right subtree is higher or equal
+            if self._balance_factor(node.right) <= 0:
+                node = self._rotate_left(node)
+            else:  # Right-left rotate at the node if its right subtree is higher and its right child's left subtree is higher
+                node.right = self._rotate_right(node.right)
+                node = self._rotate_left(node)
+        elif self._balance_factor(node) > 1:
+            # Right rotate at the node if its left subtree is higher and its left child's left subtree is higher or equal
+            if self._balance_factor(node.left) >= 0:
+                node = self._rotate_right(node)
+            else:  # Left-right rotate at the node if its left subtree is higher and its left child's right subtree is higher
+                node.left = self._rotate_left(node.left)
+                node = self._rotate_right(node)
+        return node
+
+    def _empty_like(self) -> 'AVL':
+        """
+        Create an empty tree of the same class and configuration as this one.
+
+        :return: The new, empty tree.
+        """
+        tree = object.__new__(type(self))  # Not copy.copy(), which would pickle the whole tree
+        tree.__dict__.update(self.__dict__)
+        tree.make_empty()
+        return tree
+
+    def _detach_root(self) -> AVLNode:
+        """
+        Take the whole node structure out of the tree, leaving the tree empty.
+
+        :return: The former root, or None if the tree was empty.
+        """
+        root = self._root
+        self.make_empty()
+        return root
+
+    def _leftmost(self, node: AVLNode) -> AVLNode:
+        """
+        Find the left most node of a non-empty subtree.
+
+        :param node: The root of the subtree.
+        :return: The node with the smallest value in the subtree.
+        """
+        while node.left is not None:
+            node = node.left
+        return node
+
+    def _rightmost(self, node: AVLNode) -> AVLNode:
+        """
+        Find the right most node of a non-empty subtree.
+
+        :param node: The root of the subtree.
+        :return: The node with the largest value in the subtree.
+        """
+        while node.right is not None:
+            node = node.right
+        return node
+
+    def _detach_children(self, node: AVLNode) -> tuple:
+        """
+        Cut a node off from its parent and both children.
+
+        :param node: The node to detach.
+        :return: A tuple (left, right) with the former children, now roots of their own subtrees.
+        """
+        left, right = node.left, node.right
+        if left is not None:
+            left.parent = None
+        if right is not None:
+            right.parent = None
+        node.left = node.right = node.parent = None
+        return left, right
+
+    def _attach_children(self, node: AVLNode, left: AVLNode, right: AVLNode) -> None:
+        """
+        Make two subtrees the children of a node and update the node's derived fields.
+
+        :param node: The new parent.
+        :param left: The new left subtree, or None.
+        :param right: The new right subtree, or None.
+        """
+        node.left, node.right = left, right
+        if left is not None:
+            left.parent = node
+        if right is not None:
+            right.parent = node
+        self._update_node(node)
+
+    def _join_nodes(self, left: AVLNode, pivot: AVLNode, right: AVLNode) -> AVLNode:
+        """
+        Join two detached subtrees and a detached pivot node whose value lies between them.
+        The pivot is attached where the heights of the two subtrees meet, costing O(height difference + 1).
+
+        :param left: The root of the subtree of smaller values, or None.
+        :param pivot: The node to place between the two subtrees.
+        :param right: The root of the subtree of larger values, or None.
+        :return: The root of the joined subtree.
+        """
+        left_height, right_height = self._get_height(left), self._get_height(right)
+        if left_height > right_height + 1:  # Descend the right spine of the taller left subtree
+            root = self._join_right(left, pivot, right)
+        elif right_height > left_height + 1:  # Descend the left spine of the taller right subtree
+            root = self._join_left(left, pivot, right)
+        else:
+            self._attach_children(pivot, left, right)
+            root = pivot
+        root.parent = None
+        return root
+
+    def _join_right(self, left: AVLNode, pivot: AVLNode, right: AVLNode) -> AVLNode:
+        """
+        Recursive helper for _join_nodes when the left subtree is more than one level taller.
+
+        :param left: The root of the taller subtree of smaller values.
+        :param pivot: The node to place between the two subtrees.
+        :param right: The root of the subtree of larger values, or None.
+        :return: The root of the joined subtree.
+        """
+        child = left.right
+        if self._get_height(child) <= self._get_height(right) + 1:
+            self._attach_children(pivot, child, right)
+            subtree = pivot
+        else:
+            subtree = self._join_right(child, pivot, right)
+        left.right = subtree
+        subtree.parent = left
+        self._update_node(left)
+        return self._restore_balance(left)
+
+    def _join_left(self, left: AVLNode, pivot: AVLNode, right: AVLNode) -> AVLNode:
+        """
+        Recursive helper for _join_nodes when the right subtree is more than one level taller.
+
+        :param left: The root of the subtree of smaller values, or None.
+        :param pivot: The node to place between the two subtrees.
+        :param right: The root of the taller subtree of larger values.
+        :return: The root of the joined subtree.
+        """
+        child = right.left
+        if self._get_height(child) <= self._get_height(left) + 1:
+            self._attach_children(pivot, left, child)
+            subtree = pivot
+        else:
+            subtree = self._join_left(left, pivot, child)
+        right.left = subtree
+        subtree.parent = right
+        self._update_node(right)
+        return self._restore_balance(right)
+
+    def _concat_nodes(self, left: AVLNode, right: AVLNode) -> AVLNode:
+        """
+        Join two detached subtrees without a pivot, using the largest node of the left one as the pivot.
+
+        :param left: The root of the subtree of smaller values, or None.
+        :param right: The root of the subtree of larger values, or None.
+        :return: The root of the joined subtree.
+        """
+        if left is None:
+            return right
+        rest, last = self._split_last(left)
+        return self._join_nodes(rest, last, right)
+
+    def _split_last(self, root: AVLNode) -> tuple:
+        """
+        Remove the largest node from a detached subtree.
+
+        :param root: The root of a non-empty subtree.
+        :return: A tuple (rest, last) with the root of the remaining subtree and the detached largest node.
+        """
+        left, right = self._detach_children(root)
+        if right is None:
+            return left, root
+        rest, last = self._split_last(right)
+        return self._join_nodes(left, root, rest), last
+
+    def _split_node(self, root: AVLNode, key: object) -> tuple:
+        """
+        Split a detached subtree around a key.
+
+        :param root: The root of the subtree, or None.
+        :param key: The key to split around.
+        :return: A tuple (smaller, found, larger) with the roots of the subtrees of smaller and larger keys
+                 and the detached node holding key (None if key is not in the subtree).
+        """
+        if root is None:
+            return None, None, None
+        left, right = self._detach_children(root)
+        if key < root.key:
+            smaller, found, larger = self._split_node(left, key)
+            return smaller, found, self._join_nodes(larger, root, right)
+        if root.key < key:
+            smaller, found, larger = self._split_node(right, key)
+            return self._join_nodes(left, root, smaller), found, larger
+        return left, root, right
+
+    def _union_nodes(self, first: AVLNode, second: AVLNode) -> AVLNode:
+        """
+        Merge two detached subtrees, keeping the nodes of the first one for values present in both.
+
+        :param first: The root of the first subtree, or None.
+        :param second: The root of the second subtree, or None.
+        :return: The root of the merged subtree.
+        """
+        if first is None:
+            return second
+        if second is None:
+            return first
+        left, right = self._detach_children(first)
+        smaller, _, larger = self._split_node(second, first.key)
+        return self._join_nodes(self._union_nodes(left, smaller), first, self._union_nodes(right, larger))
+
+    def _intersection_nodes(self, first: AVLNode, second: AVLNode) -> AVLNode:
+        """
+        Keep the nodes of the first detached subtree whose values are also in the second one.
+
+        :param first: The root of the first subtree, or None.
+        :param second: The root of the second subtree, or None.
+        :return: The root of the resulting subtree.
+        """
+        if first is None or second is None:
+            return None
+        left, right = self._detach_children(first)
+        smaller, found, larger = self._split_node(second, first.key)
+        left = self._intersection_nodes(left, smaller)
+        right = self._intersection_nodes(right, larger)
+        if found is not None:
+            return self._join_nodes(left, first, right)
+        return self._concat_nodes(left, right)
+
+    def _difference_nodes(self, first: AVLNode, second: AVLNode) -> AVLNode:
+        """
+        Drop the nodes of the first detached subtree whose values are in the second one.
+
+        :param first: The root of the first subtree, or None.
+        :param second: The root of the second subtree, or None.
+        :return: The root of the resulting subtree.
+        """
+        if first is None or second is None:
+            return first
+        left, right = self._detach_children(second)
+        smaller, _, larger = self._split_node(first, second.key)
+        return self._concat_nodes(self._difference_nodes(smaller, left), self._difference_nodes(larger, right))
+
+    def _symmetric_difference_nodes(self, first: AVLNode, second: AVLNode) -> AVLNode:
+        """
+        Keep the nodes of either detached subtree whose values are not in the other one.
+
+        :param first: The root of the first subtree, or None.
+        :param second: The root of the second subtree, or None.
+        :return: The root of the resulting subtree.
+        """
+        if first is None:
+            return second
+        if second is None:
+            return first
+        left, right = self._detach_children(first)
+        smaller, found, larger = self._split_node(second, first.key)
+        left = self._symmetric_difference_nodes(left, smaller)
+        right = self._symmetric_difference_nodes(right, larger)
+        if found is not None:
+            return self._concat_nodes(left, right)
+        return self._join_nodes(left, first, right)
+
 if __name__ == '__main__':
     print("\nPDF - method add() example 1")
     print("----------------------------")
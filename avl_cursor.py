@@ -0,0 +1,157 @@
+import random
+
+
+# AVLCursor is a position in an AVL tree that searches outwards from where it is.
+class AVLCursor:
+    """
+    AVLCursor Class.
+
+    This class points at a node of an AVL tree (or past its last value) and moves between neighbouring values
+    along parent links. seek() and insert_near() start their searches from the cursor instead of the root,
+    climbing only as far as the target requires, so a sequence of nearby operations (time-ordered appends,
+    edits around a position, sliding windows) compares O(log d) keys for a target d positions away. Subtree
+    sizes are still refreshed up to the root after each update.
+
+    A cursor stays valid across its own updates. Updating the tree by other means invalidates it, like
+    changing a list invalidates an iterator over it; seek() from the root with tree.cursor(value) instead.
+    """
+    def __init__(self, tree: 'AVL') -> None:
+        """
+        Initialize a cursor past the last value of a tree. Use AVL.cursor() to create a positioned cursor.
+
+        :param tree: The tree to move in.
+        """
+        self._tree = tree
+        self._node = None  # The node at the cursor, or None past the last value
+
+    def __str__(self) -> str:
+        """
+        String representation of the cursor.
+
+        :return: A string representation of the cursor.
+        """
+        if self._node is None:
+            return 'AVL Cursor: end'
+        return 'AVL Cursor: {}'.format(self._node.value)
+
+    def has_value(self) -> bool:
+        """
+        Check if the cursor is on a value rather than past the last one.
+
+        :return: True if the cursor is on a value, False otherwise.
+        """
+        return self._node is not None
+
+    def get_value(self) -> object:
+        """
+        Get the value at the cursor.
+
+        :return: The value at the cursor, or None if the cursor is past the last value.
+        """
+        return None if self._node is None else self._node.value
+
+    def next(self) -> bool:
+        """
+        Move to the next value in O(1) amortized.
+
+        :return: True if the cursor is on a value afterwards, False if it moved past the last value.
+        """
+        if self._node is not None:
+            self._node = self._tree.successor(self._node)
+        return self._node is not None
+
+    def prev(self) -> bool:
+        """
+        Move to the previous value in O(1) amortized. At the first value the cursor stays where it is.
+
+        :return: True if the cursor moved, False if it was at the first value or past the last one.
+        """
+        if self._node is None:
+            return False
+        node = self._tree.predecessor(self._node)
+        if node is None:
+            return False
+        self._node = node
+        return True
+
+    def seek(self, value: object) -> bool:
+        """
+        Move to the first value greater than or equal to a given value, searching from the cursor.
+
+        :param value: The value to move to.
+        :return: True if the value is in the tree, False otherwise.
+        """
+        tree = self._tree
+        key = tree._key_of(value)
+        if self._node is None:
+            node = tree._root
+        else:
+            node = tree._finger_top(self._node, key)
+        last = None  # The last node of the search, next to the key in order
+        while node is not None:
+            last = node
+            if key < node.key:
+                node = node.left
+            elif node.key < key:
+                node = node.right
+            else:
+                self._node = node
+                return True
+        if last is None or key < last.key:
+            self._node = last
+        else:  # The last node is the predecessor of the key
+            self._node = tree.successor(last)
+        return False
+
+    def insert_near(self, value: object) -> None:
+        """
+        Add a value to the tree, searching from the cursor, and move the cursor onto it.
+
+        :param value: The value to add.
+        """
+        self._node = self._tree._add_near(value, self._node)
+
+    def remove_here(self) -> bool:
+        """
+        Remove the value at the cursor and move to the next value.
+
+        :return: True if a value was removed, False if the cursor was past the last value.
+        """
+        if self._node is None:
+            return False
+        self._node = self._tree._remove_at(self._node)
+        return True
+
+
+if __name__ == '__main__':
+    from avl import AVL
+
+    print("\nPDF - AVLCursor example 1")
+    print("-------------------------")
+    tree = AVL([10, 20, 30, 40, 50])
+    cursor = tree.cursor(25)
+    print(cursor)
+    cursor.insert_near(27)
+    cursor.next()
+    print(cursor, tree)
+    cursor.remove_here()
+    print(cursor, tree)
+
+    print("\nPDF - AVLCursor stress test")
+    print("---------------------------")
+    for _ in range(100):
+        case = list(set(random.randrange(1, 20000) for _ in range(900)))
+        tree = AVL(case[:300])
+        expected = set(case[:300])
+        cursor = tree.cursor()
+        for value in case[300:]:
+            if random.random() < 0.3:
+                cursor.seek(value)
+                if cursor.remove_here():
+                    expected.discard(min(v for v in expected if v >= value))
+            else:
+                cursor.insert_near(value)
+                expected.add(value)
+        if not tree.is_valid_avl() or list(tree) != sorted(expected) or len(tree) != len(expected):
+            raise Exception("PROBLEM WITH CURSOR OPERATION")
+    print('cursor stress test finished')
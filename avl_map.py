@@ -0,0 +1,299 @@
+from avl import AVLNode, AVL
+from serialization import dump_values, load_values
+
+_MISSING = object()  # Sentinel for pop() calls without a default
+
+
+# AVLMapNode is a node in the AVLMap, holding a key and its payload.
+class AVLMapNode(AVLNode):
+    def __init__(self, key: object, data: object = None) -> None:
+        """
+        Initialize an AVLMap node. The key is stored as the node value so that every AVL operation
+        orders map nodes by key.
+
+        :param key: The key of the entry.
+        :param data: The payload stored under the key.
+        """
+        super().__init__(key)
+        self.data = data  # The payload stored under this key
+
+    def __str__(self) -> str:
+        """
+        String representation of an AVLMap node.
+
+        :return: A string representation of the node.
+        """
+        return 'AVLMap Node: {}: {}'.format(self.value, self.data)
+
+
+# AVLMap is a sorted map built on the AVL tree.
+class AVLMap(AVL):
+    """
+    AVLMap Class.
+
+    This class implements a sorted key/value map. Lookups, inserts and deletes cost O(log n), and assigning
+    to an existing key overwrites its payload in place after a single search, without any rotations.
+    """
+    def __init__(self, start_map=None) -> None:
+        """
+        Initialize an AVLMap. If a start_map is provided (a mapping or an iterable of (key, data) pairs),
+        its entries are sorted by key once and built into a balanced tree; the last payload wins for
+        repeated keys.
+
+        :param start_map: A mapping or an iterable of (key, data) pairs.
+        """
+        super().__init__()
+        if start_map is not None:
+            if hasattr(start_map, 'items'):
+                start_map = start_map.items()
+            self._build_items(start_map)
+
+    def _build_items(self, items) -> None:
+        """
+        Replace the contents of the map with a balanced tree of (key, data) pairs given in any order. The
+        pairs are sorted by key once, keeping keys and payloads together; the last payload wins for
+        repeated keys.
+
+        :param items: An iterable of (key, data) pairs.
+        """
+        keys, payloads = [], []
+        for key, data in sorted(items, key=lambda item: item[0]):
+            if keys and not keys[-1] < key:  # Repeated key, keep the latest payload
+                payloads[-1] = data
+            else:
+                keys.append(key)
+                payloads.append(data)
+        self._build_entries(keys, payloads)
+
+    def _build_entries(self, keys: list, payloads: list) -> None:
+        """
+        Replace the contents of the map with a balanced tree of the given entries.
+
+        :param keys: Distinct keys in ascending order.
+        :param payloads: The payload of each key.
+        """
+        self._root = self._build_balanced(keys)
+        for node, data in zip(self._irange_nodes(None, None, (True, True), False), payloads):
+            node.data = data
+
+    def dump(self, fileobj) -> None:
+        """
+        Write the entries of the map to a binary file, as a frame of keys followed by a frame of payloads.
+
+        :param fileobj: A binary file object opened for writing.
+        """
+        dump_values(self.keys(), fileobj)
+        dump_values(self.values(), fileobj)
+
+    @classmethod
+    def load(cls, fileobj) -> 'AVLMap':
+        """
+        Read a map written by dump(), building it bottom-up in linear time. Keys and payloads are paired
+        before they are sorted, so a file whose keys are out of order or repeated still loads each payload
+        under its own key, with the last payload winning for repeated keys.
+
+        :param fileobj: A binary file object opened for reading.
+        :return: A new map.
+        :raises ValueError: If the file holds different numbers of keys and payloads.
+        """
+        keys = load_values(fileobj)
+        payloads = load_values(fileobj)
+        if len(keys) != len(payloads):
+            raise ValueError("Corrupted serialized map")
+        tree = cls()
+        tree._build_items(zip(keys, payloads))
+        return tree
+
+    def __getstate__(self) -> dict:
+        """
+        Get the state to pickle, with the node structure replaced by the in-order entries.
+
+        :return: The state of the map.
+        """
+        state = self.__dict__.copy()
+        for name in self._transient:
+            state.pop(name, None)
+        state['_root'] = list(self.items())
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """
+        Restore a pickled state, rebuilding the nodes bottom-up from the in-order entries.
+
+        :param state: The state returned by __getstate__.
+        """
+        state = dict(state)
+        entries = state.pop('_root')
+        self.__dict__.update(state)
+        self._build_entries([key for key, _ in entries], [data for _, data in entries])
+
+    def __str__(self) -> str:
+        """
+        String representation of the AVLMap using pre-order traversal.
+
+        :return: A string representation of the map.
+        """
+        items = []
+        self._str_items_helper(self._root, items)
+        return "AVLMap pre-order { " + ", ".join(items) + " }"
+
+    def _str_items_helper(self, node: AVLMapNode, items: list) -> None:
+        """
+        A helper function to get a string representation of the AVLMap.
+
+        :param node: The current node.
+        :param items: The list of formatted entries.
+        """
+        if not node:
+            return
+        items.append('{}: {}'.format(node.value, node.data))
+        self._str_items_helper(node.left, items)
+        self._str_items_helper(node.right, items)
+
+    def __getitem__(self, key: object) -> object:
+        """
+        Get the payload stored under a key.
+
+        :param key: The key to look up.
+        :return: The payload stored under the key.
+        :raises KeyError: If the key is not in the map.
+        """
+        node = self._find_node(key)
+        if node is None:
+            raise KeyError(key)
+        return node.data
+
+    def __setitem__(self, key: object, data: object) -> None:
+        """
+        Store a payload under a key. An existing key is updated in place; a new key is inserted and
+        the tree rebalanced.
+
+        :param key: The key to store the payload under.
+        :param data: The payload.
+        """
+        node, _ = self._find_or_insert(key)
+        node.data = data
+
+    def __delitem__(self, key: object) -> None:
+        """
+        Remove a key and its payload.
+
+        :param key: The key to remove.
+        :raises KeyError: If the key is not in the map.
+        """
+        node = self._find_node(key)
+        if node is None:
+            raise KeyError(key)
+        self._remove_node(node)
+
+    def __contains__(self, key: object) -> bool:
+        """
+        Check if the map contains a key.
+
+        :param key: The key to check.
+        :return: True if the key is in the map, False otherwise.
+        """
+        return self._find_node(key) is not None
+
+    def get(self, key: object, default: object = None) -> object:
+        """
+        Get the payload stored under a key, or a default if the key is not in the map.
+
+        :param key: The key to look up.
+        :param default: The value returned when the key is missing.
+        :return: The payload or the default.
+        """
+        node = self._find_node(key)
+        if node is None:
+            return default
+        return node.data
+
+    def setdefault(self, key: object, default: object = None) -> object:
+        """
+        Get the payload stored under a key, storing default first if the key is not in the map.
+
+        :param key: The key to look up.
+        :param default: The payload stored when the key is missing.
+        :return: The payload now stored under the key.
+        """
+        node, inserted = self._find_or_insert(key)
+        if inserted:
+            node.data = default
+        return node.data
+
+    def pop(self, key: object, default: object = _MISSING) -> object:
+        """
+        Remove a key and return its payload.
+
+        :param key: The key to remove.
+        :param default: The value returned when the key is missing.
+        :return: The payload that was stored under the key, or the default.
+        :raises KeyError: If the key is not in the map and no default is given.
+        """
+        node = self._find_node(key)
+        if node is None:
+            if default is _MISSING:
+                raise KeyError(key)
+            return default
+        data = node.data  # Read before removal, which may move another payload into this node
+        self._remove_node(node)
+        return data
+
+    def keys(self):
+        """
+        Lazily iterate over the keys in ascending order.
+
+        :return: A generator of the keys.
+        """
+        for node in self._irange_nodes(None, None, (True, True), False):
+            yield node.value
+
+    def values(self):
+        """
+        Lazily iterate over the payloads in ascending key order.
+
+        :return: A generator of the payloads.
+        """
+        for node in self._irange_nodes(None, None, (True, True), False):
+            yield node.data
+
+    def items(self):
+        """
+        Lazily iterate over the (key, payload) pairs in ascending key order.
+
+        :return: A generator of (key, payload) tuples.
+        """
+        for node in self._irange_nodes(None, None, (True, True), False):
+            yield node.value, node.data
+
+    def _create_node(self, value: object) -> AVLMapNode:
+        """
+        Create a detached map node with an empty payload.
+
+        :param value: The key of the node.
+        :return: The new node.
+        """
+        return AVLMapNode(value)
+
+    def _copy_payload(self, target: AVLMapNode, source: AVLMapNode) -> None:
+        """
+        Copy the key and the payload of a node into another node.
+
+        :param target: The node receiving the entry.
+        :param source: The node whose entry is copied.
+        """
+        super()._copy_payload(target, source)
+        target.data = source.data
+
+
+if __name__ == '__main__':
+    print("\nPDF - AVLMap example 1")
+    print("----------------------")
+    tree = AVLMap({'b': 2, 'a': 1, 'c': 3})
+    tree['d'] = 4
+    tree['a'] = 10
+    print(tree)
+    print(list(tree.items()))
+    print("pop('b'):", tree.pop('b'))
+    print("setdefault('e', 5):", tree.setdefault('e', 5))
+    print(tree)
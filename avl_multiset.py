@@ -0,0 +1,467 @@
+import random
+from itertools import repeat
+from queue_ import Queue
+from avl import AVLNode, AVL
+
+
+# AVLMultisetNode is an AVL node that stores how many times its value occurs.
+class AVLMultisetNode(AVLNode):
+    def __init__(self, value: object) -> None:
+        """
+        Initialize an AVLMultiset node holding a single occurrence of a value.
+        The size of the node counts every occurrence in its subtree.
+
+        :param value: The value to be stored in the node.
+        """
+        super().__init__(value)
+        self.count = 1  # The number of occurrences of the value
+
+    def __str__(self) -> str:
+        """
+        String representation of an AVLMultiset node.
+
+        :return: A string representation of the node.
+        """
+        return 'AVLMultiset Node: {} (x{})'.format(self.value, self.count)
+
+
+# AVLMultiset is an AVL tree that counts duplicate values instead of dropping them.
+class AVLMultiset(AVL):
+    """
+    AVLMultiset Class.
+
+    This class keeps one node per distinct value together with its number of occurrences: add() of a value
+    that is already present only increments its count, and remove() decrements it, unlinking the node once it
+    reaches zero. Duplicate-heavy data therefore needs one node per distinct value, and the tree stays as
+    shallow as the number of distinct values allows. Subtree sizes count occurrences, so len(), rank(),
+    select(), count_range() and iteration all respect multiplicity.
+    """
+    _distinct = False  # Equal values are counted, not dropped
+
+    def __str__(self) -> str:
+        """
+        Generate a string representation of the multiset using pre-order traversal. Values occurring more
+        than once are followed by their count.
+
+        :return: String representation of the multiset.
+        """
+        values = []
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if node is not None:
+                values.append(str(node.value) if node.count == 1 else '{} x{}'.format(node.value, node.count))
+                stack.append(node.right)
+                stack.append(node.left)
+        return "AVLMultiset pre-order { " + ", ".join(values) + " }"
+
+    def _create_node(self, value: object) -> AVLMultisetNode:
+        """
+        Create a detached node with a count of one.
+
+        :param value: The value to be stored in the node.
+        :return: The new node.
+        """
+        return AVLMultisetNode(value)
+
+    def _build_balanced(self, values: list) -> AVLMultisetNode:
+        """
+        Build a perfectly balanced subtree from a list of values in ascending order. Each run of values with
+        equal keys becomes one node holding the first value of the run and the length of the run as its count.
+
+        :param values: The values to be stored in the subtree, duplicates included.
+        :return: The root of the new subtree, or None if values is empty.
+        """
+        distinct, keys, counts = self._runs(values)
+        return self._build_counted(distinct, keys, counts, 0, len(distinct) - 1, None)
+
+    def _runs(self, values: list) -> tuple:
+        """
+        Group a list of values in ascending order into runs of values with equal keys.
+
+        :param values: The values, duplicates included.
+        :return: A tuple (values, keys, counts) of lists with the first value of each run, its key and the
+                 length of the run.
+        """
+        distinct, keys, counts = [], [], []
+        for value in values:
+            key = self._key_of(value)
+            if keys and not keys[-1] < key:  # Another occurrence of the previous value
+                counts[-1] += 1
+            else:
+                distinct.append(value)
+                keys.append(key)
+                counts.append(1)
+        return distinct, keys, counts
+
+    def _build_counted(self, values: list, keys: list, counts: list, low: int, high: int,
+                       parent: AVLMultisetNode) -> AVLMultisetNode:
+        """
+        Recursive helper for _build_balanced, like AVL._build_range but also setting the counts.
+
+        :param values: The distinct values to be stored in the tree.
+        :param keys: The key of each value.
+        :param counts: The number of occurrences of each value.
+        :param low: Index of the first value of this subtree.
+        :param high: Index of the last value of this subtree.
+        :param parent: The parent of the subtree root.
+        :return: The root of the subtree, or None if the range is empty.
+        """
+        if low > high:
+            return None
+        middle = (low + high) // 2
+        node = self._new_node(values[middle], keys[middle])
+        node.count = counts[middle]
+        node.parent = parent
+        node.left = self._build_counted(values, keys, counts, low, middle - 1, node)
+        node.right = self._build_counted(values, keys, counts, middle + 1, high, node)
+        self._update_node(node)
+        return node
+
+    def add(self, value: object) -> None:
+        """
+        Add one occurrence of a value. A value that is already present only has its count incremented.
+
+        :param value: The value to add to the multiset.
+        """
+        self._add_near(value, None)
+
+    def _add_near(self, value: object, start: AVLMultisetNode) -> AVLMultisetNode:
+        """
+        Add one occurrence of a value, searching from a node of the tree.
+
+        :param value: The value to add.
+        :param start: A node of the tree to search from, or None to search from the root.
+        :return: The node holding the value.
+        """
+        node, inserted = self._find_or_insert(value, start)
+        if not inserted:
+            node.count += 1
+            self._refresh_ancestors(node)
+        return node
+
+    def remove(self, value: object) -> bool:
+        """
+        Remove one occurrence of a value. The node of the value is only unlinked when its last occurrence is
+        removed.
+
+        :param value: The value to remove from the multiset.
+        :return: True if an occurrence was removed, False if the value is not in the multiset.
+        """
+        node = self._find_node(value)
+        if node is None:
+            return False
+        self._remove_at(node)
+        return True
+
+    def _remove_at(self, node: AVLMultisetNode) -> AVLMultisetNode:
+        """
+        Remove one occurrence of the value held by a node.
+
+        :param node: A node of the tree.
+        :return: The node that holds the value if occurrences remain, otherwise the node that holds the next
+                 value, or None if the removed value was the largest.
+        """
+        if node.count > 1:
+            node.count -= 1
+            self._refresh_ancestors(node)
+            return node
+        return super()._remove_at(node)
+
+    def _refresh_ancestors(self, node: AVLMultisetNode) -> None:
+        """
+        Refresh the sizes (and other augmented fields) of a node and its ancestors after its count changed.
+        Heights are unchanged, so no rebalancing is needed.
+
+        :param node: The node whose count changed.
+        """
+        while node is not None:
+            self._update_augment(node)
+            node = node.parent
+
+    def count(self, value: object) -> int:
+        """
+        Count the occurrences of a value in O(log n).
+
+        :param value: The value to count.
+        :return: The number of occurrences, 0 if the value is not in the multiset.
+        """
+        node = self._find_node(value)
+        return 0 if node is None else node.count
+
+    def distinct_count(self) -> int:
+        """
+        Count the distinct values in the multiset, which is also its number of nodes.
+
+        :return: The number of distinct values.
+        """
+        return sum(1 for _ in self._irange_nodes(None, None, (True, True), False))
+
+    def items(self):
+        """
+        Lazily iterate over the distinct values in ascending order together with their counts.
+
+        :return: A generator of (value, count) tuples.
+        """
+        for node in self._irange_nodes(None, None, (True, True), False):
+            yield node.value, node.count
+
+    def _copy_payload(self, target: AVLMultisetNode, source: AVLMultisetNode) -> None:
+        """
+        Copy the value, key and count of a node.
+
+        :param target: The node receiving the payload.
+        :param source: The node whose payload is copied.
+        """
+        super()._copy_payload(target, source)
+        target.count = source.count
+
+    def _update_augment(self, node: AVLMultisetNode) -> None:
+        """
+        Updates the size of a node, counting every occurrence in its subtree.
+
+        :param node: The node to update.
+        """
+        left, right = node.left, node.right
+        size = node.count
+        if left is not None:
+            size += left.size
+        if right is not None:
+            size += right.size
+        node.size = size
+
+    def _count_below(self, key: object, inclusive: bool) -> int:
+        """
+        Count the occurrences of values whose keys are less than (or, if inclusive, less than or equal to)
+        a given key.
+
+        :param key: The key of the bound to count against.
+        :param inclusive: Whether values equal to the bound are counted.
+        :return: The number of occurrences below the bound.
+        """
+        node = self._root
+        count = 0
+        while node is not None:
+            if node.key < key or (inclusive and not key < node.key):
+                count += self._get_size(node.left) + node.count  # This node and its left subtree are below
+                node = node.right
+            else:
+                node = node.left
+        return count
+
+    def select(self, k: int) -> object:
+        """
+        Return the k-th smallest occurrence in the multiset (0-based) in O(log n).
+
+        :param k: The position of the occurrence in sorted order.
+        :return: The value at position k.
+        :raises IndexError: If k is outside the range [0, len(multiset)).
+        """
+        if k < 0 or k >= self._get_size(self._root):
+            raise IndexError("AVLMultiset index out of range")
+        node = self._root
+        while True:
+            left_size = self._get_size(node.left)
+            if k < left_size:  # The occurrence is in the left subtree
+                node = node.left
+            elif k < left_size + node.count:  # The occurrence is at this node
+                return node.value
+            else:  # Skip the left subtree and this node
+                k -= left_size + node.count
+                node = node.right
+
+    def irange(self, low: object = None, high: object = None, inclusive=(True, False), reverse=False):
+        """
+        Lazily iterate over the values between two bounds, producing each value as many times as it occurs.
+
+        :param low: The lower bound, or None for no lower bound.
+        :param high: The upper bound, or None for no upper bound.
+        :param inclusive: A pair of booleans telling whether low and high themselves are included.
+        :param reverse: If True, values are produced in descending order.
+        :return: A generator of the values within the bounds.
+        """
+        if low is not None:
+            low = self._key_of(low)
+        if high is not None:
+            high = self._key_of(high)
+        for node in self._irange_nodes(low, high, inclusive, reverse):
+            yield from repeat(node.value, node.count)
+
+    def inorder_traversal(self) -> Queue:
+        """
+        Execute an in-order traversal of the multiset.
+
+        :return: A queue of the values in ascending order, each repeated as many times as it occurs.
+        """
+        inorder_queue = Queue()
+        for value in self.irange():
+            inorder_queue.enqueue(value)
+        return inorder_queue
+
+    def copy(self) -> 'AVLMultiset':
+        """
+        Make an independent copy of the multiset in time linear in its number of distinct values.
+
+        :return: A new multiset with the same values and counts.
+        """
+        nodes = list(self._irange_nodes(None, None, (True, True), False))
+        tree = self._empty_like()
+        tree._root = tree._build_counted([node.value for node in nodes], [node.key for node in nodes],
+                                         [node.count for node in nodes], 0, len(nodes) - 1, None)
+        return tree
+
+    def add_many(self, values) -> int:
+        """
+        Add one occurrence of each value of a batch. The batch is sorted once and grouped into runs of equal
+        values; each run costs a single search, started from the node of the previous run so neighbouring
+        values share their path prefixes, and a single count update.
+
+        :param values: An iterable of values to add.
+        :return: The number of occurrences added.
+        """
+        distinct, _, counts = self._runs(sorted(values, key=self._key))
+        node = None
+        for value, count in zip(distinct, counts):
+            node, inserted = self._find_or_insert(value, node)
+            node.count += count - 1 if inserted else count
+            if count > 1 or not inserted:
+                self._refresh_ancestors(node)
+        return sum(counts)
+
+    def remove_many(self, values) -> int:
+        """
+        Remove one occurrence of each value of a batch. The batch is sorted once and grouped into runs of
+        equal values; each run costs a single search, and at most a single unlinking.
+
+        :param values: An iterable of values to remove.
+        :return: The number of occurrences removed.
+        """
+        distinct, _, counts = self._runs(sorted(values, key=self._key))
+        removed = 0
+        for value, count in zip(distinct, counts):
+            node = self._find_node(value)
+            if node is None:
+                continue
+            if node.count > count:
+                node.count -= count
+                self._refresh_ancestors(node)
+                removed += count
+            else:  # Every occurrence goes, and the node with it
+                removed += node.count
+                node.count = 1
+                self._remove_at(node)
+        return removed
+
+    def _merge_counts(self, other: 'AVLMultiset', combine) -> None:
+        """
+        Replace the contents of the multiset by a linear merge of its distinct values with those of another
+        multiset, then rebuild it perfectly balanced. The other multiset is left empty.
+
+        :param other: The multiset to merge with.
+        :param combine: A function of the counts of a value in both multisets (0 where it is absent) returning
+                        its count in the result; values whose resulting count is not positive are dropped.
+        """
+        values, keys, counts = [], [], []
+
+        def keep(node: AVLMultisetNode, count: int) -> None:
+            if count > 0:
+                values.append(node.value)
+                keys.append(node.key)
+                counts.append(count)
+
+        first = self._irange_nodes(None, None, (True, True), False)
+        second = other._irange_nodes(None, None, (True, True), False)
+        mine, theirs = next(first, None), next(second, None)
+        while mine is not None and theirs is not None:
+            if mine.key < theirs.key:
+                keep(mine, combine(mine.count, 0))
+                mine = next(first, None)
+            elif theirs.key < mine.key:
+                keep(theirs, combine(0, theirs.count))
+                theirs = next(second, None)
+            else:  # Both multisets hold the value, this one's node is kept
+                keep(mine, combine(mine.count, theirs.count))
+                mine, theirs = next(first, None), next(second, None)
+        while mine is not None:
+            keep(mine, combine(mine.count, 0))
+            mine = next(first, None)
+        while theirs is not None:
+            keep(theirs, combine(0, theirs.count))
+            theirs = next(second, None)
+        self.make_empty()
+        other.make_empty()
+        self._root = self._build_counted(values, keys, counts, 0, len(values) - 1, None)
+
+    def union(self, other: 'AVLMultiset') -> None:
+        """
+        Add the values of another multiset, each occurring as many times as in the multiset where it occurs
+        most, in O(n + m). The other multiset is left empty.
+
+        :param other: The multiset whose values are added.
+        """
+        if other is self:
+            return
+        self._merge_counts(other, max)
+
+    def intersection(self, other: 'AVLMultiset') -> None:
+        """
+        Keep the values that are also in another multiset, each occurring as many times as in the multiset
+        where it occurs least, in O(n + m). The other multiset is left empty.
+
+        :param other: The multiset to intersect with.
+        """
+        if other is self:
+            return
+        self._merge_counts(other, min)
+
+    def difference(self, other: 'AVLMultiset') -> None:
+        """
+        Remove the occurrences of the values of another multiset, dropping the values that are left with no
+        occurrence, in O(n + m). The other multiset is left empty.
+
+        :param other: The multiset whose occurrences are removed.
+        """
+        if other is self:
+            self.make_empty()
+            return
+        self._merge_counts(other, lambda mine, theirs: mine - theirs)
+
+    def symmetric_difference(self, other: 'AVLMultiset') -> None:
+        """
+        Keep each value as many times as its counts in the two multisets differ, in O(n + m).
+        The other multiset is left empty.
+
+        :param other: The multiset to combine with.
+        """
+        if other is self:
+            self.make_empty()
+            return
+        self._merge_counts(other, lambda mine, theirs: abs(mine - theirs))
+
+
+if __name__ == '__main__':
+    print("\nPDF - AVLMultiset example 1")
+    print("---------------------------")
+    tree = AVLMultiset((1, 1, 1, 1))
+    print(tree)
+    tree = AVLMultiset([10, 5, 15, 5, 10, 10])
+    tree.add(15)
+    tree.remove(10)
+    print(tree)
+    print("Values:", list(tree), "count(10):", tree.count(10), "len:", len(tree))
+
+    print("\nPDF - AVLMultiset add() and remove() stress test")
+    print("------------------------------------------------")
+    for _ in range(100):
+        case = [random.randrange(1, 50) for _ in range(900)]
+        tree = AVLMultiset(case[:300])
+        for value in case[300:]:
+            tree.add(value)
+        for value in case[::2]:
+            tree.remove(value)
+        expected = sorted(case)
+        for value in case[::2]:
+            expected.remove(value)
+        if not tree.is_valid_avl() or list(tree) != expected or len(tree) != len(expected):
+            raise Exception("PROBLEM WITH ADD/REMOVE OPERATION")
+    print('add() and remove() stress test finished')
@@ -0,0 +1,378 @@
+"""
+Benchmark harness for the tree implementations.
+
+Run it as a module, for example:
+
+    python -m benchmark --sizes 1000 10000 --workloads random sorted --output results.json
+
+Every (structure, workload, size) combination is measured on the same generated keys, and the results are
+written as JSON so they can be tracked over time.
+"""
+import argparse
+import functools
+import json
+import platform
+import random
+import sys
+import time
+from bisect import bisect_left, insort
+from avl import AVL
+from block_list import BlockList
+from bst import BST
+from red_black import RedBlackTree
+from wavl import WAVL
+from treap import Treap
+from scapegoat import ScapegoatTree
+
+WORKLOADS = ('sorted', 'reverse', 'random', 'zipf', 'interleaved')
+OPERATIONS = ('add', 'contains', 'find_min', 'find_max', 'inorder_traversal', 'remove', 'mixed')
+LATENCY_SAMPLES = 10000  # The most operations timed individually per phase
+
+
+# BisectList is a sorted Python list used as a baseline.
+class BisectList:
+    """
+    BisectList Class.
+
+    This class keeps distinct values in a sorted list maintained with bisect. Lookups cost O(log n) and
+    inserts and removes O(n) element moves, which are done in C.
+    """
+    def __init__(self):
+        # Initialize list
+        self._data = []
+
+    def add(self, value: object) -> None:
+        """
+        Add a value if it is not already in the list.
+
+        :param value: The value to add.
+        """
+        index = bisect_left(self._data, value)
+        if index == len(self._data) or self._data[index] != value:
+            self._data.insert(index, value)
+
+    def remove(self, value: object) -> bool:
+        """
+        Remove a value.
+
+        :param value: The value to remove.
+        :return: True if the value was removed, False if it was not found.
+        """
+        index = bisect_left(self._data, value)
+        if index < len(self._data) and self._data[index] == value:
+            del self._data[index]
+            return True
+        return False
+
+    def contains(self, value: object) -> bool:
+        """
+        Check if the list contains a value.
+
+        :param value: The value to check.
+        :return: True if the value is in the list, False otherwise.
+        """
+        index = bisect_left(self._data, value)
+        return index < len(self._data) and self._data[index] == value
+
+    def inorder_traversal(self) -> list:
+        """
+        Get the values in ascending order.
+
+        :return: A copy of the sorted list.
+        """
+        return list(self._data)
+
+    def find_min(self) -> object:
+        """
+        Find the minimum value.
+
+        :return: The minimum value, or None if the list is empty.
+        """
+        return self._data[0] if self._data else None
+
+    def find_max(self) -> object:
+        """
+        Find the maximum value.
+
+        :return: The maximum value, or None if the list is empty.
+        """
+        return self._data[-1] if self._data else None
+
+
+# HashSet is a Python set used as a baseline.
+class HashSet:
+    """
+    HashSet Class.
+
+    This class wraps a set. Updates and lookups cost O(1); ordered operations have to scan or sort the set.
+    """
+    def __init__(self):
+        # Initialize set
+        self._data = set()
+
+    def add(self, value: object) -> None:
+        """
+        Add a value.
+
+        :param value: The value to add.
+        """
+        self._data.add(value)
+
+    def remove(self, value: object) -> bool:
+        """
+        Remove a value.
+
+        :param value: The value to remove.
+        :return: True if the value was removed, False if it was not found.
+        """
+        if value in self._data:
+            self._data.remove(value)
+            return True
+        return False
+
+    def contains(self, value: object) -> bool:
+        """
+        Check if the set contains a value.
+
+        :param value: The value to check.
+        :return: True if the value is in the set, False otherwise.
+        """
+        return value in self._data
+
+    def inorder_traversal(self) -> list:
+        """
+        Get the values in ascending order by sorting the set.
+
+        :return: A sorted list of the values.
+        """
+        return sorted(self._data)
+
+    def find_min(self) -> object:
+        """
+        Find the minimum value by scanning the set.
+
+        :return: The minimum value, or None if the set is empty.
+        """
+        return min(self._data) if self._data else None
+
+    def find_max(self) -> object:
+        """
+        Find the maximum value by scanning the set.
+
+        :return: The maximum value, or None if the set is empty.
+        """
+        return max(self._data) if self._data else None
+
+
+# FullRetraceAVL is the AVL tree with the retracing it used before it stopped early, as a baseline.
+class FullRetraceAVL(AVL):
+    """
+    FullRetraceAVL Class.
+
+    This class updates heights and checks balance factors at every ancestor of each changed node up to the
+    root, like the AVL tree did before retracing stopped as soon as a subtree height was unchanged.
+    """
+    def _retrace(self, node) -> None:
+        """
+        Rebalance from a node all the way up to the root.
+
+        :param node: The lowest node whose children changed, or None.
+        """
+        self._rebalance(node)
+
+
+# The structures that can be benchmarked, by name
+STRUCTURES = {
+    'BST': BST,
+    'AVL': AVL,
+    'AVL-full-retrace': FullRetraceAVL,
+    'WAVL': WAVL,
+    'red-black': RedBlackTree,
+    'treap': functools.partial(Treap, seed=0),  # Seeded, so that every run builds the same shapes
+    'scapegoat': ScapegoatTree,
+    'blocks': BlockList,
+    'bisect': BisectList,
+    'set': HashSet,
+}
+
+# Structures whose add() degrades to O(n) on ordered input, and the largest size they are run at on it
+DEGENERATE_LIMITS = {
+    'BST': 20000,
+}
+
+
+def generate_keys(workload: str, size: int, rng: random.Random) -> list:
+    """
+    Generate the keys inserted by a workload.
+
+    :param workload: One of WORKLOADS.
+    :param size: The number of keys.
+    :param rng: The random generator to use.
+    :return: The list of keys in insertion order.
+    """
+    if workload == 'sorted':
+        return list(range(size))
+    if workload == 'reverse':
+        return list(range(size - 1, -1, -1))
+    if workload == 'zipf':
+        # Key ranks follow a power law: a few hot keys are inserted and looked up most of the time
+        return [int(size ** rng.random()) - 1 for _ in range(size)]
+    keys = list(range(size))  # 'random' and 'interleaved' use a random permutation
+    rng.shuffle(keys)
+    return keys
+
+
+def percentiles(samples: list) -> dict:
+    """
+    Summarize latency samples.
+
+    :param samples: The latencies, in nanoseconds.
+    :return: A dict with the p50, p90, p99 and maximum latency in nanoseconds.
+    """
+    if not samples:
+        return {}
+    samples = sorted(samples)
+    last = len(samples) - 1
+    return {
+        'p50_ns': samples[last * 50 // 100],
+        'p90_ns': samples[last * 90 // 100],
+        'p99_ns': samples[last * 99 // 100],
+        'max_ns': samples[last],
+    }
+
+
+def measure(operation, arguments: list) -> dict:
+    """
+    Run an operation once per argument, timing the whole run and an evenly spaced sample of single calls.
+
+    :param operation: The function to call.
+    :param arguments: The argument of each call.
+    :return: A dict with the number of calls, the throughput and the latency percentiles.
+    """
+    stride = max(1, len(arguments) // LATENCY_SAMPLES)
+    samples = []
+    clock = time.perf_counter_ns
+    start = clock()
+    for index, argument in enumerate(arguments):
+        if index % stride:
+            operation(argument)
+        else:
+            before = clock()
+            operation(argument)
+            samples.append(clock() - before)
+    elapsed = clock() - start
+    result = {'ops': len(arguments), 'seconds': elapsed / 1e9,
+              'ops_per_second': len(arguments) / (elapsed / 1e9) if elapsed else None}
+    result.update(percentiles(samples))
+    return result
+
+
+def run_case(name: str, workload: str, size: int, seed: int) -> dict:
+    """
+    Benchmark one structure on one workload and size.
+
+    :param name: A key of STRUCTURES.
+    :param workload: One of WORKLOADS.
+    :param size: The number of keys.
+    :param seed: The random seed, so that every structure sees the same keys.
+    :return: A dict of results per operation.
+    """
+    limit = DEGENERATE_LIMITS.get(name)
+    if limit is not None and size > limit and workload in ('sorted', 'reverse', 'interleaved'):
+        return {'skipped': 'quadratic on ordered input above {} keys'.format(limit)}
+    rng = random.Random(seed)
+    keys = generate_keys(workload, size, rng)
+    if workload == 'interleaved':
+        keys.sort()  # Interleaved writes land in order while reads are random
+    probes = [rng.randrange(2 * size) for _ in range(size)]  # About half of the probes are present
+    tree = STRUCTURES[name]()
+    results = {'add': measure(tree.add, keys), 'contains': measure(tree.contains, probes)}
+    repeats = [None] * min(size, 1000)
+    results['find_min'] = measure(lambda _: tree.find_min(), repeats)
+    results['find_max'] = measure(lambda _: tree.find_max(), repeats)
+    results['inorder_traversal'] = measure(lambda _: tree.inorder_traversal(), [None])
+    if workload == 'interleaved':
+        results['mixed'] = measure(_mixed_operation(tree, size, rng), list(range(size)))
+    removals = list(set(keys))
+    rng.shuffle(removals)
+    results['remove'] = measure(tree.remove, removals)
+    return results
+
+
+def _mixed_operation(tree, size: int, rng: random.Random):
+    """
+    Build the operation of the interleaved read/write phase: half lookups, a quarter of appends of new
+    largest keys and a quarter of removals of random keys.
+
+    :param tree: The structure under test.
+    :param size: The number of keys already inserted.
+    :param rng: The random generator to use.
+    :return: A function of the operation index.
+    """
+    def operation(index: int) -> None:
+        choice = rng.random()
+        if choice < 0.5:
+            tree.contains(rng.randrange(2 * size))
+        elif choice < 0.75:
+            tree.add(size + index)
+        else:
+            tree.remove(rng.randrange(size))
+    return operation
+
+
+def run(structures, workloads, sizes, seed: int = 0) -> dict:
+    """
+    Benchmark every combination of structures, workloads and sizes.
+
+    :param structures: Names from STRUCTURES.
+    :param workloads: Names from WORKLOADS.
+    :param sizes: Numbers of keys.
+    :param seed: The random seed.
+    :return: A JSON-serializable report.
+    """
+    report = {
+        'python': sys.version,
+        'implementation': platform.python_implementation(),
+        'machine': platform.machine(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'seed': seed,
+        'results': [],
+    }
+    for size in sizes:
+        for workload in workloads:
+            for name in structures:
+                print('{:>12} {:>12} {:>9}'.format(name, workload, size), file=sys.stderr)
+                report['results'].append({
+                    'structure': name,
+                    'workload': workload,
+                    'size': size,
+                    'operations': run_case(name, workload, size, seed),
+                })
+    return report
+
+
+def main(argv=None) -> None:
+    """
+    Parse the command line, run the benchmark and write the JSON report.
+
+    :param argv: The command line arguments, defaulting to sys.argv[1:].
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--structures', nargs='+', default=list(STRUCTURES), choices=list(STRUCTURES))
+    parser.add_argument('--workloads', nargs='+', default=list(WORKLOADS), choices=list(WORKLOADS))
+    parser.add_argument('--sizes', nargs='+', type=int, default=[1000, 10000],
+                        help='numbers of keys, e.g. 1000 10000 100000 1000000 10000000')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='file to write the JSON report to (default: standard output)')
+    args = parser.parse_args(argv)
+    report = run(args.structures, args.workloads, args.sizes, args.seed)
+    if args.output:
+        with open(args.output, 'w') as output:
+            json.dump(report, output, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,665 @@
+import random
+from bisect import bisect_left, bisect_right
+from itertools import chain
+from queue_ import Queue
+from serialization import dump_values, load_values
+
+DEFAULT_BLOCK_SIZE = 1000  # The usual number of values per block
+
+
+# BlockList is a sorted container of distinct values kept in sorted blocks.
+class BlockList:
+    """
+    BlockList Class.
+
+    This class implements the public API of AVL with a B-tree of height two: a list of sorted blocks of about
+    block_size values, and a list of the largest value of each block. A search is one bisect over the block
+    maxima and one bisect inside a block, both done in C, instead of about log2(n) Python-level steps through
+    node objects, and iteration walks plain lists. Inserting or removing a value moves at most
+    2 * block_size references inside one block; blocks are split when they double and merged with a
+    neighbour when they fall below half the block size. Operations that need positions (rank, select,
+    count_range) add up block lengths, which costs O(n / block_size) in C.
+    """
+    def __init__(self, start_tree=None, block_size: int = DEFAULT_BLOCK_SIZE) -> None:
+        """
+        Initialize a BlockList. If a start_tree is provided, its values are sorted once, de-duplicated and
+        cut into full blocks.
+
+        :param start_tree: An iterable of values to initialize the container.
+        :param block_size: The usual number of values per block.
+        :raises ValueError: If block_size is less than 2.
+        """
+        if block_size < 2:
+            raise ValueError("block_size must be at least 2")
+        self._block_size = block_size
+        self._lists = []  # The sorted blocks
+        self._maxes = []  # The largest value of each block
+        self._count = 0  # The number of values in the container
+        if start_tree is not None:
+            self._build(self._distinct_values(sorted(start_tree)))
+
+    @classmethod
+    def from_sorted(cls, iterable, block_size: int = DEFAULT_BLOCK_SIZE) -> 'BlockList':
+        """
+        Build a BlockList from values that are already in ascending order, in linear time.
+        Adjacent duplicates are dropped.
+
+        :param iterable: An iterable of values in ascending order.
+        :param block_size: The usual number of values per block.
+        :return: A new BlockList.
+        :raises ValueError: If the values are not in ascending order.
+        """
+        blocks = cls(block_size=block_size)
+        blocks._build(cls._distinct_values(iterable))
+        return blocks
+
+    def dump(self, fileobj) -> None:
+        """
+        Write the values to a binary file in ascending order, in the same framed format as the trees.
+
+        :param fileobj: A binary file object opened for writing.
+        """
+        dump_values(self, fileobj)
+
+    @classmethod
+    def load(cls, fileobj) -> 'BlockList':
+        """
+        Read values written by dump() (by this class or by any of the trees).
+
+        :param fileobj: A binary file object opened for reading.
+        :return: A new BlockList.
+        """
+        return cls.from_sorted(load_values(fileobj))
+
+    @staticmethod
+    def _distinct_values(values) -> list:
+        """
+        Drop adjacent duplicates from an ascending sequence of values.
+
+        :param values: An iterable of values in ascending order.
+        :return: A list of the distinct values in ascending order.
+        :raises ValueError: If the values are not in ascending order.
+        """
+        result = []
+        for value in values:
+            if result:
+                if value < result[-1]:
+                    raise ValueError("Values must be in ascending order")
+                if not result[-1] < value:  # Equal to the previous value
+                    continue
+            result.append(value)
+        return result
+
+    def _build(self, values: list) -> None:
+        """
+        Replace the contents with distinct ascending values, cut into blocks of block_size values.
+
+        :param values: Distinct values in ascending order.
+        """
+        size = self._block_size
+        self._lists = [values[start:start + size] for start in range(0, len(values), size)]
+        self._maxes = [block[-1] for block in self._lists]
+        self._count = len(values)
+
+    def __str__(self) -> str:
+        """
+        String representation of the BlockList, in ascending order.
+
+        :return: A string representation of the values.
+        """
+        return "BlockList { " + ", ".join(str(value) for value in self) + " }"
+
+    def __len__(self) -> int:
+        """
+        Return the number of values in O(1).
+
+        :return: The number of values.
+        """
+        return self._count
+
+    def __iter__(self):
+        """
+        Iterate over the values in ascending order.
+
+        :return: An iterator of the values in ascending order.
+        """
+        return chain.from_iterable(self._lists)
+
+    def __reversed__(self):
+        """
+        Iterate over the values in descending order.
+
+        :return: An iterator of the values in descending order.
+        """
+        return chain.from_iterable(map(reversed, reversed(self._lists)))
+
+    def is_valid(self) -> bool:
+        """
+        Check the invariants of the container: every block is non-empty and not more than twice the block
+        size, the values are strictly ascending across blocks, every block maximum is recorded and the
+        count matches.
+
+        :return: True if the container is valid, otherwise False.
+        """
+        if len(self._lists) != len(self._maxes):
+            return False
+        previous = None
+        for block, largest in zip(self._lists, self._maxes):
+            if not block or len(block) > 2 * self._block_size or block[-1] is not largest:
+                return False
+            for value in block:
+                if previous is not None and not previous < value:
+                    return False
+                previous = value
+        return sum(map(len, self._lists)) == self._count
+
+    def add(self, value: object) -> None:
+        """
+        Add a value. If the value already exists, the function returns without adding it.
+
+        :param value: The value to add.
+        """
+        maxes = self._maxes
+        if not maxes:
+            self._lists.append([value])
+            maxes.append(value)
+            self._count = 1
+            return
+        index = bisect_left(maxes, value)
+        if index == len(maxes):  # Larger than every value: append to the last block
+            index -= 1
+            block = self._lists[index]
+            block.append(value)
+            maxes[index] = value
+        else:
+            block = self._lists[index]
+            position = bisect_left(block, value)
+            if not value < block[position]:  # Value already exists
+                return
+            block.insert(position, value)
+        self._count += 1
+        if len(block) > 2 * self._block_size:
+            self._split_block(index)
+
+    def remove(self, value: object) -> bool:
+        """
+        Remove a value.
+
+        :param value: The value to remove.
+        :return: True if the value was removed, False if it was not found.
+        """
+        maxes = self._maxes
+        index = bisect_left(maxes, value)
+        if index == len(maxes):
+            return False
+        block = self._lists[index]
+        position = bisect_left(block, value)
+        if value < block[position]:
+            return False
+        del block[position]
+        self._count -= 1
+        if not block:
+            del self._lists[index]
+            del maxes[index]
+        else:
+            maxes[index] = block[-1]
+            if len(block) < self._block_size // 2 and len(self._lists) > 1:
+                self._merge_block(index)
+        return True
+
+    def _split_block(self, index: int) -> None:
+        """
+        Split a block in two halves.
+
+        :param index: The position of the block.
+        """
+        block = self._lists[index]
+        half = len(block) // 2
+        self._lists.insert(index + 1, block[half:])
+        del block[half:]
+        self._maxes.insert(index, block[-1])
+
+    def _merge_block(self, index: int) -> None:
+        """
+        Merge a block with its next neighbour (or its previous one, for the last block), splitting the
+        result again if it is too large.
+
+        :param index: The position of the block.
+        """
+        if index == len(self._lists) - 1:
+            index -= 1
+        self._lists[index].extend(self._lists[index + 1])
+        self._maxes[index] = self._maxes[index + 1]
+        del self._lists[index + 1]
+        del self._maxes[index + 1]
+        if len(self._lists[index]) > 2 * self._block_size:
+            self._split_block(index)
+
+    def contains(self, value: object) -> bool:
+        """
+        Check if the container holds a value.
+
+        :param value: The value to check.
+        :return: True if the value is in the container, False otherwise.
+        """
+        index = bisect_left(self._maxes, value)
+        if index == len(self._maxes):
+            return False
+        block = self._lists[index]
+        return not value < block[bisect_left(block, value)]
+
+    def add_many(self, values) -> int:
+        """
+        Add a batch of values. A large batch is merged with the contents in one linear pass.
+
+        :param values: An iterable of values to add.
+        :return: The number of values that were not already in the container.
+        """
+        batch = self._distinct_values(sorted(values))
+        count = self._count
+        if len(batch) * 8 < count:
+            for value in batch:
+                self.add(value)
+        else:
+            self._build(list(self._merge(list(self), batch, True, True, True)))
+        return self._count - count
+
+    def remove_many(self, values) -> int:
+        """
+        Remove a batch of values. A large batch is merged with the contents in one linear pass.
+
+        :param values: An iterable of values to remove.
+        :return: The number of values that were in the container and have been removed.
+        """
+        batch = self._distinct_values(sorted(values))
+        count = self._count
+        if len(batch) * 8 < count:
+            for value in batch:
+                self.remove(value)
+        else:
+            self._build(list(self._merge(list(self), batch, True, False, False)))
+        return count - self._count
+
+    def contains_many(self, values) -> list:
+        """
+        Check a batch of values.
+
+        :param values: An iterable of values to check.
+        :return: A list of booleans, one per value in the input order, telling whether it is in the container.
+        """
+        return [self.contains(value) for value in values]
+
+    def inorder_traversal(self) -> Queue:
+        """
+        Get the values in ascending order in a queue, like the trees do.
+
+        :return: A queue of the values in ascending order.
+        """
+        queue = Queue()
+        for value in self:
+            queue.enqueue(value)
+        return queue
+
+    def irange(self, low: object = None, high: object = None, inclusive=(True, False), reverse=False):
+        """
+        Lazily iterate over the values between two bounds.
+
+        :param low: The lower bound, or None for no lower bound.
+        :param high: The upper bound, or None for no upper bound.
+        :param inclusive: A pair of booleans telling whether low and high themselves are included.
+        :param reverse: If True, values are produced in descending order.
+        :return: A generator of the values within the bounds.
+        """
+        low_inclusive, high_inclusive = inclusive
+        lists = self._lists
+        first_block, first = (0, 0) if low is None else self._position(low, not low_inclusive)
+        last_block, last = (len(lists), 0) if high is None else self._position(high, high_inclusive)
+        if (first_block, first) >= (last_block, last):
+            return
+        if first_block == last_block:
+            pieces = [lists[first_block][first:last]]
+        else:
+            pieces = [lists[first_block][first:]] + lists[first_block + 1:last_block]
+            if last:
+                pieces.append(lists[last_block][:last])
+        if reverse:
+            for piece in reversed(pieces):
+                yield from reversed(piece)
+        else:
+            for piece in pieces:
+                yield from piece
+
+    def _position(self, value: object, after: bool) -> tuple:
+        """
+        Find where a value is, or would be inserted.
+
+        :param value: The value to locate.
+        :param after: If True, locate the first value greater than value, otherwise the first value
+                      greater than or equal to it.
+        :return: A tuple (block, index), which is (number of blocks, 0) past the last value.
+        """
+        search = bisect_right if after else bisect_left
+        block = search(self._maxes, value)
+        if block == len(self._maxes):
+            return block, 0
+        return block, search(self._lists[block], value)
+
+    def rank(self, value: object) -> int:
+        """
+        Count the values that are strictly less than a given value.
+
+        :param value: The value to rank. It does not need to be in the container.
+        :return: The number of values less than value.
+        """
+        block, index = self._position(value, False)
+        return sum(map(len, self._lists[:block])) + index
+
+    def select(self, k: int) -> object:
+        """
+        Return the k-th smallest value (0-based).
+
+        :param k: The position of the value in sorted order.
+        :return: The value at position k.
+        :raises IndexError: If k is outside the range [0, len(container)).
+        """
+        if k < 0 or k >= self._count:
+            raise IndexError("BlockList index out of range")
+        for block in self._lists:
+            if k < len(block):
+                return block[k]
+            k -= len(block)
+
+    def count_range(self, low: object, high: object) -> int:
+        """
+        Count the values v with low <= v <= high.
+
+        :param low: The lower bound (inclusive).
+        :param high: The upper bound (inclusive).
+        :return: The number of values within the bounds.
+        """
+        if high < low:
+            return 0
+        first_block, first = self._position(low, False)
+        last_block, last = self._position(high, True)
+        return sum(map(len, self._lists[first_block:last_block])) + last - first
+
+    def find_min(self) -> object:
+        """
+        Find the minimum value.
+
+        :return: The minimum value, or None if the container is empty.
+        """
+        return self._lists[0][0] if self._lists else None
+
+    def find_max(self) -> object:
+        """
+        Find the maximum value.
+
+        :return: The maximum value, or None if the container is empty.
+        """
+        return self._maxes[-1] if self._maxes else None
+
+    def floor(self, value: object) -> object:
+        """
+        Find the largest value that is less than or equal to a given value.
+
+        :param value: The value to compare against. It does not need to be in the container.
+        :return: The largest value <= value, or None if there is none.
+        """
+        return self._value_before(*self._position(value, True))
+
+    def ceiling(self, value: object) -> object:
+        """
+        Find the smallest value that is greater than or equal to a given value.
+
+        :param value: The value to compare against. It does not need to be in the container.
+        :return: The smallest value >= value, or None if there is none.
+        """
+        return self._value_at(*self._position(value, False))
+
+    def lower(self, value: object) -> object:
+        """
+        Find the largest value that is strictly less than a given value.
+
+        :param value: The value to compare against. It does not need to be in the container.
+        :return: The largest value < value, or None if there is none.
+        """
+        return self._value_before(*self._position(value, False))
+
+    def higher(self, value: object) -> object:
+        """
+        Find the smallest value that is strictly greater than a given value.
+
+        :param value: The value to compare against. It does not need to be in the container.
+        :return: The smallest value > value, or None if there is none.
+        """
+        return self._value_at(*self._position(value, True))
+
+    def _value_at(self, block: int, index: int) -> object:
+        """
+        Get the value at a position returned by _position().
+
+        :param block: The index of the block.
+        :param index: The index within the block.
+        :return: The value, or None past the last value.
+        """
+        return None if block == len(self._lists) else self._lists[block][index]
+
+    def _value_before(self, block: int, index: int) -> object:
+        """
+        Get the value just before a position returned by _position().
+
+        :param block: The index of the block.
+        :param index: The index within the block.
+        :return: The value, or None before the first value.
+        """
+        if index:
+            return self._lists[block][index - 1]
+        return self._lists[block - 1][-1] if block else None
+
+    def nearest(self, value: object, k: int = 1) -> list:
+        """
+        Find the k values closest to a given value, walking outwards from it in both directions. The values
+        must support subtraction. Of two values at the same distance, the smaller one comes first.
+
+        :param value: The value to search around. It does not need to be in the container.
+        :param k: The number of values to return.
+        :return: A list of at most k values, closest first.
+        """
+        below = self.irange(None, value, (True, True), True)  # Descending from value
+        above = self.irange(value, None, (False, False))  # Ascending from just above value
+        result = []
+        missing = object()  # Marks an exhausted side, since values may be None
+        low, high = next(below, missing), next(above, missing)
+        while len(result) < k and (low is not missing or high is not missing):
+            if high is missing or (low is not missing and not high - value < value - low):
+                result.append(low)
+                low = next(below, missing)
+            else:
+                result.append(high)
+                high = next(above, missing)
+        return result
+
+    def is_empty(self) -> bool:
+        """
+        Check if the container is empty.
+
+        :return: True if the container is empty, False otherwise.
+        """
+        return self._count == 0
+
+    def make_empty(self) -> None:
+        """
+        Empty the container.
+        """
+        self._lists = []
+        self._maxes = []
+        self._count = 0
+
+    def copy(self) -> 'BlockList':
+        """
+        Make an independent copy in linear time.
+
+        :return: A new BlockList with the same values.
+        """
+        blocks = type(self)(block_size=self._block_size)
+        blocks._lists = [list(block) for block in self._lists]
+        blocks._maxes = list(self._maxes)
+        blocks._count = self._count
+        return blocks
+
+    def split(self, value: object) -> tuple:
+        """
+        Split the container around a value, cutting a single block. This container is left empty.
+
+        :param value: The value to split around.
+        :return: A tuple (smaller, found, larger) with a BlockList of the values less than value, whether value
+                 was in the container, and a BlockList of the values greater than value.
+        """
+        block, index = self._position(value, False)
+        lists = self._lists
+        found = block < len(lists) and not value < lists[block][index]
+        smaller, larger = type(self)(block_size=self._block_size), type(self)(block_size=self._block_size)
+        smaller._lists = lists[:block]
+        larger._lists = lists[block + 1:]
+        if block < len(lists):
+            head, tail = lists[block][:index], lists[block][index + found:]
+            if head:
+                smaller._lists.append(head)
+            if tail:
+                larger._lists.insert(0, tail)
+        for part in (smaller, larger):
+            part._maxes = [piece[-1] for piece in part._lists]
+            part._count = sum(map(len, part._lists))
+        self.make_empty()
+        return smaller, found, larger
+
+    @classmethod
+    def join(cls, left: 'BlockList', pivot: object, right: 'BlockList') -> 'BlockList':
+        """
+        Join two containers and a pivot value by concatenating their blocks. Every value of left must be less
+        than pivot and every value of right greater than it. Both containers are left empty.
+
+        :param left: The container of the values less than pivot.
+        :param pivot: The value between the two containers.
+        :param right: The container of the values greater than pivot.
+        :return: A new BlockList with the values of left, pivot and the values of right.
+        :raises ValueError: If the values are not ordered around the pivot.
+        """
+        if (not left.is_empty() and not left.find_max() < pivot) or \
+                (not right.is_empty() and not pivot < right.find_min()):
+            raise ValueError("Values must be ordered as left < pivot < right")
+        blocks = cls(block_size=left._block_size)
+        blocks._lists = left._lists + [[pivot]] + right._lists
+        blocks._maxes = left._maxes + [pivot] + right._maxes
+        blocks._count = left._count + 1 + right._count
+        index = len(left._lists)
+        if blocks._lists[index - 1:index] and len(blocks._lists) > 1:
+            blocks._merge_block(index - 1)  # Fold the pivot into the last block of left
+        left.make_empty()
+        right.make_empty()
+        return blocks
+
+    def union(self, other: 'BlockList') -> None:
+        """
+        Add every value of another container to this one in one linear merge. The other container is
+        left empty.
+
+        :param other: The container whose values are added.
+        """
+        self._combine(other, True, True, True)
+
+    def intersection(self, other: 'BlockList') -> None:
+        """
+        Keep only the values that are also in another container. The other container is left empty.
+
+        :param other: The container to intersect with.
+        """
+        self._combine(other, False, False, True)
+
+    def difference(self, other: 'BlockList') -> None:
+        """
+        Remove every value of another container from this one. The other container is left empty.
+
+        :param other: The container whose values are removed.
+        """
+        self._combine(other, True, False, False)
+
+    def symmetric_difference(self, other: 'BlockList') -> None:
+        """
+        Keep the values that are in exactly one of the two containers. The other container is left empty.
+
+        :param other: The container to combine with.
+        """
+        self._combine(other, True, True, False)
+
+    def _combine(self, other: 'BlockList', keep_first: bool, keep_second: bool, keep_both: bool) -> None:
+        """
+        Replace the contents with a merge of this container and another one, which is left empty.
+
+        :param other: The other container.
+        :param keep_first: Whether values only in this container are kept.
+        :param keep_second: Whether values only in the other container are kept.
+        :param keep_both: Whether values in both containers are kept.
+        """
+        if other is self:
+            if not keep_both:
+                self.make_empty()
+            return
+        values = list(self._merge(list(self), list(other), keep_first, keep_second, keep_both))
+        other.make_empty()
+        self._build(values)
+
+    @staticmethod
+    def _merge(first: list, second: list, keep_first: bool, keep_second: bool, keep_both: bool):
+        """
+        Merge two lists of distinct ascending values.
+
+        :param first: The first list.
+        :param second: The second list.
+        :param keep_first: Whether values only in the first list are produced.
+        :param keep_second: Whether values only in the second list are produced.
+        :param keep_both: Whether values in both lists are produced (once, from the first list).
+        :return: A generator of the kept values in ascending order.
+        """
+        i = j = 0
+        while i < len(first) and j < len(second):
+            if first[i] < second[j]:
+                if keep_first:
+                    yield first[i]
+                i += 1
+            elif second[j] < first[i]:
+                if keep_second:
+                    yield second[j]
+                j += 1
+            else:
+                if keep_both:
+                    yield first[i]
+                i += 1
+                j += 1
+        if keep_first:
+            yield from first[i:]
+        if keep_second:
+            yield from second[j:]
+
+
+if __name__ == '__main__':
+    print("\nPDF - BlockList example 1")
+    print("-------------------------")
+    blocks = BlockList([10, 20, 5, 15, 17, 7, 12], block_size=2)
+    print(blocks)
+    print("Range [7, 17):", list(blocks.irange(7, 17)))
+    print("Rank of 15:", blocks.rank(15), "- value at 3:", blocks.select(3))
+
+    print("\nPDF - BlockList add() and remove() stress test")
+    print("----------------------------------------------")
+    for _ in range(100):
+        case = list(set(random.randrange(1, 20000) for _ in range(900)))
+        blocks = BlockList(case[:300], block_size=16)
+        for value in case[300:]:
+            blocks.add(value)
+        for value in case[::2]:
+            blocks.remove(value)
+        if not blocks.is_valid() or list(blocks) != sorted(case[1::2]):
+            raise Exception("PROBLEM WITH ADD/REMOVE OPERATION")
+    print('add() and remove() stress test finished')
@@ -1,6 +1,7 @@
 import random
 from queue_ import Queue
 from stack import Stack
+from serialization import dump_values, load_values
 
 # BSTNode is a node in the Binary Search Tree.
 class BSTNode:
@@ -11,6 +12,7 @@ class BSTNode:
         :param value: The value to be stored in the node.
         """
         self.value = value
+        self.key = value  # The key the node is ordered by, replaced by trees that have a key function
         self.left = None
         self.right = None
 
@@ -24,6 +26,10 @@ class BSTNode:
 
 # BST is a Binary Search Tree.
 class BST:
+    _distinct = False  # Whether the tree holds each value at most once
+    _key = None  # The function mapping a value to the key it is ordered by, or None to order values directly
+    _transient = ()  # Attributes that are not pickled, such as caches of nodes
+
     def __init__(self, start_tree=None) -> None:
         """
         Initialize a BST.
@@ -35,6 +41,119 @@ class BST:
             for value in start_tree:  # For each value in the starting tree
                 self.add(value)  # Add the value to the BST
 
+    @classmethod
+    def from_sorted(cls, iterable) -> 'BST':
+        """
+        Build a balanced tree from values that are already in ascending order, in linear time.
+        Trees that hold distinct values drop adjacent duplicates.
+
+        :param iterable: An iterable of values in ascending order.
+        :return: A new tree.
+        :raises ValueError: If the values are not in ascending order.
+        """
+        tree = cls()
+        tree._root = tree._build_balanced(tree._sorted_values(iterable))
+        return tree
+
+    def _sorted_values(self, values) -> list:
+        """
+        Check that values are in ascending order, dropping adjacent duplicates if the tree holds distinct values.
+
+        :param values: An iterable of values in ascending order.
+        :return: A list of the values.
+        :raises ValueError: If the values are not in ascending order.
+        """
+        result = []
+        last = None  # The key of the previous value
+        for value in values:
+            key = self._key_of(value)
+            if result:
+                if key < last:
+                    raise ValueError("Values must be in ascending order")
+                if self._distinct and not last < key:  # Equal to the previous value
+                    continue
+            result.append(value)
+            last = key
+        return result
+
+    def _key_of(self, value: object) -> object:
+        """
+        Get the key a value is ordered by.
+
+        :param value: The value.
+        :return: The key of the value, which is the value itself when the tree has no key function.
+        """
+        return value if self._key is None else self._key(value)
+
+    def _build_balanced(self, values: list) -> BSTNode:
+        """
+        Build a balanced subtree from a list of values in ascending order. Equal values must stay in the right
+        subtree, so each subtree root is the first value of its run of equal values.
+
+        :param values: The values to be stored in the subtree.
+        :return: The root of the new subtree, or None if values is empty.
+        """
+        root = BSTNode(None)  # Placeholder whose left child becomes the real root
+        stack = Stack()
+        stack.push((0, len(values) - 1, root, True))
+        while not stack.is_empty():
+            low, high, parent, is_left = stack.pop()
+            if low > high:
+                continue
+            middle = (low + high) // 2
+            while middle > low and not values[middle - 1] < values[middle]:  # Move to the first equal value
+                middle -= 1
+            node = BSTNode(values[middle])
+            if is_left:
+                parent.left = node
+            else:
+                parent.right = node
+            stack.push((low, middle - 1, node, True))
+            stack.push((middle + 1, high, node, False))
+        return root.left
+
+    def dump(self, fileobj) -> None:
+        """
+        Write the values of the tree to a binary file in ascending order, in a compact framed format.
+
+        :param fileobj: A binary file object opened for writing.
+        """
+        dump_values(self, fileobj)
+
+    @classmethod
+    def load(cls, fileobj) -> 'BST':
+        """
+        Read a tree written by dump(), building it bottom-up in linear time.
+
+        :param fileobj: A binary file object opened for reading.
+        :return: A new tree.
+        """
+        return cls.from_sorted(load_values(fileobj))
+
+    def __getstate__(self) -> dict:
+        """
+        Get the state to pickle. The node structure is replaced by the in-order values, so pickling does not
+        recurse through the nodes.
+
+        :return: The state of the tree.
+        """
+        state = self.__dict__.copy()
+        for name in self._transient:
+            state.pop(name, None)
+        state['_root'] = list(self)
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        """
+        Restore a pickled state, rebuilding the nodes bottom-up from the in-order values.
+
+        :param state: The state returned by __getstate__.
+        """
+        state = dict(state)
+        values = state.pop('_root')
+        self.__dict__.update(state)
+        self._root = self._build_balanced(values)
+
     def __str__(self) -> str:
         """
         String representation of the BST.
@@ -77,9 +196,9 @@ class BST:
         while not stack.is_empty():
             node = stack.pop()
             if node:
-                if node.left and node.left.value >= node.value:
+                if node.left and node.left.key >= node.key:
                     return False
-                if node.right and node.right.value < node.value:
+                if node.right and node.right.key < node.key:
                     return False
                 stack.push(node.right)
                 stack.push(node.left)
@@ -222,6 +341,93 @@ class BST:
 
         return inorder_queue
 
+    def __iter__(self):
+        """
+        Lazily iterate over the values of the BST in ascending order.
+
+        Values are produced one at a time using an explicit stack, so only O(height) nodes are held in
+        memory instead of materializing the whole traversal like inorder_traversal() does.
+
+        :return: A generator of the values in ascending order.
+        """
+        return self.irange()
+
+    def __reversed__(self):
+        """
+        Lazily iterate over the values of the BST in descending order.
+
+        :return: A generator of the values in descending order.
+        """
+        return self.irange(reverse=True)
+
+    def irange(self, low: object = None, high: object = None, inclusive=(True, False), reverse=False):
+        """
+        Lazily iterate over the values between two bounds.
+
+        Only the path to the first value in range and the values actually produced are visited, so reading
+        k values costs O(height + k) regardless of the size of the tree.
+
+        :param low: The lower bound, or None for no lower bound.
+        :param high: The upper bound, or None for no upper bound.
+        :param inclusive: A pair of booleans telling whether low and high themselves are included.
+        :param reverse: If True, values are produced in descending order.
+        :return: A generator of the values within the bounds.
+        """
+        if low is not None:
+            low = self._key_of(low)
+        if high is not None:
+            high = self._key_of(high)
+        for node in self._irange_nodes(low, high, inclusive, reverse):
+            yield node.value
+
+    def _irange_nodes(self, low: object, high: object, inclusive, reverse: bool):
+        """
+        A helper generator for irange() that produces the nodes between two bounds.
+
+        :param low: The key of the lower bound, or None for no lower bound.
+        :param high: The key of the upper bound, or None for no upper bound.
+        :param inclusive: A pair of booleans telling whether low and high themselves are included.
+        :param reverse: If True, nodes are produced in descending order.
+        :return: A generator of the nodes within the bounds.
+        """
+        low_inclusive, high_inclusive = inclusive
+        stack = Stack()
+        node = self._root
+        if not reverse:
+            # Push the path to the first node that is not below the lower bound
+            while node is not None:
+                if low is not None and (node.key < low or (not low_inclusive and not low < node.key)):
+                    node = node.right  # The node and its left subtree are below the range
+                else:
+                    stack.push(node)
+                    node = node.left
+            while not stack.is_empty():
+                node = stack.pop()
+                if high is not None and (high < node.key or (not high_inclusive and not node.key < high)):
+                    return  # Every remaining node is above the range
+                yield node
+                node = node.right  # Continue with the left most node of the right subtree
+                while node is not None:
+                    stack.push(node)
+                    node = node.left
+        else:
+            # Push the path to the last node that is not above the upper bound
+            while node is not None:
+                if high is not None and (high < node.key or (not high_inclusive and not node.key < high)):
+                    node = node.left  # The node and its right subtree are above the range
+                else:
+                    stack.push(node)
+                    node = node.right
+            while not stack.is_empty():
+                node = stack.pop()
+                if low is not None and (node.key < low or (not low_inclusive and not low < node.key)):
+                    return  # Every remaining node is below the range
+                yield node
+                node = node.left  # Continue with the right most node of the left subtree
+                while node is not None:
+                    stack.push(node)
+                    node = node.right
+
     def find_min(self) -> object:
         """
         Find the minimum value in the BST.
@@ -252,6 +458,144 @@ class BST:
             node = node.right
         return node.value
 
+    def floor(self, value: object) -> object:
+        """
+        Find the largest value in the BST that is less than or equal to a given value, in O(height).
+
+        :param value: The value to compare against. It does not need to be in the BST.
+        :return: The largest value <= value, or None if there is none.
+        """
+        node = self._bound_node(self._key_of(value), True, True)
+        return None if node is None else node.value
+
+    def ceiling(self, value: object) -> object:
+        """
+        Find the smallest value in the BST that is greater than or equal to a given value, in O(height).
+
+        :param value: The value to compare against. It does not need to be in the BST.
+        :return: The smallest value >= value, or None if there is none.
+        """
+        node = self._bound_node(self._key_of(value), False, True)
+        return None if node is None else node.value
+
+    def lower(self, value: object) -> object:
+        """
+        Find the largest value in the BST that is strictly less than a given value, in O(height).
+
+        :param value: The value to compare against. It does not need to be in the BST.
+        :return: The largest value < value, or None if there is none.
+        """
+        node = self._bound_node(self._key_of(value), True, False)
+        return None if node is None else node.value
+
+    def higher(self, value: object) -> object:
+        """
+        Find the smallest value in the BST that is strictly greater than a given value, in O(height).
+
+        :param value: The value to compare against. It does not need to be in the BST.
+        :return: The smallest value > value, or None if there is none.
+        """
+        node = self._bound_node(self._key_of(value), False, False)
+        return None if node is None else node.value
+
+    def _bound_node(self, key: object, below: bool, inclusive: bool) -> BSTNode:
+        """
+        A helper for floor(), ceiling(), lower() and higher() that finds, in a single descent, the node with the
+        largest key below a bound or the smallest key above it.
+
+        :param key: The key of the bound.
+        :param below: If True, look for the largest key below the bound, otherwise for the smallest key above it.
+        :param inclusive: Whether a key equal to the bound qualifies.
+        :return: The node found, or None if there is none.
+        """
+        node = self._root
+        found = None
+        while node is not None:
+            if below:
+                if node.key < key or (inclusive and not key < node.key):
+                    found = node  # A candidate, but a larger one may be in the right subtree
+                    node = node.right
+                else:
+                    node = node.left
+            else:
+                if key < node.key or (inclusive and not node.key < key):
+                    found = node  # A candidate, but a smaller one may be in the left subtree
+                    node = node.left
+                else:
+                    node = node.right
+        return found
+
+    def nearest(self, value: object, k: int = 1) -> list:
+        """
+        Find the k values closest to a given value in O(height + k), walking outwards from it in both
+        directions. The distance between two values is the absolute difference of their keys, so the keys
+        must support subtraction. Of two values at the same distance, the smaller one comes first.
+
+        :param value: The value to search around. It does not need to be in the BST.
+        :param k: The number of values to return.
+        :return: A list of at most k values, closest first.
+        """
+        key = self._key_of(value)
+        below = self.irange(None, value, (True, True), True)  # Descending from value
+        above = self.irange(value, None, (False, False))  # Ascending from just above value
+        result = []
+        missing = object()  # Marks an exhausted side, since values may be None
+        low, high = next(below, missing), next(above, missing)
+        while len(result) < k and (low is not missing or high is not missing):
+            if high is missing or (low is not missing and
+                                   not self._key_of(high) - key < key - self._key_of(low)):
+                result.append(low)
+                low = next(below, missing)
+            else:
+                result.append(high)
+                high = next(above, missing)
+        return result
+
+    def successor(self, node: BSTNode) -> BSTNode:
+        """
+        Find the node that follows a node of the BST in order. Nodes have no parent links here, so the
+        ancestors are found by descending from the root, in O(height).
+
+        :param node: A node of the BST.
+        :return: The next node in order, or None if node holds the largest value.
+        """
+        if node.right is not None:  # The left most node of the right subtree
+            node = node.right
+            while node.left is not None:
+                node = node.left
+            return node
+        found = None  # The last ancestor whose left subtree holds node
+        ancestor = self._root
+        while ancestor is not node:
+            if node.key < ancestor.key:
+                found = ancestor
+                ancestor = ancestor.left
+            else:  # Equal keys are stored in the right subtree
+                ancestor = ancestor.right
+        return found
+
+    def predecessor(self, node: BSTNode) -> BSTNode:
+        """
+        Find the node that precedes a node of the BST in order, in O(height).
+
+        :param node: A node of the BST.
+        :return: The previous node in order, or None if node holds the smallest value.
+        """
+        if node.left is not None:  # The right most node of the left subtree
+            node = node.left
+            while node.right is not None:
+                node = node.right
+            return node
+        found = None  # The last ancestor whose right subtree holds node
+        ancestor = self._root
+        while ancestor is not node:
+            if node.key < ancestor.key:
+                ancestor = ancestor.left
+            else:
+                found = ancestor
+                ancestor = ancestor.right
+        return found
+
     def is_empty(self) -> bool:
         """
         Check if the BST is empty.
@@ -408,6 +752,14 @@ if __name__ == '__main__':
     print(tree)
     print("Maximum value is:", tree.find_max())
 
+    print("\nPDF - method floor() and ceiling() example 1")
+    print("--------------------------------------------")
+    tree = BST([10, 20, 5, 15, 17, 7, 12])
+    print(tree)
+    print("floor(14):", tree.floor(14), "ceiling(14):", tree.ceiling(14))
+    print("lower(15):", tree.lower(15), "higher(15):", tree.higher(15))
+    print("nearest(14, 3):", tree.nearest(14, 3))
+
     print("\nPDF - method is_empty() example 1")
     print("---------------------------------")
     tree = BST([10, 20, 5, 15, 17, 7, 12])
@@ -0,0 +1,642 @@
+import random
+from array import array
+from queue_ import Queue
+from stack import Stack
+from serialization import dump_values, load_values
+
+NIL = -1  # Handle used for a missing child, parent or root
+
+
+# CompactAVL is an AVL tree whose nodes are rows in parallel columns instead of Python objects.
+class CompactAVL:
+    """
+    CompactAVL Class.
+
+    This class implements the same operations as AVL, but every node is an integer handle into parallel
+    columns: a list of keys and compact arrays of left, right and parent handles and heights. A node costs
+    about 21 bytes plus its key instead of a full object with a __dict__, and removed slots are recycled
+    through a free-list that is chained through the left column.
+    """
+    def __init__(self, start_tree=None) -> None:
+        """
+        Initialize a CompactAVL. If a start_tree is provided, its values are sorted, de-duplicated and
+        built bottom-up into a perfectly balanced tree.
+
+        :param start_tree: An iterable of values to initialize the tree.
+        """
+        self._keys = []  # The value stored in each slot
+        self._left = array('i')  # The handle of the left child of each slot
+        self._right = array('i')  # The handle of the right child of each slot
+        self._parent = array('i')  # The handle of the parent of each slot
+        self._height = array('b')  # The height of each slot within the tree
+        self._root = NIL
+        self._count = 0  # The number of values in the tree
+        self._free = NIL  # The head of the free-list of removed slots
+        if start_tree is not None:
+            self._build(sorted(start_tree))
+
+    @classmethod
+    def from_sorted(cls, iterable) -> 'CompactAVL':
+        """
+        Build a CompactAVL from values that are already in ascending order in linear time.
+
+        :param iterable: An iterable of values in ascending order.
+        :return: A new, perfectly balanced CompactAVL.
+        :raises ValueError: If the values are not in ascending order.
+        """
+        tree = cls()
+        tree._build(iterable)
+        return tree
+
+    def dump(self, fileobj) -> None:
+        """
+        Write the values of the tree to a binary file in ascending order, in a compact framed format.
+
+        :param fileobj: A binary file object opened for writing.
+        """
+        dump_values(self, fileobj)
+
+    @classmethod
+    def load(cls, fileobj) -> 'CompactAVL':
+        """
+        Read a tree written by dump(), building it bottom-up in linear time.
+
+        :param fileobj: A binary file object opened for reading.
+        :return: A new tree.
+        """
+        return cls.from_sorted(load_values(fileobj))
+
+    def _build(self, values) -> None:
+        """
+        Replace the contents of the tree with a perfectly balanced tree of the given ascending values.
+        The i-th distinct value is stored in slot i, so no free-list bookkeeping is needed.
+
+        :param values: An iterable of values in ascending order.
+        :raises ValueError: If the values are not in ascending order.
+        """
+        keys = self._distinct_values(values)
+        count = len(keys)
+        self._keys = keys
+        self._left = array('i', [NIL]) * count
+        self._right = array('i', [NIL]) * count
+        self._parent = array('i', [NIL]) * count
+        self._height = array('b', [0]) * count
+        self._free = NIL
+        self._count = count
+        self._root = self._build_range(0, count - 1, NIL)
+
+    @staticmethod
+    def _distinct_values(values) -> list:
+        """
+        Drop adjacent duplicates from an ascending sequence of values.
+
+        :param values: An iterable of values in ascending order.
+        :return: A list of the distinct values in ascending order.
+        :raises ValueError: If the values are not in ascending order.
+        """
+        keys = []
+        for value in values:
+            if keys:
+                if value < keys[-1]:
+                    raise ValueError("Values must be in ascending order")
+                if not keys[-1] < value:  # Equal to the previous value
+                    continue
+            keys.append(value)
+        return keys
+
+    def _build_range(self, low: int, high: int, parent: int) -> int:
+        """
+        Recursive helper for _build that links the slots low..high into a balanced subtree.
+
+        :param low: The first slot of the subtree.
+        :param high: The last slot of the subtree.
+        :param parent: The handle of the parent of the subtree root.
+        :return: The handle of the subtree root, or NIL if the range is empty.
+        """
+        if low > high:
+            return NIL
+        middle = (low + high) // 2
+        self._parent[middle] = parent
+        self._left[middle] = self._build_range(low, middle - 1, middle)
+        self._right[middle] = self._build_range(middle + 1, high, middle)
+        self._update_height(middle)
+        return middle
+
+    def __str__(self) -> str:
+        """
+        String representation of the CompactAVL using a pre-order traversal.
+
+        :return: A string representation of the tree.
+        """
+        values = []
+        stack = Stack()
+        stack.push(self._root)
+        while not stack.is_empty():
+            node = stack.pop()
+            if node != NIL:
+                values.append(str(self._keys[node]))
+                stack.push(self._right[node])
+                stack.push(self._left[node])
+        return type(self).__name__ + " pre-order { " + ", ".join(values) + " }"
+
+    def __len__(self) -> int:
+        """
+        Return the number of values in the tree.
+
+        :return: The number of values in the tree.
+        """
+        return self._count
+
+    def get_root(self) -> int:
+        """
+        Get the handle of the root of the tree.
+
+        :return: The handle of the root, or NIL if the tree is empty.
+        """
+        return self._root
+
+    def is_valid_avl(self) -> bool:
+        """
+        Check that every slot reachable from the root respects the ordering, the parent links,
+        the stored heights and the AVL balance property.
+
+        :return: True if the tree is a valid AVL tree, False otherwise.
+        """
+        keys, left, right, parent = self._keys, self._left, self._right, self._parent
+        if self._root != NIL and parent[self._root] != NIL:
+            return False
+        stack = Stack()
+        stack.push(self._root)
+        seen = 0
+        while not stack.is_empty():
+            node = stack.pop()
+            if node == NIL:
+                continue
+            seen += 1
+            for child in (left[node], right[node]):
+                if child != NIL and parent[child] != node:
+                    return False
+            if left[node] != NIL and not keys[left[node]] < keys[node]:
+                return False
+            if right[node] != NIL and not keys[node] < keys[right[node]]:
+                return False
+            left_height = self._get_height(left[node])
+            right_height = self._get_height(right[node])
+            if self._height[node] != max(left_height, right_height) + 1 or abs(left_height - right_height) > 1:
+                return False
+            stack.push(right[node])
+            stack.push(left[node])
+        return seen == self._count and self._is_sorted()
+
+    def _is_sorted(self) -> bool:
+        """
+        Check that an in-order walk produces strictly increasing values.
+
+        :return: True if the values are strictly increasing, False otherwise.
+        """
+        previous = None
+        for index, value in enumerate(self):
+            if index and not previous < value:
+                return False
+            previous = value
+        return True
+
+    def add(self, value: object) -> None:
+        """
+        Add a value to the tree. If the value already exists, the function returns without adding it.
+        After adding the new slot, the tree is rebalanced to maintain the AVL tree property.
+
+        :param value: The value to add to the tree.
+        """
+        keys, left, right = self._keys, self._left, self._right
+        node = self._root
+        parent_node = NIL
+        while node != NIL:  # Find the correct location for the new slot
+            parent_node = node
+            key = keys[node]
+            if value < key:
+                node = left[node]
+            elif value > key:
+                node = right[node]
+            else:
+                return  # Value already exists in the tree
+        new_node = self._new_slot(value, parent_node)  # May reallocate the columns, so re-read them below
+        if parent_node == NIL:  # If the tree was empty, the new slot is now the root
+            self._root = new_node
+        elif value < self._keys[parent_node]:
+            self._left[parent_node] = new_node
+        else:
+            self._right[parent_node] = new_node
+        self._count += 1
+        self._rebalance(parent_node)
+
+    def remove(self, value: object) -> bool:
+        """
+        Remove a value from the tree. After unlinking the slot it is pushed onto the free-list and
+        the tree is rebalanced to maintain the AVL tree property.
+
+        :param value: The value to remove from the tree.
+        :return: True if the value was removed, False if it was not found.
+        """
+        node = self._find(value)
+        if node == NIL:  # The value is not found in the tree
+            return False
+        keys, left, right, parent = self._keys, self._left, self._right, self._parent
+        if left[node] != NIL and right[node] != NIL:  # The slot has two children
+            # Move the in-order successor's value here and remove the successor's slot instead
+            successor = right[node]
+            while left[successor] != NIL:
+                successor = left[successor]
+            keys[node] = keys[successor]
+            node = successor
+        # The slot now has at most one child, which takes its place
+        child = left[node] if left[node] != NIL else right[node]
+        parent_node = parent[node]
+        if child != NIL:
+            parent[child] = parent_node
+        if parent_node == NIL:  # The slot is the root
+            self._root = child
+        elif left[parent_node] == node:
+            left[parent_node] = child
+        else:
+            right[parent_node] = child
+        self._free_slot(node)
+        self._count -= 1
+        self._rebalance(parent_node)
+        return True
+
+    def contains(self, value: object) -> bool:
+        """
+        Check if the tree contains a value.
+
+        :param value: The value to check.
+        :return: True if the tree contains the value, False otherwise.
+        """
+        return self._find(value) != NIL
+
+    def _find(self, value: object) -> int:
+        """
+        Find the slot holding a value.
+
+        :param value: The value to look for.
+        :return: The handle of the slot, or NIL if the value is not in the tree.
+        """
+        keys, left, right = self._keys, self._left, self._right
+        node = self._root
+        while node != NIL:
+            key = keys[node]
+            if value < key:
+                node = left[node]
+            elif value > key:
+                node = right[node]
+            else:
+                return node
+        return NIL
+
+    def inorder_traversal(self) -> Queue:
+        """
+        Execute an in-order traversal of the tree.
+
+        :return: A queue of the values in ascending order.
+        """
+        inorder_queue = Queue()
+        for value in self:
+            inorder_queue.enqueue(value)
+        return inorder_queue
+
+    def __iter__(self):
+        """
+        Lazily iterate over the values in ascending order by following parent handles,
+        using O(1) extra memory.
+
+        :return: A generator of the values in ascending order.
+        """
+        keys, left, right, parent = self._keys, self._left, self._right, self._parent
+        node = self._leftmost(self._root)
+        while node != NIL:
+            yield keys[node]
+            if right[node] != NIL:  # The successor is the left most slot of the right subtree
+                node = right[node]
+                while left[node] != NIL:
+                    node = left[node]
+            else:  # The successor is the first ancestor reached from a left child
+                while parent[node] != NIL and right[parent[node]] == node:
+                    node = parent[node]
+                node = parent[node]
+
+    def __reversed__(self):
+        """
+        Lazily iterate over the values in descending order by following parent handles.
+
+        :return: A generator of the values in descending order.
+        """
+        keys, left, right, parent = self._keys, self._left, self._right, self._parent
+        node = self._rightmost(self._root)
+        while node != NIL:
+            yield keys[node]
+            if left[node] != NIL:  # The predecessor is the right most slot of the left subtree
+                node = left[node]
+                while right[node] != NIL:
+                    node = right[node]
+            else:  # The predecessor is the first ancestor reached from a right child
+                while parent[node] != NIL and left[parent[node]] == node:
+                    node = parent[node]
+                node = parent[node]
+
+    def irange(self, low: object = None, high: object = None, inclusive=(True, False), reverse=False):
+        """
+        Lazily iterate over the values between two bounds, stepping between slots with parent handles.
+
+        :param low: The lower bound, or None for no lower bound.
+        :param high: The upper bound, or None for no upper bound.
+        :param inclusive: A pair of booleans telling whether low and high themselves are included.
+        :param reverse: If True, values are produced in descending order.
+        :return: A generator of the values within the bounds.
+        """
+        low_inclusive, high_inclusive = inclusive
+        keys, left, right = self._keys, self._left, self._right
+        start = NIL
+        node = self._root
+        if not reverse:
+            while node != NIL:  # Find the first slot that is not below the lower bound
+                key = keys[node]
+                if low is not None and (key < low or (not low_inclusive and not low < key)):
+                    node = right[node]
+                else:
+                    start = node
+                    node = left[node]
+            node = start
+            while node != NIL:
+                key = keys[node]
+                if high is not None and (high < key or (not high_inclusive and not key < high)):
+                    return
+                yield key
+                node = self._successor(node)
+        else:
+            while node != NIL:  # Find the last slot that is not above the upper bound
+                key = keys[node]
+                if high is not None and (high < key or (not high_inclusive and not key < high)):
+                    node = left[node]
+                else:
+                    start = node
+                    node = right[node]
+            node = start
+            while node != NIL:
+                key = keys[node]
+                if low is not None and (key < low or (not low_inclusive and not low < key)):
+                    return
+                yield key
+                node = self._predecessor(node)
+
+    def _successor(self, node: int) -> int:
+        """
+        Find the slot that follows a slot in ascending order.
+
+        :param node: The handle of the slot.
+        :return: The handle of the next slot, or NIL if node holds the maximum.
+        """
+        if self._right[node] != NIL:
+            return self._leftmost(self._right[node])
+        parent = self._parent
+        while parent[node] != NIL and self._right[parent[node]] == node:
+            node = parent[node]
+        return parent[node]
+
+    def _predecessor(self, node: int) -> int:
+        """
+        Find the slot that precedes a slot in ascending order.
+
+        :param node: The handle of the slot.
+        :return: The handle of the previous slot, or NIL if node holds the minimum.
+        """
+        if self._left[node] != NIL:
+            return self._rightmost(self._left[node])
+        parent = self._parent
+        while parent[node] != NIL and self._left[parent[node]] == node:
+            node = parent[node]
+        return parent[node]
+
+    def _leftmost(self, node: int) -> int:
+        """
+        Find the left most slot of a subtree.
+
+        :param node: The root of the subtree.
+        :return: The handle of the left most slot, or NIL for an empty subtree.
+        """
+        if node != NIL:
+            while self._left[node] != NIL:
+                node = self._left[node]
+        return node
+
+    def _rightmost(self, node: int) -> int:
+        """
+        Find the right most slot of a subtree.
+
+        :param node: The root of the subtree.
+        :return: The handle of the right most slot, or NIL for an empty subtree.
+        """
+        if node != NIL:
+            while self._right[node] != NIL:
+                node = self._right[node]
+        return node
+
+    def find_min(self) -> object:
+        """
+        Find the minimum value in the tree.
+
+        :return: The minimum value in the tree. Returns None if the tree is empty.
+        """
+        if self.is_empty():
+            return None
+        return self._keys[self._leftmost(self._root)]
+
+    def find_max(self) -> object:
+        """
+        Find the maximum value in the tree.
+
+        :return: The maximum value in the tree. Returns None if the tree is empty.
+        """
+        if self.is_empty():
+            return None
+        return self._keys[self._rightmost(self._root)]
+
+    def is_empty(self) -> bool:
+        """
+        Check if the tree is empty.
+
+        :return: True if the tree is empty, False otherwise.
+        """
+        return self._root == NIL
+
+    def make_empty(self) -> None:
+        """
+        Empty the tree and release every column.
+        """
+        self._build(())
+
+    def _new_slot(self, value: object, parent: int) -> int:
+        """
+        Allocate a leaf slot, reusing the head of the free-list when there is one.
+
+        :param value: The value to store in the slot.
+        :param parent: The handle of the parent of the slot.
+        :return: The handle of the new slot.
+        """
+        slot = self._free
+        if slot != NIL:
+            self._free = self._left[slot]  # Pop the slot from the free-list
+            self._keys[slot] = value
+            self._left[slot] = NIL
+            self._right[slot] = NIL
+            self._parent[slot] = parent
+            self._height[slot] = 0
+        else:
+            slot = len(self._keys)
+            self._keys.append(value)
+            self._left.append(NIL)
+            self._right.append(NIL)
+            self._parent.append(parent)
+            self._height.append(0)
+        return slot
+
+    def _free_slot(self, slot: int) -> None:
+        """
+        Push an unlinked slot onto the free-list and drop its reference to the stored value.
+
+        :param slot: The handle of the slot to release.
+        """
+        self._keys[slot] = None
+        self._left[slot] = self._free
+        self._free = slot
+
+    def _get_height(self, node: int) -> int:
+        """
+        Get the height of a slot.
+
+        :param node: The handle of the slot.
+        :return: The height of the slot, -1 for NIL.
+        """
+        if node == NIL:
+            return -1
+        return self._height[node]
+
+    def _update_height(self, node: int) -> None:
+        """
+        Update the height of a slot from the heights of its children.
+
+        :param node: The handle of the slot.
+        """
+        self._height[node] = max(self._get_height(self._left[node]), self._get_height(self._right[node])) + 1
+
+    def _balance_factor(self, node: int) -> int:
+        """
+        Compute the height of the left subtree minus the height of the right subtree of a slot.
+
+        :param node: The handle of the slot.
+        :return: The balance factor of the slot, 0 for NIL.
+        """
+        if node == NIL:
+            return 0
+        return self._get_height(self._left[node]) - self._get_height(self._right[node])
+
+    def _replace_child(self, parent: int, old: int, new: int) -> None:
+        """
+        Point the link that referenced old at new instead, updating the root when parent is NIL.
+
+        :param parent: The handle of the parent of old.
+        :param old: The handle of the slot being replaced.
+        :param new: The handle of the replacement slot.
+        """
+        self._parent[new] = parent
+        if parent == NIL:
+            self._root = new
+        elif self._left[parent] == old:
+            self._left[parent] = new
+        else:
+            self._right[parent] = new
+
+    def _rotate_left(self, node: int) -> int:
+        """
+        Perform a left rotation at a slot.
+
+        :param node: The handle of the slot to rotate at.
+        :return: The handle of the new subtree root.
+        """
+        left, right, parent = self._left, self._right, self._parent
+        child = right[node]
+        right[node] = left[child]
+        if right[node] != NIL:
+            parent[right[node]] = node
+        left[child] = node
+        self._replace_child(parent[node], node, child)
+        parent[node] = child
+        self._update_height(node)
+        self._update_height(child)
+        return child
+
+    def _rotate_right(self, node: int) -> int:
+        """
+        Perform a right rotation at a slot.
+
+        :param node: The handle of the slot to rotate at.
+        :return: The handle of the new subtree root.
+        """
+        left, right, parent = self._left, self._right, self._parent
+        child = left[node]
+        left[node] = right[child]
+        if left[node] != NIL:
+            parent[left[node]] = node
+        right[child] = node
+        self._replace_child(parent[node], node, child)
+        parent[node] = child
+        self._update_height(node)
+        self._update_height(child)
+        return child
+
+    def _rebalance(self, node: int) -> None:
+        """
+        Rebalance the tree from a slot towards the root, stopping as soon as a subtree is as high as it was
+        before the update, since no ancestor can be out of balance after that.
+
+        :param node: The handle of the slot to start the rebalancing from.
+        """
+        while node != NIL:
+            height = self._height[node]
+            self._update_height(node)
+            balance = self._balance_factor(node)
+            if balance < -1:
+                if self._balance_factor(self._right[node]) > 0:  # Right-left case
+                    self._rotate_right(self._right[node])
+                node = self._rotate_left(node)
+            elif balance > 1:
+                if self._balance_factor(self._left[node]) < 0:  # Left-right case
+                    self._rotate_left(self._left[node])
+                node = self._rotate_right(node)
+            if self._height[node] == height:
+                return
+            node = self._parent[node]
+
+
+if __name__ == '__main__':
+    print("\nPDF - method add() example 1")
+    print("----------------------------")
+    for case in ((1, 2, 3), (3, 2, 1), (1, 3, 2), (3, 1, 2)):
+        tree = CompactAVL()
+        for value in case:
+            tree.add(value)
+        print(tree)
+
+    print("\nPDF - method add() and remove() stress test")
+    print("-------------------------------------------")
+    for _ in range(100):
+        case = list(set(random.randrange(1, 20000) for _ in range(900)))
+        tree = CompactAVL()
+        for value in case:
+            tree.add(value)
+        for value in case[::2]:
+            tree.remove(value)
+        for value in case[::4]:
+            tree.add(value)
+        if not tree.is_valid_avl():
+            raise Exception("PROBLEM WITH ADD/REMOVE OPERATION")
+    print('add() and remove() stress test finished')
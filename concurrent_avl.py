@@ -0,0 +1,427 @@
+import random
+import threading
+import time
+from contextlib import contextmanager
+from itertools import repeat
+from avl import AVL
+
+
+# RWLock is a readers/writer lock.
+class RWLock:
+    """
+    RWLock Class.
+
+    This class implements a lock that is shared by any number of readers or held by one writer. Waiting writers
+    block new readers so that a steady stream of lookups cannot starve them. The writer may re-acquire the lock
+    (for reading or writing) while it holds it, which lets a batch of writes call read methods.
+    """
+    def __init__(self):
+        # Initialize lock state
+        self._condition = threading.Condition(threading.Lock())
+        self._readers = 0  # The number of threads holding the lock for reading
+        self._writer = None  # The identifier of the thread holding the lock for writing
+        self._writer_depth = 0  # How many times the writer has acquired the lock
+        self._waiting_writers = 0  # The number of threads waiting to write
+
+    def acquire_read(self) -> None:
+        """
+        Acquire the lock for reading, waiting while a writer holds it or is waiting for it.
+        """
+        with self._condition:
+            if self._writer == threading.get_ident():  # The writer reads its own changes
+                self._writer_depth += 1
+                return
+            while self._writer is not None or self._waiting_writers:
+                self._condition.wait()
+            self._readers += 1
+
+    def release_read(self) -> None:
+        """
+        Release the lock after reading.
+        """
+        with self._condition:
+            if self._writer == threading.get_ident():
+                self._writer_depth -= 1
+                return
+            self._readers -= 1
+            if self._readers == 0:
+                self._condition.notify_all()
+
+    def acquire_write(self) -> None:
+        """
+        Acquire the lock for writing, waiting until no other thread holds it.
+        """
+        with self._condition:
+            if self._writer == threading.get_ident():
+                self._writer_depth += 1
+                return
+            self._waiting_writers += 1
+            while self._writer is not None or self._readers:
+                self._condition.wait()
+            self._waiting_writers -= 1
+            self._writer = threading.get_ident()
+            self._writer_depth = 1
+
+    def release_write(self) -> None:
+        """
+        Release the lock after writing.
+        """
+        with self._condition:
+            self._writer_depth -= 1
+            if self._writer_depth == 0:
+                self._writer = None
+                self._condition.notify_all()
+
+    @contextmanager
+    def read_locked(self):
+        """
+        Context manager holding the lock for reading.
+        """
+        self.acquire_read()
+        try:
+            yield
+        finally:
+            self.release_read()
+
+    @contextmanager
+    def write_locked(self):
+        """
+        Context manager holding the lock for writing.
+        """
+        self.acquire_write()
+        try:
+            yield
+        finally:
+            self.release_write()
+
+
+# ConcurrentAVL is a thread-safe wrapper around an AVL tree.
+class ConcurrentAVL:
+    """
+    ConcurrentAVL Class.
+
+    This class wraps an AVL tree (or any of its subclasses) so that it can be shared between threads. Lookups,
+    order statistics and range scans run in parallel under a shared lock, while add() and remove() take the lock
+    exclusively. Use batch() to apply many writes under a single lock acquisition.
+    """
+    def __init__(self, tree: AVL = None, chunk_size: int = 256) -> None:
+        """
+        Initialize a ConcurrentAVL.
+
+        :param tree: The tree to protect. A new, empty AVL is used if none is given.
+        :param chunk_size: How many values iteration reads per lock acquisition.
+        """
+        self._tree = tree if tree is not None else AVL()
+        self._lock = RWLock()
+        self._chunk_size = chunk_size
+
+    def __str__(self) -> str:
+        """
+        String representation of the wrapped tree.
+
+        :return: A string representation of the tree.
+        """
+        with self._lock.read_locked():
+            return str(self._tree)
+
+    def __len__(self) -> int:
+        """
+        Return the number of values in the tree.
+
+        :return: The number of values in the tree.
+        """
+        with self._lock.read_locked():
+            return len(self._tree)
+
+    @contextmanager
+    def batch(self):
+        """
+        Context manager that holds the write lock, so that every add() and remove() (and any read) made by
+        this thread inside the block is applied without re-acquiring the lock and appears atomic to readers.
+        """
+        with self._lock.write_locked():
+            yield self
+
+    def add(self, value: object) -> None:
+        """
+        Add a value to the tree under the write lock.
+
+        :param value: The value to add.
+        """
+        with self._lock.write_locked():
+            self._tree.add(value)
+
+    def remove(self, value: object) -> bool:
+        """
+        Remove a value from the tree under the write lock.
+
+        :param value: The value to remove.
+        :return: True if the value was removed, False if it was not found.
+        """
+        with self._lock.write_locked():
+            return self._tree.remove(value)
+
+    def add_many(self, values) -> int:
+        """
+        Add a batch of values under one write lock acquisition.
+
+        :param values: An iterable of values to add.
+        :return: The number of values that were not already in the tree.
+        """
+        values = list(values)  # Consume the iterable before blocking readers
+        with self._lock.write_locked():
+            return self._tree.add_many(values)
+
+    def remove_many(self, values) -> int:
+        """
+        Remove a batch of values under one write lock acquisition.
+
+        :param values: An iterable of values to remove.
+        :return: The number of values that were removed.
+        """
+        values = list(values)
+        with self._lock.write_locked():
+            return self._tree.remove_many(values)
+
+    def make_empty(self) -> None:
+        """
+        Empty the tree under the write lock.
+        """
+        with self._lock.write_locked():
+            self._tree.make_empty()
+
+    def contains(self, value: object) -> bool:
+        """
+        Check if the tree contains a value under the read lock.
+
+        :param value: The value to check.
+        :return: True if the tree contains the value, False otherwise.
+        """
+        with self._lock.read_locked():
+            return self._tree.contains(value)
+
+    def contains_many(self, values) -> list:
+        """
+        Check a batch of values under one read lock acquisition.
+
+        :param values: An iterable of values to check.
+        :return: A list of booleans in the input order.
+        """
+        values = list(values)
+        with self._lock.read_locked():
+            return self._tree.contains_many(values)
+
+    def find_min(self) -> object:
+        """
+        Find the minimum value under the read lock.
+
+        :return: The minimum value, or None if the tree is empty.
+        """
+        with self._lock.read_locked():
+            return self._tree.find_min()
+
+    def find_max(self) -> object:
+        """
+        Find the maximum value under the read lock.
+
+        :return: The maximum value, or None if the tree is empty.
+        """
+        with self._lock.read_locked():
+            return self._tree.find_max()
+
+    def is_empty(self) -> bool:
+        """
+        Check if the tree is empty under the read lock.
+
+        :return: True if the tree is empty, False otherwise.
+        """
+        with self._lock.read_locked():
+            return self._tree.is_empty()
+
+    def is_valid_avl(self) -> bool:
+        """
+        Validate the tree under the read lock.
+
+        :return: True if the tree is a valid AVL tree, False otherwise.
+        """
+        with self._lock.read_locked():
+            return self._tree.is_valid_avl()
+
+    def rank(self, value: object) -> int:
+        """
+        Count the values less than a given value under the read lock.
+
+        :param value: The value to rank.
+        :return: The number of values less than value.
+        """
+        with self._lock.read_locked():
+            return self._tree.rank(value)
+
+    def select(self, k: int) -> object:
+        """
+        Return the k-th smallest value under the read lock.
+
+        :param k: The position of the value in sorted order.
+        :return: The value at position k.
+        """
+        with self._lock.read_locked():
+            return self._tree.select(k)
+
+    def count_range(self, low: object, high: object) -> int:
+        """
+        Count the values v with low <= v <= high under the read lock.
+
+        :param low: The lower bound (inclusive).
+        :param high: The upper bound (inclusive).
+        :return: The number of values within the bounds.
+        """
+        with self._lock.read_locked():
+            return self._tree.count_range(low, high)
+
+    def inorder_traversal(self):
+        """
+        Execute an in-order traversal under one read lock acquisition.
+
+        :return: A queue of the values in ascending order.
+        """
+        with self._lock.read_locked():
+            return self._tree.inorder_traversal()
+
+    def __iter__(self):
+        """
+        Lazily iterate over the values in ascending order.
+
+        :return: A generator of the values.
+        """
+        return self.irange()
+
+    def __reversed__(self):
+        """
+        Lazily iterate over the values in descending order.
+
+        :return: A generator of the values.
+        """
+        return self.irange(reverse=True)
+
+    def irange(self, low: object = None, high: object = None, inclusive=(True, False), reverse=False):
+        """
+        Lazily iterate over the values between two bounds.
+
+        The lock is never held while the caller runs: each chunk of values is read under its own read lock
+        acquisition. The next chunk resumes by position rather than by value: it first produces the copies of
+        the last value that are left, counted with count_range() (a wrapped AVLMultiset may hold many), then
+        continues past that value. Values are produced in order and each copy at most once; writes made
+        between two chunks are visible to the later chunk.
+
+        :param low: The lower bound, or None for no lower bound.
+        :param high: The upper bound, or None for no upper bound.
+        :param inclusive: A pair of booleans telling whether low and high themselves are included.
+        :param reverse: If True, values are produced in descending order.
+        :return: A generator of the values within the bounds.
+        """
+        low_inclusive, high_inclusive = inclusive
+        key_of = self._tree._key_of
+        resume = None  # The last value produced
+        produced = 0  # How many copies of it were produced
+        while True:
+            with self._lock.read_locked():
+                chunk = []
+                if produced:  # The copies of the last value that are left come first
+                    left = min(self._tree.count_range(resume, resume) - produced, self._chunk_size)
+                    chunk.extend(repeat(resume, max(left, 0)))
+                if len(chunk) < self._chunk_size:
+                    for value in self._tree.irange(low, high, (low_inclusive, high_inclusive), reverse):
+                        chunk.append(value)
+                        if len(chunk) == self._chunk_size:
+                            break
+            yield from chunk
+            if len(chunk) < self._chunk_size:
+                return
+            last_key = key_of(chunk[-1])
+            run = 1  # The copies of the last value at the end of the chunk
+            while run < len(chunk) and not key_of(chunk[-run - 1]) < last_key and \
+                    not last_key < key_of(chunk[-run - 1]):
+                run += 1
+            if run == len(chunk) and produced and not key_of(resume) < last_key and not last_key < key_of(resume):
+                produced += run  # The whole chunk continued the run of the previous one
+            else:
+                produced = run
+            resume = chunk[-1]
+            if reverse:  # Continue below the last value produced
+                high, high_inclusive = resume, False
+            else:  # Continue above the last value produced
+                low, low_inclusive = resume, False
+
+
+def benchmark_readers(tree_size: int = 100000, duration: float = 0.5, thread_counts=(1, 2, 4, 8)) -> list:
+    """
+    Measure contains() throughput for a growing number of reader threads while one writer thread keeps
+    adding and removing values, for ConcurrentAVL and for an AVL guarded by a single global lock.
+
+    :param tree_size: The number of values in the tree.
+    :param duration: How long each measurement runs, in seconds.
+    :param thread_counts: The reader thread counts to measure.
+    :return: A list of (readers, rwlock lookups per second, global lock lookups per second) tuples.
+    """
+    def measure(contains, add, remove, readers):
+        stop = threading.Event()
+        counts = [0] * readers
+
+        def reader(slot):
+            rng = random.Random(slot)
+            while not stop.is_set():
+                for _ in range(100):
+                    contains(rng.randrange(2 * tree_size))
+                counts[slot] += 100
+
+        def writer():
+            rng = random.Random(-1)
+            while not stop.is_set():
+                value = rng.randrange(2 * tree_size)
+                add(value)
+                remove(value)
+                time.sleep(0.0001)
+
+        threads = [threading.Thread(target=reader, args=(slot,)) for slot in range(readers)]
+        threads.append(threading.Thread(target=writer))
+        for thread in threads:
+            thread.start()
+        time.sleep(duration)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        return sum(counts) / duration
+
+    results = []
+    for readers in thread_counts:
+        concurrent = ConcurrentAVL(AVL(range(0, 2 * tree_size, 2)))
+        rw_rate = measure(concurrent.contains, concurrent.add, concurrent.remove, readers)
+        plain = AVL(range(0, 2 * tree_size, 2))
+        lock = threading.Lock()
+
+        def locked(method):
+            def call(value):
+                with lock:
+                    return method(value)
+            return call
+
+        global_rate = measure(locked(plain.contains), locked(plain.add), locked(plain.remove), readers)
+        results.append((readers, rw_rate, global_rate))
+    return results
+
+
+if __name__ == '__main__':
+    print("\nPDF - ConcurrentAVL batch example 1")
+    print("-----------------------------------")
+    tree = ConcurrentAVL(AVL([10, 20, 5]))
+    with tree.batch():
+        tree.add(15)
+        tree.remove(5)
+        print("Inside batch, contains(15):", tree.contains(15))
+    print(tree)
+
+    print("\nPDF - ConcurrentAVL reader contention benchmark")
+    print("-----------------------------------------------")
+    print("readers  rwlock lookups/s  global lock lookups/s")
+    for readers, rw_rate, global_rate in benchmark_readers():
+        print("{:7d}  {:16.0f}  {:21.0f}".format(readers, rw_rate, global_rate))
@@ -0,0 +1,63 @@
+from avl import AVL
+from red_black import RedBlackTree
+from wavl import WAVL
+from treap import Treap
+from scapegoat import ScapegoatTree
+
+# The balancing policies, by name. Every class shares the BST API: add, remove, contains,
+# inorder_traversal, iteration, irange, find_min, find_max, len() and a validation method.
+POLICIES = {
+    'avl': AVL,  # Shallowest searches; may rotate at every level of a removal
+    'wavl': WAVL,  # AVL-shaped when only inserting; at most two rotations per removal
+    'red-black': RedBlackTree,  # At most two rotations per insertion and three per removal
+    'treap': Treap,  # Randomized; fewer than two rotations per update on average
+    'scapegoat': ScapegoatTree,  # No rotations or balance fields; rebuilds subtrees instead
+}
+
+# The validation method of each policy
+VALIDATORS = {
+    'avl': 'is_valid_avl',
+    'wavl': 'is_valid_wavl',
+    'red-black': 'is_valid_red_black',
+    'treap': 'is_valid_treap',
+    'scapegoat': 'is_valid_scapegoat',
+}
+
+
+def make_tree(start_tree=None, policy: str = 'avl', **options):
+    """
+    Create a self-balancing tree with the chosen balancing policy.
+
+    :param start_tree: An iterable of values to initialize the tree.
+    :param policy: One of POLICIES.
+    :param options: Options of the chosen class, such as seed for 'treap' or alpha for 'scapegoat'.
+    :return: The new tree.
+    :raises ValueError: If the policy is unknown.
+    """
+    if policy not in POLICIES:
+        raise ValueError("Unknown balancing policy {!r}, expected one of {}".format(policy, ', '.join(POLICIES)))
+    return POLICIES[policy](start_tree, **options)
+
+
+def is_valid_tree(tree) -> bool:
+    """
+    Run the validation method of a tree created by make_tree().
+
+    :param tree: The tree to check.
+    :return: True if the tree satisfies the rules of its balancing policy, False otherwise.
+    """
+    for policy, cls in POLICIES.items():
+        if isinstance(tree, cls):
+            return getattr(tree, VALIDATORS[policy])()
+    raise ValueError("Not a tree of a known balancing policy: {!r}".format(type(tree).__name__))
+
+
+if __name__ == '__main__':
+    print("\nPDF - make_tree() example 1")
+    print("---------------------------")
+    for policy in POLICIES:
+        tree = make_tree(range(1, 8), policy)
+        for value in (8, 9, 10):
+            tree.add(value)
+        tree.remove(4)
+        print('{:<10}'.format(policy), tree, 'valid:', is_valid_tree(tree))
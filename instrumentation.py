@@ -0,0 +1,376 @@
+from collections import Counter
+from avl import AVL
+
+_instrumented_classes = {}  # Instrumented subclass of each tree class, created on first use
+
+
+# AVLStats collects the counters and histograms of an instrumented tree.
+class AVLStats:
+    """
+    AVLStats Class.
+
+    This class counts key comparisons, nodes visited per search, single and double rotations and how many
+    levels each rebalancing climbs, and forwards one event per operation to the registered hooks.
+    """
+    def __init__(self):
+        # Initialize counters
+        self._hooks = []
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Reset every counter and histogram.
+        """
+        self.operations = Counter()  # Number of calls per operation name
+        self.comparisons = 0  # Key comparisons made while searching
+        self.single_rotations = 0
+        self.double_rotations = 0
+        self.path_lengths = Counter()  # Histogram of nodes visited per search
+        self.rebalance_depths = Counter()  # Histogram of levels climbed per rebalancing
+        self._event = None  # Counters of the operation in progress
+
+    def add_hook(self, callback) -> None:
+        """
+        Register a function called after every instrumented operation with a dict describing it: the
+        operation name, the comparisons made, the nodes visited, the rebalancing depth and the rotations.
+
+        :param callback: A function of one dict argument.
+        """
+        self._hooks.append(callback)
+
+    def remove_hook(self, callback) -> None:
+        """
+        Unregister a hook.
+
+        :param callback: A function previously passed to add_hook.
+        """
+        self._hooks.remove(callback)
+
+    def as_dict(self) -> dict:
+        """
+        Get a snapshot of every counter and histogram.
+
+        :return: A dict of plain counters and histograms.
+        """
+        return {
+            'operations': dict(self.operations),
+            'comparisons': self.comparisons,
+            'single_rotations': self.single_rotations,
+            'double_rotations': self.double_rotations,
+            'path_lengths': dict(sorted(self.path_lengths.items())),
+            'rebalance_depths': dict(sorted(self.rebalance_depths.items())),
+        }
+
+    def _begin(self, operation: str) -> None:
+        """
+        Start counting an operation. Nested calls are counted as part of the outer operation.
+
+        :param operation: The operation name.
+        """
+        if self._event is None:
+            self._event = {'operation': operation, 'comparisons': 0, 'visited': 0,
+                           'rebalance_depth': 0, 'rotations': 0}
+
+    def _end(self, operation: str) -> None:
+        """
+        Finish counting an operation and notify the hooks.
+
+        :param operation: The operation name passed to _begin.
+        """
+        event = self._event
+        if event is None or event['operation'] != operation:
+            return
+        self._event = None
+        self.operations[operation] += 1
+        for hook in self._hooks:
+            hook(dict(event))
+
+    def _record_search(self, comparisons: int, visited: int) -> None:
+        """
+        Record one search from the root.
+
+        :param comparisons: The key comparisons made.
+        :param visited: The nodes visited.
+        """
+        self.comparisons += comparisons
+        self.path_lengths[visited] += 1
+        if self._event is not None:
+            self._event['comparisons'] += comparisons
+            self._event['visited'] += visited
+
+    def _record_rebalance(self, levels: int) -> None:
+        """
+        Record one rebalancing climb.
+
+        :param levels: The number of nodes the climb updated.
+        """
+        self.rebalance_depths[levels] += 1
+        if self._event is not None:
+            self._event['rebalance_depth'] += levels
+
+    def _record_rotations(self, rotations: int) -> None:
+        """
+        Record the rotations made to restore the balance of one node.
+
+        :param rotations: 1 for a single rotation, 2 for a double rotation.
+        """
+        if rotations == 1:
+            self.single_rotations += 1
+        elif rotations == 2:
+            self.double_rotations += 1
+        if self._event is not None:
+            self._event['rotations'] += rotations
+
+
+# _CountingKey is the key of a searched value, counting the comparisons made with it.
+class _CountingKey:
+    """
+    _CountingKey Class.
+
+    This class wraps the key of the value an instrumented search looks for. The search compares it with node
+    keys both as key < node.key and as node.key < key; the second form falls back to the reflected __gt__
+    because the node key does not know this type. Every comparison is counted, and the distinct node keys
+    compared with give the nodes visited. Other attributes are read from the wrapped key, so
+    comparison methods of node keys that read attributes of the other operand keep working.
+    """
+    __slots__ = ('key', 'comparisons', '_compared')
+
+    def __init__(self, key: object) -> None:
+        """
+        Wrap a key.
+
+        :param key: The key of the searched value.
+        """
+        self.key = key
+        self.comparisons = 0  # Comparisons made with the key
+        self._compared = set()  # The identities of the node keys compared with
+
+    def __lt__(self, other: object) -> bool:
+        self._count(other)
+        return self.key < other
+
+    def __gt__(self, other: object) -> bool:
+        self._count(other)
+        return other < self.key
+
+    def __getattr__(self, name: str) -> object:
+        return getattr(self.key, name)
+
+    @property
+    def visited(self) -> int:
+        """
+        Count the nodes visited, that is the distinct node keys compared with.
+
+        :return: The number of nodes visited.
+        """
+        return len(self._compared)
+
+    def _count(self, other: object) -> None:
+        """
+        Count one comparison with a node key.
+
+        :param other: The node key.
+        """
+        self.comparisons += 1
+        self._compared.add(id(other))
+
+
+# InstrumentedAVLMixin adds counting to any AVL class.
+class InstrumentedAVLMixin:
+    """
+    InstrumentedAVLMixin Class.
+
+    This class is mixed into a tree class by enable_stats() and swapped out again by disable_stats(), so
+    trees that are not instrumented run the original methods with no extra cost. Searches are counted while
+    they run: the original method is handed a _CountingKey in place of the key of the searched value.
+    """
+    def stats(self) -> dict:
+        """
+        Get a snapshot of the counters and histograms collected so far.
+
+        :return: A dict of plain counters and histograms.
+        """
+        return self._stats.as_dict()
+
+    def add(self, value: object) -> None:
+        """
+        Add a value, counting the operation.
+
+        :param value: The value to add.
+        """
+        self._stats._begin('add')
+        try:
+            super().add(value)
+        finally:
+            self._stats._end('add')
+
+    def remove(self, value: object) -> bool:
+        """
+        Remove a value, counting the operation.
+
+        :param value: The value to remove.
+        :return: True if the value was removed, False if it was not found.
+        """
+        self._stats._begin('remove')
+        try:
+            return super().remove(value)
+        finally:
+            self._stats._end('remove')
+
+    def contains(self, value: object) -> bool:
+        """
+        Check if the tree contains a value, counting the operation.
+
+        :param value: The value to check.
+        :return: True if the tree contains the value, False otherwise.
+        """
+        self._stats._begin('contains')
+        try:
+            return super().contains(value)
+        finally:
+            self._stats._end('contains')
+
+    def _find_or_insert(self, value: object, start=None) -> tuple:
+        """
+        Run AVL._find_or_insert, counting its key comparisons and visited nodes.
+
+        :param value: The value to look for.
+        :param start: A node of the tree to search from, or None to search from the root.
+        :return: The result of AVL._find_or_insert.
+        """
+        return self._count_search(super()._find_or_insert, value, start)
+
+    def _find_node(self, value: object):
+        """
+        Run AVL._find_node, counting its key comparisons and visited nodes.
+
+        :param value: The value to look for.
+        :return: The result of AVL._find_node.
+        """
+        return self._count_search(super()._find_node, value)
+
+    def _count_search(self, search, value: object, *args):
+        """
+        Run a search with the key of the searched value wrapped in a _CountingKey, so that every comparison
+        it makes, in the fast paths and finger climbs included, is counted, then record the counts.
+
+        :param search: The search method to run.
+        :param value: The value searched for.
+        :param args: The other arguments of the search.
+        :return: The result of the search.
+        """
+        key_function = self._key
+        key = _CountingKey(value if key_function is None else key_function(value))
+        self._key = lambda _: key  # The search computes the key of its value through _key
+        try:
+            return search(value, *args)
+        finally:
+            self._key = key_function
+            self._stats._record_search(key.comparisons, key.visited)
+
+    def _new_node(self, value: object, key: object):
+        """
+        Run AVL._new_node, storing the wrapped key if a search passes its _CountingKey.
+
+        :param value: The value to be stored in the node.
+        :param key: The key of the value.
+        :return: The new node.
+        """
+        if type(key) is _CountingKey:
+            key = key.key
+        return super()._new_node(value, key)
+
+    def _retrace(self, node) -> None:
+        """
+        Run AVL._retrace, counting the levels whose heights it updates before it stops. Each of those levels
+        is checked by exactly one call to _restore_balance, which does the counting.
+
+        :param node: The lowest node whose children changed, or None.
+        """
+        self._retrace_levels = 0
+        try:
+            super()._retrace(node)
+        finally:
+            levels, self._retrace_levels = self._retrace_levels, None
+        self._stats._record_rebalance(levels)
+
+    def _restore_balance(self, node):
+        """
+        Run AVL._restore_balance, classifying its rotations as single or double and counting the level
+        if a retracing is in progress.
+
+        :param node: The node to check.
+        :return: The root of the subtree that replaced the node.
+        """
+        if self._retrace_levels is not None:
+            self._retrace_levels += 1
+        self._rotations = 0
+        node = super()._restore_balance(node)
+        self._stats._record_rotations(self._rotations)
+        return node
+
+    def _rotate_left(self, node):
+        """
+        Run AVL._rotate_left, counting it.
+
+        :param node: The node to perform the rotation at.
+        :return: The new parent after the rotation.
+        """
+        self._rotations += 1
+        return super()._rotate_left(node)
+
+    def _rotate_right(self, node):
+        """
+        Run AVL._rotate_right, counting it.
+
+        :param node: The node to perform the rotation at.
+        :return: The new parent after the rotation.
+        """
+        self._rotations += 1
+        return super()._rotate_right(node)
+
+
+def enable_stats(tree: AVL) -> AVLStats:
+    """
+    Start collecting statistics on a tree by switching it to an instrumented subclass of its class.
+
+    :param tree: An AVL tree, or an instance of any subclass.
+    :return: The statistics collector, to read counters or register hooks on.
+    """
+    cls = type(tree)
+    if not isinstance(tree, InstrumentedAVLMixin):
+        if cls not in _instrumented_classes:
+            _instrumented_classes[cls] = type('Instrumented' + cls.__name__, (InstrumentedAVLMixin, cls), {})
+        tree.__class__ = _instrumented_classes[cls]
+        tree._stats = AVLStats()
+        tree._rotations = 0
+        tree._retrace_levels = None  # The levels counted by the retracing in progress, if any
+    return tree._stats
+
+
+def disable_stats(tree: AVL) -> None:
+    """
+    Stop collecting statistics on a tree, switching it back to its original class.
+
+    :param tree: A tree passed to enable_stats.
+    """
+    if isinstance(tree, InstrumentedAVLMixin):
+        tree.__class__ = type(tree).__mro__[2]  # The class the instrumented subclass was created from
+        del tree._stats
+        del tree._rotations
+        del tree._retrace_levels
+
+
+if __name__ == '__main__':
+    print("\nPDF - enable_stats() example 1")
+    print("------------------------------")
+    tree = AVL()
+    stats = enable_stats(tree)
+    stats.add_hook(lambda event: print('EVENT  :', event) if event['rotations'] else None)
+    for value in (10, 20, 30, 25, 27, 5):
+        tree.add(value)
+    tree.contains(27)
+    tree.remove(10)
+    print('STATS  :', tree.stats())
+    disable_stats(tree)
+    print('RESULT :', tree)
@@ -0,0 +1,127 @@
+import random
+from stack import Stack
+from avl import AVLNode, AVL
+
+
+# IntervalAVLNode is an AVL node holding an interval and the largest end point of its subtree.
+class IntervalAVLNode(AVLNode):
+    def __init__(self, value: tuple) -> None:
+        """
+        Initialize an IntervalAVL node.
+
+        :param value: The interval, as a (start, end) tuple.
+        """
+        super().__init__(value)
+        self.max_end = value[1]  # The largest end point of the intervals in the subtree rooted at this node
+
+    def __str__(self) -> str:
+        """
+        String representation of an IntervalAVL node.
+
+        :return: A string representation of the node.
+        """
+        return 'IntervalAVL Node: {} (max end {})'.format(self.value, self.max_end)
+
+
+# IntervalAVL is an interval tree built on the AVL tree.
+class IntervalAVL(AVL):
+    """
+    IntervalAVL Class.
+
+    This class stores closed intervals as (start, end) tuples, ordered by start (then by end), and keeps the
+    largest end point of every subtree in its root. The field is refreshed wherever the AVL tree refreshes
+    subtree sizes, including both rotations and every retracing step, so overlap and stabbing queries can skip
+    every subtree that ends before the query starts.
+    """
+    def overlapping(self, low: object, high: object):
+        """
+        Lazily iterate over the intervals that overlap [low, high], in order of their start points.
+
+        A subtree is only entered if its largest end point reaches low, and the walk stops at the first
+        interval starting after high, so only the paths leading to overlapping intervals are visited.
+
+        :param low: The start of the query interval.
+        :param high: The end of the query interval.
+        :return: A generator of (start, end) tuples.
+        """
+        stack = Stack()
+        node = self._root
+        while True:
+            # Go left while the subtree may still hold an interval that reaches low
+            while node is not None and not node.max_end < low:
+                stack.push(node)
+                node = node.left
+            if stack.is_empty():
+                return
+            node = stack.pop()
+            start, end = node.value
+            if high < start:  # This and every later interval start after the query
+                return
+            if not end < low:
+                yield node.value
+            node = node.right
+
+    def stabbing(self, point: object):
+        """
+        Lazily iterate over the intervals that contain a point, in order of their start points.
+
+        :param point: The query point.
+        :return: A generator of (start, end) tuples.
+        """
+        return self.overlapping(point, point)
+
+    def _create_node(self, value: tuple) -> IntervalAVLNode:
+        """
+        Create a detached interval node. Every way of adding intervals (add(), the constructor, add_many(),
+        join() and cursors) creates its nodes here, so reversed intervals are rejected before the tree changes.
+
+        :param value: The interval, as a (start, end) tuple.
+        :return: The new node.
+        :raises ValueError: If the interval ends before it starts.
+        """
+        if value[1] < value[0]:
+            raise ValueError("Interval {} ends before it starts".format(value))
+        return IntervalAVLNode(value)
+
+    def _update_augment(self, node: IntervalAVLNode) -> None:
+        """
+        Updates the size and the largest end point of a node from its children.
+
+        :param node: The node to update.
+        """
+        super()._update_augment(node)
+        max_end = node.value[1]
+        if node.left is not None and max_end < node.left.max_end:
+            max_end = node.left.max_end
+        if node.right is not None and max_end < node.right.max_end:
+            max_end = node.right.max_end
+        node.max_end = max_end
+
+
+if __name__ == '__main__':
+    print("\nPDF - IntervalAVL example 1")
+    print("---------------------------")
+    tree = IntervalAVL([(15, 20), (10, 30), (17, 19), (5, 20), (12, 15), (30, 40)])
+    print(tree)
+    print("Overlapping [14, 16]:", list(tree.overlapping(14, 16)))
+    print("Stabbing 35:", list(tree.stabbing(35)))
+
+    print("\nPDF - IntervalAVL add() and remove() stress test")
+    print("------------------------------------------------")
+    for _ in range(100):
+        intervals = set()
+        for _ in range(300):
+            start = random.randrange(1, 2000)
+            intervals.add((start, start + random.randrange(0, 100)))
+        intervals = list(intervals)
+        tree = IntervalAVL(intervals[:100])
+        for interval in intervals[100:]:
+            tree.add(interval)
+        for interval in intervals[::2]:
+            tree.remove(interval)
+        low = random.randrange(1, 2000)
+        high = low + random.randrange(0, 50)
+        expected = sorted(interval for interval in intervals[1::2] if interval[0] <= high and low <= interval[1])
+        if list(tree.overlapping(low, high)) != expected:
+            raise Exception("PROBLEM WITH OVERLAPPING OPERATION")
+    print('add() and remove() stress test finished')
@@ -0,0 +1,311 @@
+from abc import ABC, abstractmethod
+from stack import Stack
+from bst import BSTNode, BST
+
+
+# LinkedBSTNode is a BST node that also links to its parent.
+class LinkedBSTNode(BSTNode):
+    def __init__(self, value: object) -> None:
+        """
+        Initialize a LinkedBST node.
+
+        :param value: The value to be stored in the node.
+        """
+        super().__init__(value)
+        self.parent = None  # The parent of this node, None for the root
+
+
+# LinkedBST is the common base of the self-balancing trees other than AVL.
+class LinkedBST(BST, ABC):
+    """
+    LinkedBST Class.
+
+    This class holds what the red-black, WAVL, treap and scapegoat trees share: distinct values in nodes
+    linked to their parents, a value count, searching, leaf insertion, unlinking, rotations and a balanced
+    bulk build. Each subclass only supplies its balance fields and how it restores balance after an
+    insertion or a removal.
+    """
+    _distinct = True  # Duplicate values are ignored
+
+    def __init__(self, start_tree=None) -> None:
+        """
+        Initialize a tree. If a start_tree is provided, its values are sorted once, de-duplicated and built
+        bottom-up into a balanced tree.
+
+        :param start_tree: An iterable of values to initialize the tree.
+        """
+        super().__init__()
+        self._count = 0  # The number of values in the tree
+        if start_tree is not None:
+            self._root = self._build_balanced(self._sorted_values(sorted(start_tree)))
+
+    def __len__(self) -> int:
+        """
+        Return the number of values in the tree in O(1).
+
+        :return: The number of values in the tree.
+        """
+        return self._count
+
+    def __str__(self) -> str:
+        """
+        String representation of the tree using pre-order traversal.
+
+        :return: A string representation of the tree.
+        """
+        values = []
+        self._str_helper(self._root, values)
+        return type(self).__name__ + " pre-order { " + ", ".join(values) + " }"
+
+    def make_empty(self) -> None:
+        """
+        Empty the tree.
+        """
+        self._root = None
+        self._count = 0
+
+    def _create_node(self, value: object) -> LinkedBSTNode:
+        """
+        Create a detached node for a value. Subclasses override this to use their own node type.
+
+        :param value: The value to be stored in the node.
+        :return: The new node.
+        """
+        return LinkedBSTNode(value)
+
+    def _build_balanced(self, values: list) -> LinkedBSTNode:
+        """
+        Build a perfectly balanced tree from a list of distinct values in ascending order.
+
+        :param values: The values to be stored in the tree.
+        :return: The root of the new tree, or None if values is empty.
+        """
+        self._count = len(values)
+        return self._build_range(values, 0, len(values) - 1, None, 0)
+
+    def _build_range(self, values: list, low: int, high: int, parent: LinkedBSTNode, depth: int) -> LinkedBSTNode:
+        """
+        Recursive helper for _build_balanced. The middle value becomes the subtree root, and every node is
+        passed to _finish_built_node once both of its subtrees are built.
+
+        :param values: The values to be stored in the tree.
+        :param low: Index of the first value of this subtree.
+        :param high: Index of the last value of this subtree.
+        :param parent: The parent of the subtree root.
+        :param depth: The depth of the subtree root.
+        :return: The root of the subtree, or None if the range is empty.
+        """
+        if low > high:
+            return None
+        middle = (low + high) // 2
+        node = self._create_node(values[middle])
+        node.parent = parent
+        node.left = self._build_range(values, low, middle - 1, node, depth + 1)
+        node.right = self._build_range(values, middle + 1, high, node, depth + 1)
+        self._finish_built_node(node, depth)
+        return node
+
+    def _finish_built_node(self, node: LinkedBSTNode, depth: int) -> None:
+        """
+        Set the balance fields of a node built by _build_balanced. The default does nothing.
+
+        :param node: The node, whose subtrees are already built.
+        :param depth: The depth of the node.
+        """
+
+    def add(self, value: object) -> None:
+        """
+        Add a value to the tree. If the value already exists, the function returns without adding it.
+
+        :param value: The value to add to the tree.
+        """
+        node = self._root
+        parent_node = None
+        while node is not None:  # Find the correct location for the new node
+            parent_node = node
+            if value < node.value:
+                node = node.left
+            elif node.value < value:
+                node = node.right
+            else:
+                return  # Value already exists in the tree
+        new_node = self._create_node(value)
+        new_node.parent = parent_node
+        if parent_node is None:
+            self._root = new_node
+        elif value < parent_node.value:
+            parent_node.left = new_node
+        else:
+            parent_node.right = new_node
+        self._count += 1
+        self._fix_after_insert(new_node)
+
+    @abstractmethod
+    def _fix_after_insert(self, node: LinkedBSTNode) -> None:
+        """
+        Restore the balance of the tree after a new leaf was linked.
+
+        :param node: The new leaf.
+        """
+
+    def remove(self, value: object) -> bool:
+        """
+        Remove a value from the tree.
+
+        :param value: The value to remove from the tree.
+        :return: True if the value was removed, False if it was not found.
+        """
+        node = self._find_node(value)
+        if node is None:  # The value is not found in the tree
+            return False
+        self._count -= 1
+        self._remove_node(node)
+        return True
+
+    @abstractmethod
+    def _remove_node(self, node: LinkedBSTNode) -> None:
+        """
+        Unlink a node from the tree and restore the balance.
+
+        :param node: The node to remove.
+        """
+
+    def contains(self, value: object) -> bool:
+        """
+        Check if the tree contains a value.
+
+        :param value: The value to check.
+        :return: True if the tree contains the value, False otherwise.
+        """
+        return self._find_node(value) is not None
+
+    def _find_node(self, value: object) -> LinkedBSTNode:
+        """
+        Find the node holding a value.
+
+        :param value: The value to look for.
+        :return: The node holding the value, or None if the value is not in the tree.
+        """
+        node = self._root
+        while node is not None:
+            if value < node.value:
+                node = node.left
+            elif node.value < value:
+                node = node.right
+            else:
+                break
+        return node
+
+    def _take_successor(self, node: LinkedBSTNode) -> LinkedBSTNode:
+        """
+        Prepare the removal of a node: a node with two children takes over the value of its in-order
+        successor, which has at most one child and is removed instead.
+
+        :param node: The node holding the value to remove.
+        :return: The node to unlink, which has at most one child.
+        """
+        if node.left is None or node.right is None:
+            return node
+        successor = node.right
+        while successor.left is not None:
+            successor = successor.left
+        node.value, node.key = successor.value, successor.key
+        return successor
+
+    def _splice(self, node: LinkedBSTNode) -> tuple:
+        """
+        Unlink a node with at most one child, moving the child into its place.
+
+        :param node: The node to unlink.
+        :return: A tuple (parent, child) with the former parent of the node and the child now in its place
+                 (both may be None).
+        """
+        child = node.left if node.left is not None else node.right
+        parent_node = node.parent
+        if child is not None:
+            child.parent = parent_node
+        self._replace_child(parent_node, node, child)
+        node.left = node.right = node.parent = None
+        return parent_node, child
+
+    def _replace_child(self, parent_node: LinkedBSTNode, old: LinkedBSTNode, new: LinkedBSTNode) -> None:
+        """
+        Make a node take the place of a child of parent_node (or of the root when parent_node is None).
+
+        :param parent_node: The parent of the replaced child.
+        :param old: The replaced child.
+        :param new: The node taking its place, or None.
+        """
+        if parent_node is None:
+            self._root = new
+        elif parent_node.left is old:
+            parent_node.left = new
+        else:
+            parent_node.right = new
+
+    def _rotate_left(self, node: LinkedBSTNode) -> LinkedBSTNode:
+        """
+        Performs a left rotation at a node.
+
+        :param node: The node to perform the rotation at.
+        :return: The new parent after the rotation.
+        """
+        child = node.right
+        node.right = child.left
+        if child.left is not None:
+            child.left.parent = node
+        self._replace_child(node.parent, node, child)
+        child.parent = node.parent
+        child.left = node
+        node.parent = child
+        return child
+
+    def _rotate_right(self, node: LinkedBSTNode) -> LinkedBSTNode:
+        """
+        Performs a right rotation at a node.
+
+        :param node: The node to perform the rotation at.
+        :return: The new parent after the rotation.
+        """
+        child = node.left
+        node.left = child.right
+        if child.right is not None:
+            child.right.parent = node
+        self._replace_child(node.parent, node, child)
+        child.parent = node.parent
+        child.right = node
+        node.parent = child
+        return child
+
+    def _nodes(self):
+        """
+        Iterate over every node of the tree in pre-order.
+
+        :return: A generator of the nodes.
+        """
+        stack = Stack()
+        stack.push(self._root)
+        while not stack.is_empty():
+            node = stack.pop()
+            if node is not None:
+                yield node
+                stack.push(node.right)
+                stack.push(node.left)
+
+    def _is_linked_bst(self) -> bool:
+        """
+        Check the parts of validity every subclass shares: the order of the values, the parent links and
+        the value count.
+
+        :return: True if the tree is a valid linked BST, False otherwise.
+        """
+        if self._root is not None and self._root.parent is not None:
+            return False
+        count = 0
+        for node in self._nodes():
+            count += 1
+            for child in (node.left, node.right):
+                if child is not None and child.parent is not node:
+                    return False
+        values = list(self)
+        return count == self._count and all(values[i - 1] < values[i] for i in range(1, len(values)))
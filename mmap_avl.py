@@ -0,0 +1,292 @@
+import mmap
+import os
+import random
+import struct
+from compact_avl import NIL, CompactAVL
+from serialization import load_values
+
+# The file starts with a fixed header: magic tag, format version, key type code, then five int64 fields
+_HEADER = struct.Struct('<4sBc2x5q')
+_HEADER_SIZE = 64
+_MAGIC = b'AVLM'
+_VERSION = 1
+_FIELDS = 5  # Each record holds a key, the left, right and parent handles and the height, 8 bytes each
+_RECORD_SIZE = _FIELDS * 8
+_ROOT, _COUNT, _FREE, _USED, _CAPACITY = range(5)  # Positions of the int64 header fields
+_MIN_CAPACITY = 16
+
+
+# _RecordField is an indexable view of one field across every record of the file.
+class _RecordField:
+    def __init__(self, view: memoryview, offset: int) -> None:
+        """
+        Initialize a field view.
+
+        :param view: The records region cast to the type of the field.
+        :param offset: The position of the field within a record.
+        """
+        self._view = view
+        self._offset = offset
+
+    def __getitem__(self, slot: int):
+        """
+        Read the field of a record.
+
+        :param slot: The handle of the record.
+        :return: The value of the field.
+        """
+        return self._view[slot * _FIELDS + self._offset]
+
+    def __setitem__(self, slot: int, value) -> None:
+        """
+        Write the field of a record.
+
+        :param slot: The handle of the record.
+        :param value: The new value of the field.
+        """
+        self._view[slot * _FIELDS + self._offset] = value
+
+
+# MmapAVL is a CompactAVL whose columns live in a memory-mapped file.
+class MmapAVL(CompactAVL):
+    """
+    MmapAVL Class.
+
+    This class stores an AVL tree in fixed-size records of a memory-mapped file: an 8-byte key (a 64-bit int
+    or a float) and the left, right and parent record handles and the height. All tree operations are
+    inherited from CompactAVL and run directly against the mapping, so the OS page cache decides which parts
+    of the tree stay in memory. The root, the count and the free-list live in the file header, so opening an
+    existing file is O(1) and needs no rebuild.
+    """
+    def __init__(self, path: str, key_type: str = 'q', start_tree=None) -> None:
+        """
+        Open a tree file, creating it if it does not exist. If a start_tree is provided, the contents of
+        the file are replaced by a balanced tree of its values.
+
+        :param path: The path of the tree file.
+        :param key_type: 'q' for 64-bit integer keys or 'd' for float keys, used when creating the file.
+        :param start_tree: An iterable of values to initialize the tree.
+        :raises ValueError: If the file is not a tree file or the key type is not supported.
+        """
+        self._path = path
+        self._mmap = None
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            self._file = open(path, 'r+b')
+            magic, version, code, *_ = _HEADER.unpack(self._file.read(_HEADER.size))
+            if magic != _MAGIC or version != _VERSION:
+                self._file.close()
+                raise ValueError("Not a tree file: {}".format(path))
+            self._key_type = code.decode()
+        else:
+            if key_type not in ('q', 'd'):
+                raise ValueError("Key type must be 'q' or 'd'")
+            self._key_type = key_type
+            self._file = open(path, 'w+b')
+            self._file.write(_HEADER.pack(_MAGIC, _VERSION, key_type.encode(), NIL, 0, NIL, 0, _MIN_CAPACITY))
+            self._file.truncate(_HEADER_SIZE + _MIN_CAPACITY * _RECORD_SIZE)
+        self._map_file()
+        if start_tree is not None:
+            self._build(sorted(start_tree))
+
+    @classmethod
+    def from_sorted(cls, path: str, iterable, key_type: str = 'q') -> 'MmapAVL':
+        """
+        Create a tree file from values that are already in ascending order, in linear time.
+
+        :param path: The path of the tree file.
+        :param iterable: An iterable of values in ascending order.
+        :param key_type: 'q' for 64-bit integer keys or 'd' for float keys.
+        :return: The new tree.
+        """
+        tree = cls(path, key_type)
+        tree._build(iterable)
+        return tree
+
+    @classmethod
+    def load(cls, path: str, fileobj, key_type: str = 'q') -> 'MmapAVL':
+        """
+        Create a tree file from values written by dump().
+
+        :param path: The path of the tree file.
+        :param fileobj: A binary file object opened for reading.
+        :param key_type: 'q' for 64-bit integer keys or 'd' for float keys.
+        :return: The new tree.
+        """
+        return cls.from_sorted(path, load_values(fileobj), key_type)
+
+    def _map_file(self) -> None:
+        """
+        Map the file and create the header and column views over it.
+        """
+        self._mmap = mmap.mmap(self._file.fileno(), 0)
+        self._buffer = memoryview(self._mmap)
+        self._meta = self._buffer[8:_HEADER_SIZE].cast('q')[:_FIELDS]
+        records = self._buffer[_HEADER_SIZE:]
+        self._int_view = records.cast('q')
+        self._key_view = records.cast(self._key_type)
+        self._keys = _RecordField(self._key_view, 0)
+        self._left = _RecordField(self._int_view, 1)
+        self._right = _RecordField(self._int_view, 2)
+        self._parent = _RecordField(self._int_view, 3)
+        self._height = _RecordField(self._int_view, 4)
+
+    def _unmap_file(self) -> None:
+        """
+        Release every view of the mapping and close it.
+        """
+        if self._mmap is None:
+            return
+        self._keys = self._left = self._right = self._parent = self._height = None
+        for view in (self._meta, self._int_view, self._key_view, self._buffer):
+            view.release()
+        self._mmap.close()
+        self._mmap = None
+
+    def _resize(self, capacity: int) -> None:
+        """
+        Grow or shrink the file to hold a number of records and map it again.
+
+        :param capacity: The number of records the file must hold.
+        """
+        self._unmap_file()
+        self._file.truncate(_HEADER_SIZE + capacity * _RECORD_SIZE)
+        self._map_file()
+        self._meta[_CAPACITY] = capacity
+
+    def flush(self) -> None:
+        """
+        Write every change to the file.
+        """
+        self._mmap.flush()
+
+    def close(self) -> None:
+        """
+        Flush and close the tree file. The tree cannot be used afterwards.
+        """
+        if self._mmap is not None:
+            self.flush()
+            self._unmap_file()
+        self._file.close()
+
+    def __enter__(self) -> 'MmapAVL':
+        """
+        Enter a context that closes the tree file on exit.
+
+        :return: The tree.
+        """
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """
+        Close the tree file.
+        """
+        self.close()
+
+    @property
+    def _root(self) -> int:
+        """
+        The handle of the root record, stored in the file header.
+        """
+        return self._meta[_ROOT]
+
+    @_root.setter
+    def _root(self, node: int) -> None:
+        self._meta[_ROOT] = node
+
+    @property
+    def _count(self) -> int:
+        """
+        The number of values in the tree, stored in the file header.
+        """
+        return self._meta[_COUNT]
+
+    @_count.setter
+    def _count(self, count: int) -> None:
+        self._meta[_COUNT] = count
+
+    @property
+    def _free(self) -> int:
+        """
+        The head of the free-list of removed records, stored in the file header.
+        """
+        return self._meta[_FREE]
+
+    @_free.setter
+    def _free(self, node: int) -> None:
+        self._meta[_FREE] = node
+
+    def _build(self, values) -> None:
+        """
+        Replace the contents of the file with a perfectly balanced tree of the given ascending values.
+
+        :param values: An iterable of values in ascending order.
+        :raises ValueError: If the values are not in ascending order.
+        """
+        keys = self._distinct_values(values)
+        count = len(keys)
+        self._resize(max(count, _MIN_CAPACITY))
+        for slot, key in enumerate(keys):
+            self._keys[slot] = key
+        self._meta[_USED] = count
+        self._free = NIL
+        self._count = count
+        self._root = self._build_range(0, count - 1, NIL)
+
+    def _new_slot(self, value: object, parent: int) -> int:
+        """
+        Allocate a leaf record, reusing the head of the free-list or doubling the file when it is full.
+
+        :param value: The value to store in the record.
+        :param parent: The handle of the parent of the record.
+        :return: The handle of the new record.
+        """
+        slot = self._free
+        if slot != NIL:
+            self._free = self._left[slot]  # Pop the record from the free-list
+        else:
+            slot = self._meta[_USED]
+            if slot == self._meta[_CAPACITY]:
+                self._resize(2 * slot)
+            self._meta[_USED] = slot + 1
+        self._keys[slot] = value
+        self._left[slot] = NIL
+        self._right[slot] = NIL
+        self._parent[slot] = parent
+        self._height[slot] = 0
+        return slot
+
+    def _free_slot(self, slot: int) -> None:
+        """
+        Push an unlinked record onto the free-list.
+
+        :param slot: The handle of the record to release.
+        """
+        self._left[slot] = self._free
+        self._free = slot
+
+
+if __name__ == '__main__':
+    import tempfile
+
+    print("\nPDF - MmapAVL reopen example 1")
+    print("------------------------------")
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, 'tree.avl')
+    with MmapAVL(path, start_tree=[10, 20, 5, 15, 17, 7, 12]) as tree:
+        tree.add(30)
+        tree.remove(10)
+    with MmapAVL(path) as tree:
+        print(tree)
+        print("Range [7, 20):", list(tree.irange(7, 20)))
+
+    print("\nPDF - MmapAVL add() and remove() stress test")
+    print("--------------------------------------------")
+    with MmapAVL(os.path.join(directory, 'stress.avl')) as tree:
+        case = list(set(random.randrange(1, 20000) for _ in range(900)))
+        for value in case:
+            tree.add(value)
+        for value in case[::2]:
+            tree.remove(value)
+        if not tree.is_valid_avl():
+            raise Exception("PROBLEM WITH ADD/REMOVE OPERATION")
+    print('add() and remove() stress test finished')
@@ -0,0 +1,263 @@
+from stack import Stack
+from bst import BSTNode, BST
+
+
+# PersistentAVLNode is an immutable node of the PersistentAVL.
+class PersistentAVLNode(BSTNode):
+    def __init__(self, value: object, left: 'PersistentAVLNode' = None, right: 'PersistentAVLNode' = None) -> None:
+        """
+        Initialize a persistent AVL node. The node has no parent pointer, so it can be shared by any number
+        of tree versions, and it is never modified once it has been linked into a tree.
+
+        :param value: The value to be stored in the node.
+        :param left: The left subtree.
+        :param right: The right subtree.
+        """
+        super().__init__(value)
+        self.left = left
+        self.right = right
+        left_height = left.height if left is not None else -1
+        right_height = right.height if right is not None else -1
+        self.height = max(left_height, right_height) + 1  # The height of the node within the tree
+        # The number of nodes in the subtree rooted at this node
+        self.size = (left.size if left is not None else 0) + (right.size if right is not None else 0) + 1
+
+    def __str__(self) -> str:
+        """
+        String representation of a persistent AVL node.
+
+        :return: A string representation of the node.
+        """
+        return 'PersistentAVL Node: {}'.format(self.value)
+
+
+# PersistentAVL is an AVL tree whose versions share structure.
+class PersistentAVL(BST):
+    """
+    PersistentAVL Class.
+
+    This class implements an AVL tree in which add() and remove() never modify an existing node: they copy
+    the O(log n) nodes on the path from the root to the change, rebalance on the way back up without parent
+    pointers, and install the new root. snapshot() shares the current root in O(1), and every snapshot keeps
+    reading the version it was taken from while the tree keeps changing.
+    """
+    _distinct = True  # Duplicate values are ignored
+
+    def __init__(self, start_tree=None) -> None:
+        """
+        Initialize a PersistentAVL. If a start_tree is provided, its values are sorted, de-duplicated and
+        built bottom-up into a perfectly balanced tree.
+
+        :param start_tree: An iterable of values to initialize the tree.
+        """
+        super().__init__()
+        if start_tree is not None:
+            self._root = self._build_balanced(self._sorted_values(sorted(start_tree)))
+
+    def _build_balanced(self, values: list) -> PersistentAVLNode:
+        """
+        Build a perfectly balanced tree from a list of distinct values in ascending order.
+
+        :param values: The values to be stored in the tree.
+        :return: The root of the new tree, or None if values is empty.
+        """
+        return self._build_range(values, 0, len(values) - 1)
+
+    def _build_range(self, values: list, low: int, high: int) -> PersistentAVLNode:
+        """
+        Build a perfectly balanced subtree from values[low..high].
+
+        :param values: Distinct values in ascending order.
+        :param low: Index of the first value of the subtree.
+        :param high: Index of the last value of the subtree.
+        :return: The root of the subtree, or None if the range is empty.
+        """
+        if low > high:
+            return None
+        middle = (low + high) // 2
+        return PersistentAVLNode(values[middle], self._build_range(values, low, middle - 1),
+                                 self._build_range(values, middle + 1, high))
+
+    def __str__(self) -> str:
+        """
+        String representation of the PersistentAVL using pre-order traversal.
+
+        :return: A string representation of the tree.
+        """
+        values = []
+        self._str_helper(self._root, values)
+        return "PersistentAVL pre-order { " + ", ".join(values) + " }"
+
+    def __len__(self) -> int:
+        """
+        Return the number of values in the tree in O(1).
+
+        :return: The number of values in the tree.
+        """
+        return self._root.size if self._root is not None else 0
+
+    def snapshot(self) -> 'PersistentAVL':
+        """
+        Take an O(1) snapshot of the current version. Later changes to either tree are not visible in the other.
+
+        :return: A new PersistentAVL sharing every node with this one.
+        """
+        tree = type(self)()
+        tree._root = self._root
+        return tree
+
+    def is_valid_avl(self) -> bool:
+        """
+        Check that every node respects the ordering, the stored heights and sizes, and the AVL balance property.
+
+        :return: True if the tree is a valid AVL tree, False otherwise.
+        """
+        stack = Stack()
+        stack.push(self._root)
+        while not stack.is_empty():
+            node = stack.pop()
+            if node:
+                left_height = node.left.height if node.left is not None else -1
+                right_height = node.right.height if node.right is not None else -1
+                if abs(left_height - right_height) > 1 or node.height != max(left_height, right_height) + 1:
+                    return False
+                left_size = node.left.size if node.left is not None else 0
+                right_size = node.right.size if node.right is not None else 0
+                if node.size != left_size + right_size + 1:
+                    return False
+                if node.left and not node.left.value < node.value:
+                    return False
+                if node.right and not node.value < node.right.value:
+                    return False
+                stack.push(node.right)
+                stack.push(node.left)
+        return True
+
+    def add(self, value: object) -> None:
+        """
+        Add a value by path copying. If the value already exists, the tree is left unchanged.
+
+        :param value: The value to add to the tree.
+        """
+        self._root = self._insert(self._root, value)
+
+    def remove(self, value: object) -> bool:
+        """
+        Remove a value by path copying.
+
+        :param value: The value to remove from the tree.
+        :return: True if the value was removed, False if it was not found.
+        """
+        root = self._remove(self._root, value)
+        if root is self._root:  # Nothing was copied, so the value was not found
+            return False
+        self._root = root
+        return True
+
+    def _insert(self, node: PersistentAVLNode, value: object) -> PersistentAVLNode:
+        """
+        Return a version of a subtree that contains a value, copying only the nodes on the search path.
+
+        :param node: The root of the subtree.
+        :param value: The value to insert.
+        :return: The root of the new version, or node itself if the value was already present.
+        """
+        if node is None:
+            return PersistentAVLNode(value)
+        if value < node.value:
+            left = self._insert(node.left, value)
+            if left is node.left:
+                return node
+            return self._balance(node.value, left, node.right)
+        if node.value < value:
+            right = self._insert(node.right, value)
+            if right is node.right:
+                return node
+            return self._balance(node.value, node.left, right)
+        return node  # Value already exists in the tree
+
+    def _remove(self, node: PersistentAVLNode, value: object) -> PersistentAVLNode:
+        """
+        Return a version of a subtree without a value, copying only the nodes on the search path.
+
+        :param node: The root of the subtree.
+        :param value: The value to remove.
+        :return: The root of the new version, or node itself if the value was not found.
+        """
+        if node is None:
+            return None
+        if value < node.value:
+            left = self._remove(node.left, value)
+            if left is node.left:
+                return node
+            return self._balance(node.value, left, node.right)
+        if node.value < value:
+            right = self._remove(node.right, value)
+            if right is node.right:
+                return node
+            return self._balance(node.value, node.left, right)
+        if node.left is None:
+            return node.right
+        if node.right is None:
+            return node.left
+        # Replace the value with its in-order successor, removed from the right subtree
+        right, successor_value = self._remove_min(node.right)
+        return self._balance(successor_value, node.left, right)
+
+    def _remove_min(self, node: PersistentAVLNode) -> tuple:
+        """
+        Return a version of a non-empty subtree without its smallest value.
+
+        :param node: The root of the subtree.
+        :return: A tuple (root, value) with the root of the new version and the removed value.
+        """
+        if node.left is None:
+            return node.right, node.value
+        left, value = self._remove_min(node.left)
+        return self._balance(node.value, left, node.right), value
+
+    def _balance(self, value: object, left: PersistentAVLNode, right: PersistentAVLNode) -> PersistentAVLNode:
+        """
+        Create a node for a value over two subtrees whose heights differ by at most two, rotating by building
+        new nodes when the heights differ by two. Neither subtree is modified.
+
+        :param value: The value of the new node.
+        :param left: The left subtree.
+        :param right: The right subtree.
+        :return: The root of the balanced subtree.
+        """
+        left_height = left.height if left is not None else -1
+        right_height = right.height if right is not None else -1
+        if left_height > right_height + 1:
+            if self._height(left.left) >= self._height(left.right):  # Right rotation
+                return PersistentAVLNode(left.value, left.left, PersistentAVLNode(value, left.right, right))
+            pivot = left.right  # Left-right rotation
+            return PersistentAVLNode(pivot.value, PersistentAVLNode(left.value, left.left, pivot.left),
+                                     PersistentAVLNode(value, pivot.right, right))
+        if right_height > left_height + 1:
+            if self._height(right.right) >= self._height(right.left):  # Left rotation
+                return PersistentAVLNode(right.value, PersistentAVLNode(value, left, right.left), right.right)
+            pivot = right.left  # Right-left rotation
+            return PersistentAVLNode(pivot.value, PersistentAVLNode(value, left, pivot.left),
+                                     PersistentAVLNode(right.value, pivot.right, right.right))
+        return PersistentAVLNode(value, left, right)
+
+    def _height(self, node: PersistentAVLNode) -> int:
+        """
+        Get the height of a node.
+
+        :param node: The node.
+        :return: The height of the node, -1 for an empty subtree.
+        """
+        return node.height if node is not None else -1
+
+
+if __name__ == '__main__':
+    print("\nPDF - PersistentAVL snapshot example 1")
+    print("--------------------------------------")
+    tree = PersistentAVL([10, 20, 5, 15, 17, 7, 12])
+    snapshot = tree.snapshot()
+    tree.add(30)
+    tree.remove(10)
+    print('CURRENT  :', tree)
+    print('SNAPSHOT :', snapshot)
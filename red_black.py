@@ -0,0 +1,229 @@
+import random
+from linked_bst import LinkedBSTNode, LinkedBST
+
+
+# RedBlackNode is a node of the red-black tree.
+class RedBlackNode(LinkedBSTNode):
+    def __init__(self, value: object) -> None:
+        """
+        Initialize a red-black node. New nodes are red.
+
+        :param value: The value to be stored in the node.
+        """
+        super().__init__(value)
+        self.red = True  # The color of the node, black when False
+
+    def __str__(self) -> str:
+        """
+        String representation of a red-black node.
+
+        :return: A string representation of the node.
+        """
+        return 'RedBlack Node: {} ({})'.format(self.value, 'red' if self.red else 'black')
+
+
+def _is_red(node: RedBlackNode) -> bool:
+    """
+    Check the color of a node. Missing children count as black.
+
+    :param node: The node, or None.
+    :return: True if the node is red, False otherwise.
+    """
+    return node is not None and node.red
+
+
+# RedBlackTree is a self-balancing BST that colors its nodes red or black.
+class RedBlackTree(LinkedBST):
+    """
+    RedBlackTree Class.
+
+    This class keeps the root black, never lets a red node have a red child and gives every path from a node
+    to a missing child the same number of black nodes, which bounds the height by 2 log2(n + 1). An insertion
+    makes at most two rotations and a removal at most three, and most of the rebalancing is recoloring, so
+    writes rotate less than in the AVL tree at the price of slightly deeper searches.
+    """
+    def _create_node(self, value: object) -> RedBlackNode:
+        """
+        Create a detached red node.
+
+        :param value: The value to be stored in the node.
+        :return: The new node.
+        """
+        return RedBlackNode(value)
+
+    def _build_balanced(self, values: list) -> RedBlackNode:
+        """
+        Build a perfectly balanced tree from a list of distinct values in ascending order. Only the nodes on
+        the deepest level are red, which gives every path the same number of black nodes.
+
+        :param values: The values to be stored in the tree.
+        :return: The root of the new tree, or None if values is empty.
+        """
+        self._deepest_level = len(values).bit_length() - 1
+        return super()._build_balanced(values)
+
+    def _finish_built_node(self, node: RedBlackNode, depth: int) -> None:
+        """
+        Color a built node, red if it is on the deepest level (below the root) and black otherwise.
+
+        :param node: The node.
+        :param depth: The depth of the node.
+        """
+        node.red = 0 < depth == self._deepest_level
+
+    def is_valid_red_black(self) -> bool:
+        """
+        Check if the tree is a valid red-black tree: a valid linked BST with a black root, no red node with a
+        red child and the same number of black nodes on every path.
+
+        :return: True if the tree is a valid red-black tree, otherwise False.
+        """
+        if not self._is_linked_bst() or _is_red(self._root):
+            return False
+        return self._black_height(self._root) is not None
+
+    def _black_height(self, node: RedBlackNode):
+        """
+        Recursive helper for is_valid_red_black.
+
+        :param node: The root of the subtree.
+        :return: The number of black nodes on every path of the subtree, or None if the subtree breaks a rule.
+        """
+        if node is None:
+            return 0
+        if node.red and (_is_red(node.left) or _is_red(node.right)):
+            return None
+        left = self._black_height(node.left)
+        right = self._black_height(node.right)
+        if left is None or left != right:
+            return None
+        return left + (0 if node.red else 1)
+
+    def _fix_after_insert(self, node: RedBlackNode) -> None:
+        """
+        Restore the red-black rules after a red leaf was linked, recoloring while the uncle is red and
+        rotating at most twice otherwise.
+
+        :param node: The new leaf.
+        """
+        while _is_red(node.parent):
+            parent = node.parent
+            grandparent = parent.parent  # Exists, since the red parent is not the root
+            if parent is grandparent.left:
+                uncle = grandparent.right
+                if _is_red(uncle):  # Push the blackness of the grandparent down
+                    parent.red = uncle.red = False
+                    grandparent.red = True
+                    node = grandparent
+                    continue
+                if node is parent.right:  # Turn the inner grandchild into an outer one
+                    node = parent
+                    self._rotate_left(node)
+                    parent = node.parent
+                parent.red = False
+                grandparent.red = True
+                self._rotate_right(grandparent)
+            else:
+                uncle = grandparent.left
+                if _is_red(uncle):
+                    parent.red = uncle.red = False
+                    grandparent.red = True
+                    node = grandparent
+                    continue
+                if node is parent.left:
+                    node = parent
+                    self._rotate_right(node)
+                    parent = node.parent
+                parent.red = False
+                grandparent.red = True
+                self._rotate_left(grandparent)
+        self._root.red = False
+
+    def _remove_node(self, node: RedBlackNode) -> None:
+        """
+        Unlink a node and, if a black node was unlinked, restore the black heights.
+
+        :param node: The node to remove.
+        """
+        node = self._take_successor(node)
+        removed_black = not node.red
+        parent, child = self._splice(node)
+        if removed_black:
+            self._fix_after_remove(child, parent)
+
+    def _fix_after_remove(self, node: RedBlackNode, parent: RedBlackNode) -> None:
+        """
+        Restore the black heights after a black node was unlinked. node carries an extra black, which is
+        moved up by recoloring or absorbed with at most three rotations.
+
+        :param node: The child that took the place of the unlinked node, or None.
+        :param parent: The parent of that position.
+        """
+        while node is not self._root and not _is_red(node):
+            if node is parent.left:
+                sibling = parent.right  # Exists, since the sibling subtree holds a black node
+                if sibling.red:  # Make the sibling black
+                    sibling.red = False
+                    parent.red = True
+                    self._rotate_left(parent)
+                    sibling = parent.right
+                if not _is_red(sibling.left) and not _is_red(sibling.right):  # Move the extra black up
+                    sibling.red = True
+                    node, parent = parent, parent.parent
+                    continue
+                if not _is_red(sibling.right):  # Make the far nephew red
+                    sibling.left.red = False
+                    sibling.red = True
+                    self._rotate_right(sibling)
+                    sibling = parent.right
+                sibling.red = parent.red
+                parent.red = False
+                sibling.right.red = False
+                self._rotate_left(parent)
+            else:
+                sibling = parent.left
+                if sibling.red:
+                    sibling.red = False
+                    parent.red = True
+                    self._rotate_right(parent)
+                    sibling = parent.left
+                if not _is_red(sibling.left) and not _is_red(sibling.right):
+                    sibling.red = True
+                    node, parent = parent, parent.parent
+                    continue
+                if not _is_red(sibling.left):
+                    sibling.right.red = False
+                    sibling.red = True
+                    self._rotate_left(sibling)
+                    sibling = parent.left
+                sibling.red = parent.red
+                parent.red = False
+                sibling.left.red = False
+                self._rotate_right(parent)
+            node = self._root
+        if node is not None:
+            node.red = False
+
+
+if __name__ == '__main__':
+    print("\nPDF - RedBlackTree example 1")
+    print("----------------------------")
+    tree = RedBlackTree()
+    for value in (10, 20, 30, 40, 50, 25):
+        tree.add(value)
+    print(tree)
+    tree.remove(20)
+    print(tree)
+
+    print("\nPDF - RedBlackTree add() and remove() stress test")
+    print("-------------------------------------------------")
+    for _ in range(100):
+        case = list(set(random.randrange(1, 20000) for _ in range(900)))
+        tree = RedBlackTree(case[:300])
+        for value in case[300:]:
+            tree.add(value)
+        for value in case[::2]:
+            tree.remove(value)
+        if not tree.is_valid_red_black() or list(tree) != sorted(case[1::2]):
+            raise Exception("PROBLEM WITH ADD/REMOVE OPERATION")
+    print('add() and remove() stress test finished')
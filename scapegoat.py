@@ -0,0 +1,196 @@
+import math
+import random
+from linked_bst import LinkedBST
+
+
+# ScapegoatTree is a BST that rebuilds unbalanced subtrees instead of rotating.
+class ScapegoatTree(LinkedBST):
+    """
+    ScapegoatTree Class.
+
+    This class stores no balance data in its nodes. When an insertion lands deeper than log_{1/alpha} of the
+    largest size the tree has had since its last full rebuild, the tree climbs to an ancestor that is not
+    alpha-weight-balanced (the scapegoat) and rebuilds its subtree perfectly balanced; when removals shrink
+    the tree below alpha times that size, the whole tree is rebuilt. Updates never rotate and cost
+    O(log n) amortized, and the height stays within log_{1/alpha}(n) + 1.
+    """
+    def __init__(self, start_tree=None, alpha: float = 0.7) -> None:
+        """
+        Initialize a scapegoat tree.
+
+        :param start_tree: An iterable of values to initialize the tree.
+        :param alpha: The weight balance, between 0.5 (rebuild often, shallowest) and 1 (rebuild rarely).
+        :raises ValueError: If alpha is not in the open interval (0.5, 1).
+        """
+        if not 0.5 < alpha < 1:
+            raise ValueError("alpha must be between 0.5 and 1")
+        self._alpha = alpha
+        self._max_count = 0  # The largest count since the last full rebuild
+        super().__init__(start_tree)
+
+    def _depth_limit(self, count: int) -> int:
+        """
+        Get the deepest level a node may be inserted at without a rebuild.
+
+        :param count: The number of values in the tree.
+        :return: floor(log_{1/alpha}(count)).
+        """
+        return int(math.log(count) / math.log(1 / self._alpha) + 1e-9) if count > 0 else 0
+
+    def _build_balanced(self, values: list):
+        """
+        Build a perfectly balanced tree from a list of distinct values in ascending order.
+
+        :param values: The values to be stored in the tree.
+        :return: The root of the new tree, or None if values is empty.
+        """
+        self._max_count = len(values)
+        return super()._build_balanced(values)
+
+    def make_empty(self) -> None:
+        """
+        Empty the tree.
+        """
+        super().make_empty()
+        self._max_count = 0
+
+    def is_valid_scapegoat(self) -> bool:
+        """
+        Check if the tree is a valid scapegoat tree: a valid linked BST no higher than
+        log_{1/alpha}(largest count since the last full rebuild) + 1.
+
+        :return: True if the tree is a valid scapegoat tree, otherwise False.
+        """
+        if not self._is_linked_bst() or self._max_count < self._count:
+            return False
+        return self._height(self._root) <= self._depth_limit(self._max_count) + 1
+
+    def _height(self, node) -> int:
+        """
+        Compute the height of a subtree.
+
+        :param node: The root of the subtree, or None.
+        :return: The height of the subtree, -1 if it is empty.
+        """
+        if node is None:
+            return -1
+        return max(self._height(node.left), self._height(node.right)) + 1
+
+    def _size(self, node) -> int:
+        """
+        Count the nodes of a subtree.
+
+        :param node: The root of the subtree, or None.
+        :return: The number of nodes in the subtree.
+        """
+        count = 0
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if node is not None:
+                count += 1
+                stack.append(node.left)
+                stack.append(node.right)
+        return count
+
+    def _fix_after_insert(self, node) -> None:
+        """
+        Rebuild the subtree of a scapegoat if the new leaf is too deep.
+
+        :param node: The new leaf.
+        """
+        if self._max_count < self._count:
+            self._max_count = self._count
+        depth = 0
+        ancestor = node.parent
+        while ancestor is not None:
+            depth += 1
+            ancestor = ancestor.parent
+        if depth <= self._depth_limit(self._max_count):
+            return
+        # Climb until a child holds more than alpha of its parent's subtree
+        size = 1
+        while True:
+            parent = node.parent
+            sibling = parent.right if node is parent.left else parent.left
+            parent_size = size + self._size(sibling) + 1
+            if size > self._alpha * parent_size:
+                self._rebuild(parent)
+                return
+            node, size = parent, parent_size
+
+    def _remove_node(self, node) -> None:
+        """
+        Unlink a node, rebuilding the whole tree once it has shrunk below alpha times its largest count.
+
+        :param node: The node to remove.
+        """
+        self._splice(self._take_successor(node))
+        if self._count < self._alpha * self._max_count:
+            self._rebuild(self._root)
+            self._max_count = self._count
+
+    def _rebuild(self, root) -> None:
+        """
+        Rebuild a subtree perfectly balanced, reusing its nodes.
+
+        :param root: The root of the subtree, or None.
+        """
+        if root is None:
+            return
+        nodes = []
+        stack = []
+        node = root
+        while stack or node is not None:  # Collect the nodes in order
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            nodes.append(node)
+            node = node.right
+        parent = root.parent
+        subtree = self._link_range(nodes, 0, len(nodes) - 1, parent)
+        self._replace_child(parent, root, subtree)
+
+    def _link_range(self, nodes: list, low: int, high: int, parent):
+        """
+        Recursive helper for _rebuild that links nodes[low..high] into a perfectly balanced subtree.
+
+        :param nodes: The nodes in order.
+        :param low: Index of the first node of the subtree.
+        :param high: Index of the last node of the subtree.
+        :param parent: The parent of the subtree root.
+        :return: The root of the subtree, or None if the range is empty.
+        """
+        if low > high:
+            return None
+        middle = (low + high) // 2
+        node = nodes[middle]
+        node.parent = parent
+        node.left = self._link_range(nodes, low, middle - 1, node)
+        node.right = self._link_range(nodes, middle + 1, high, node)
+        return node
+
+
+if __name__ == '__main__':
+    print("\nPDF - ScapegoatTree example 1")
+    print("-----------------------------")
+    tree = ScapegoatTree()
+    for value in (10, 20, 30, 40, 50, 25):
+        tree.add(value)
+    print(tree)
+    tree.remove(20)
+    print(tree)
+
+    print("\nPDF - ScapegoatTree add() and remove() stress test")
+    print("--------------------------------------------------")
+    for _ in range(100):
+        case = list(set(random.randrange(1, 20000) for _ in range(900)))
+        tree = ScapegoatTree(case[:300])
+        for value in case[300:]:
+            tree.add(value)
+        for value in case[::2]:
+            tree.remove(value)
+        if not tree.is_valid_scapegoat() or list(tree) != sorted(case[1::2]):
+            raise Exception("PROBLEM WITH ADD/REMOVE OPERATION")
+    print('add() and remove() stress test finished')
@@ -0,0 +1,153 @@
+import pickle
+import struct
+import sys
+from array import array
+from itertools import islice
+
+# A frame is a series of blocks, each starting with a magic tag, a format version, a type code and the
+# number of values, and ends with an empty end block. Version 1 frames were a single block with no end block.
+_HEADER = struct.Struct('<4sBcQ')
+_MAGIC = b'AVLT'
+_VERSION = 2
+_END = b'e'  # The type code of the end block
+_INT64_MIN, _INT64_MAX = -2 ** 63, 2 ** 63 - 1
+DEFAULT_CHUNK_SIZE = 65536  # The number of values per block written by dump_values
+
+
+def dump_values(values, fileobj, chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+    """
+    Write a sequence of values to a binary file as one frame. The values are consumed chunk_size at a time,
+    each chunk written as one block, so an iterator over a tree is streamed without being copied to a list.
+
+    Blocks made only of ints that fit in 64 bits, only of floats, or only of bytes are written as raw
+    little-endian arrays (bytes as an array of lengths followed by the concatenated data). Anything else is
+    written as a single pickle of the block.
+
+    :param values: An iterable of the values to write.
+    :param fileobj: A binary file object opened for writing.
+    :param chunk_size: The largest number of values per block.
+    """
+    iterator = iter(values)
+    while True:
+        block = list(islice(iterator, chunk_size))
+        if not block:
+            break
+        _dump_block(block, fileobj)
+    fileobj.write(_HEADER.pack(_MAGIC, _VERSION, _END, 0))
+
+
+def _dump_block(values: list, fileobj) -> None:
+    """
+    Write one block of a frame.
+
+    :param values: The values of the block.
+    :param fileobj: A binary file object opened for writing.
+    """
+    if all(type(value) is int for value in values) and \
+            all(_INT64_MIN <= value <= _INT64_MAX for value in values):
+        fileobj.write(_HEADER.pack(_MAGIC, _VERSION, b'q', len(values)))
+        fileobj.write(_to_little_endian(array('q', values)))
+    elif all(type(value) is float for value in values):
+        fileobj.write(_HEADER.pack(_MAGIC, _VERSION, b'd', len(values)))
+        fileobj.write(_to_little_endian(array('d', values)))
+    elif all(type(value) is bytes for value in values):
+        fileobj.write(_HEADER.pack(_MAGIC, _VERSION, b'b', len(values)))
+        fileobj.write(_to_little_endian(array('Q', [len(value) for value in values])))
+        fileobj.write(b''.join(values))
+    else:
+        payload = pickle.dumps(values, protocol=pickle.HIGHEST_PROTOCOL)
+        fileobj.write(_HEADER.pack(_MAGIC, _VERSION, b'p', len(values)))
+        fileobj.write(struct.pack('<Q', len(payload)))
+        fileobj.write(payload)
+
+
+def load_values(fileobj) -> list:
+    """
+    Read one frame written by dump_values.
+
+    :param fileobj: A binary file object opened for reading.
+    :return: The list of values, in the order they were written.
+    :raises ValueError: If the data is not a frame written by dump_values or is truncated.
+    """
+    values = []
+    while True:
+        magic, version, code, count = _HEADER.unpack(_read_exactly(fileobj, _HEADER.size))
+        if magic != _MAGIC or version not in (1, _VERSION):
+            raise ValueError("Not a serialized tree")
+        if code == _END:
+            return values
+        values.extend(_load_block(fileobj, code, count))
+        if version == 1:  # The frame was a single block
+            return values
+
+
+def _load_block(fileobj, code: bytes, count: int) -> list:
+    """
+    Read the values of one block whose header was already read.
+
+    :param fileobj: A binary file object opened for reading.
+    :param code: The type code of the block.
+    :param count: The number of values in the block.
+    :return: The list of values of the block.
+    :raises ValueError: If the data is corrupted or truncated.
+    """
+    if code in (b'q', b'd'):
+        values = _from_little_endian(code.decode(), _read_exactly(fileobj, count * 8))
+        return values.tolist()
+    if code == b'b':
+        lengths = _from_little_endian('Q', _read_exactly(fileobj, count * 8))
+        data = _read_exactly(fileobj, sum(lengths))
+        values, offset = [], 0
+        for length in lengths:
+            values.append(data[offset:offset + length])
+            offset += length
+        return values
+    if code == b'p':
+        size, = struct.unpack('<Q', _read_exactly(fileobj, 8))
+        values = pickle.loads(_read_exactly(fileobj, size))
+        if len(values) != count:
+            raise ValueError("Corrupted serialized tree")
+        return values
+    raise ValueError("Unknown value type code {!r}".format(code))
+
+
+def _read_exactly(fileobj, size: int) -> bytes:
+    """
+    Read an exact number of bytes from a file.
+
+    :param fileobj: A binary file object opened for reading.
+    :param size: The number of bytes to read.
+    :return: The bytes read.
+    :raises ValueError: If the file ends first.
+    """
+    data = fileobj.read(size)
+    if len(data) != size:
+        raise ValueError("Truncated serialized tree")
+    return data
+
+
+def _to_little_endian(values: array) -> bytes:
+    """
+    Get the little-endian bytes of an array.
+
+    :param values: The array to convert.
+    :return: The raw bytes in little-endian order.
+    """
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_little_endian(typecode: str, data: bytes) -> array:
+    """
+    Build an array from little-endian bytes.
+
+    :param typecode: The array type code.
+    :param data: The raw bytes in little-endian order.
+    :return: The array.
+    """
+    values = array(typecode)
+    values.frombytes(data)
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
@@ -0,0 +1,435 @@
+import random
+from bisect import bisect_right
+from itertools import chain
+from avl import AVL
+
+SAMPLES_PER_SHARD = 32  # Sampled keys per shard when choosing the boundaries
+
+
+def _build_shard(tree_factory, values: list):
+    """
+    Build one shard. Defined at module level so that process pools can pickle it.
+
+    :param tree_factory: A callable creating a tree from an iterable of values.
+    :param values: The values of the shard, in any order.
+    :return: The new tree.
+    """
+    return tree_factory(values)
+
+
+def _shard_contains_many(tree, probes: list) -> list:
+    """
+    Run contains_many() on one shard.
+
+    :param tree: The shard.
+    :param probes: The values to look up.
+    :return: A list of booleans, one per probe.
+    """
+    return tree.contains_many(probes)
+
+
+def _shard_range(tree, low: object, high: object, inclusive) -> list:
+    """
+    Collect the values of one shard between two bounds.
+
+    :param tree: The shard.
+    :param low: The lower bound, or None for no lower bound.
+    :param high: The upper bound, or None for no upper bound.
+    :param inclusive: A pair of booleans telling whether low and high themselves are included.
+    :return: A list of the values within the bounds, in ascending order.
+    """
+    return list(tree.irange(low, high, inclusive))
+
+
+def _shard_aggregate(tree, low: object, high: object) -> object:
+    """
+    Run aggregate() on one shard.
+
+    :param tree: The shard, an AggregateAVL.
+    :param low: The lower bound (inclusive), or None for no lower bound.
+    :param high: The upper bound (inclusive), or None for no upper bound.
+    :return: The aggregate of the shard's values within the bounds.
+    """
+    return tree.aggregate(low, high)
+
+
+# ShardedAVL is a set of AVL trees that each hold one key range.
+class ShardedAVL:
+    """
+    ShardedAVL Class.
+
+    This class range-partitions values across several trees (the shards) at sorted boundary keys, chosen by
+    sampling the initial values. A single-value operation is one bisect on the boundaries plus the usual
+    call on one shard, and in-order iteration visits the shards one after another. The shards are independent,
+    so they can be built by a process pool (concurrent.futures.ProcessPoolExecutor), and contains_many(),
+    values_in_range() and aggregate() can fan out over the shards with any executor, merging the results
+    in order.
+
+    A shard built by another process is pickled back as its sorted values and relinked here in linear time,
+    so a process pool only pays off when the factory spends more per value than that (key functions,
+    measures, sorting unordered input) and there are spare cores. Fanning a query out to a process pool
+    pickles the shards each time; use a thread pool for queries.
+
+    The boundaries are fixed once chosen: values added later go to the shard of their range however uneven
+    the shards become.
+    """
+    def __init__(self, start_tree=None, shards: int = 4, boundaries=None, tree_factory=AVL, executor=None,
+                 seed=None) -> None:
+        """
+        Initialize a ShardedAVL.
+
+        :param start_tree: An iterable of values to initialize the shards.
+        :param shards: The number of shards, used when the boundaries are sampled from start_tree.
+        :param boundaries: The ascending keys that start each shard after the first, instead of sampling them.
+        :param tree_factory: A callable creating a shard from an iterable of values, such as AVL or a
+                             functools.partial of AggregateAVL. It must be picklable to build with processes.
+        :param executor: A concurrent.futures executor that builds the shards in parallel, or None to build
+                         them one after another.
+        :param seed: The seed of the sampling, for reproducible boundaries.
+        :raises ValueError: If shards is less than 1 or the boundaries are not strictly ascending.
+        """
+        if shards < 1:
+            raise ValueError("shards must be at least 1")
+        self._tree_factory = tree_factory
+        self._prototype = tree_factory()  # An empty shard, for the key function and the aggregate monoid
+        values = [] if start_tree is None else list(start_tree)
+        if boundaries is None:
+            boundaries = self._sample_boundaries(values, shards, random.Random(seed))
+        else:
+            boundaries = [self._prototype._key_of(value) for value in boundaries]
+            if any(not boundaries[i - 1] < boundaries[i] for i in range(1, len(boundaries))):
+                raise ValueError("Boundaries must be strictly ascending")
+        self._boundaries = boundaries  # Shard i holds the keys k with boundaries[i - 1] <= k < boundaries[i]
+        parts = [[] for _ in range(len(boundaries) + 1)]
+        key_of = self._prototype._key_of
+        for value in values:
+            parts[bisect_right(boundaries, key_of(value))].append(value)
+        if executor is None:
+            self._shards = [_build_shard(tree_factory, part) for part in parts]
+        else:
+            self._shards = list(executor.map(_build_shard, [tree_factory] * len(parts), parts))
+
+    def _sample_boundaries(self, values: list, shards: int, rng: random.Random) -> list:
+        """
+        Choose shard boundaries at evenly spaced quantiles of a random sample of the values' keys.
+
+        :param values: The initial values.
+        :param shards: The number of shards wanted.
+        :param rng: The random generator of the sampling.
+        :return: The boundaries, strictly ascending. There may be fewer than shards - 1 of them when the
+                 values have few distinct keys.
+        """
+        sample = rng.sample(values, min(len(values), shards * SAMPLES_PER_SHARD))
+        keys = sorted(self._prototype._key_of(value) for value in sample)
+        boundaries = []
+        for i in range(1, shards):
+            if not keys:
+                break
+            key = keys[i * len(keys) // shards]
+            if not boundaries or boundaries[-1] < key:
+                boundaries.append(key)
+        return boundaries
+
+    def __str__(self) -> str:
+        """
+        String representation of the sharded tree.
+
+        :return: The values in ascending order, with the shards separated by '|'.
+        """
+        shards = [", ".join(str(value) for value in shard) for shard in self._shards]
+        return "ShardedAVL { " + " | ".join(shards) + " }"
+
+    def __len__(self) -> int:
+        """
+        Return the number of values in all shards.
+
+        :return: The number of values.
+        """
+        return sum(len(shard) for shard in self._shards)
+
+    def __iter__(self):
+        """
+        Lazily iterate over the values in ascending order, one shard after another.
+
+        :return: An iterator of the values in ascending order.
+        """
+        return chain.from_iterable(self._shards)
+
+    def __reversed__(self):
+        """
+        Lazily iterate over the values in descending order.
+
+        :return: An iterator of the values in descending order.
+        """
+        return chain.from_iterable(reversed(shard) for shard in reversed(self._shards))
+
+    def get_shards(self) -> list:
+        """
+        Get the shards, in ascending order of their key ranges.
+
+        :return: The list of shards.
+        """
+        return self._shards
+
+    def _shard_of(self, value: object):
+        """
+        Route a value to the shard of its key range.
+
+        :param value: The value.
+        :return: The shard that holds, or would hold, the value.
+        """
+        return self._shards[bisect_right(self._boundaries, self._prototype._key_of(value))]
+
+    def is_valid(self) -> bool:
+        """
+        Check that every shard is a valid AVL tree whose values lie within the shard's key range.
+
+        :return: True if the sharded tree is valid, otherwise False.
+        """
+        key_of = self._prototype._key_of
+        for index, shard in enumerate(self._shards):
+            if not shard.is_valid_avl():
+                return False
+            if not shard.is_empty():
+                low, high = key_of(shard.find_min()), key_of(shard.find_max())
+                if index > 0 and low < self._boundaries[index - 1]:
+                    return False
+                if index < len(self._boundaries) and not high < self._boundaries[index]:
+                    return False
+        return True
+
+    def add(self, value: object) -> None:
+        """
+        Add a value to the shard of its key range.
+
+        :param value: The value to add.
+        """
+        self._shard_of(value).add(value)
+
+    def remove(self, value: object) -> bool:
+        """
+        Remove a value from the shard of its key range.
+
+        :param value: The value to remove.
+        :return: True if the value was removed, False if it was not found.
+        """
+        return self._shard_of(value).remove(value)
+
+    def contains(self, value: object) -> bool:
+        """
+        Check if the shard of a value's key range contains it.
+
+        :param value: The value to check.
+        :return: True if the value is in the sharded tree, False otherwise.
+        """
+        return self._shard_of(value).contains(value)
+
+    def _fan_out(self, function, indexes: list, arguments: list, executor) -> list:
+        """
+        Call a function on several shards, in parallel when an executor is given.
+
+        :param function: A module-level function taking a shard followed by one tuple of arguments.
+        :param indexes: The indexes of the shards to call it on.
+        :param arguments: One tuple of further arguments per shard.
+        :param executor: A concurrent.futures executor, or None to call the shards one after another.
+        :return: The results, in the order of indexes.
+        """
+        shards = [self._shards[index] for index in indexes]
+        if executor is None:
+            return [function(shard, *args) for shard, args in zip(shards, arguments)]
+        return list(executor.map(function, shards, *zip(*arguments))) if shards else []
+
+    def contains_many(self, values, executor=None) -> list:
+        """
+        Check many values at once: the probes are grouped by shard, each group runs the batched
+        contains_many() of its shard, and the answers are scattered back in the order of the probes.
+
+        :param values: An iterable of values to look up.
+        :param executor: A concurrent.futures executor to query the shards in parallel, or None.
+        :return: A list of booleans, one per value.
+        """
+        values = list(values)
+        key_of = self._prototype._key_of
+        groups = {}  # Shard index to the positions of its probes
+        for position, value in enumerate(values):
+            groups.setdefault(bisect_right(self._boundaries, key_of(value)), []).append(position)
+        indexes = list(groups)
+        answers = self._fan_out(_shard_contains_many, indexes,
+                                [([values[position] for position in groups[index]],) for index in indexes],
+                                executor)
+        found = [False] * len(values)
+        for index, shard_answers in zip(indexes, answers):
+            for position, answer in zip(groups[index], shard_answers):
+                found[position] = answer
+        return found
+
+    def _shard_span(self, low: object, high: object) -> range:
+        """
+        Find the shards whose key ranges can hold values between two bounds.
+
+        :param low: The lower bound, or None for no lower bound.
+        :param high: The upper bound, or None for no upper bound.
+        :return: A range of shard indexes.
+        """
+        key_of = self._prototype._key_of
+        first = 0 if low is None else bisect_right(self._boundaries, key_of(low))
+        last = len(self._boundaries) if high is None else bisect_right(self._boundaries, key_of(high))
+        return range(first, last + 1)
+
+    def irange(self, low: object = None, high: object = None, inclusive=(True, False), reverse=False):
+        """
+        Lazily iterate over the values between two bounds, visiting only the shards whose ranges overlap them.
+
+        :param low: The lower bound, or None for no lower bound.
+        :param high: The upper bound, or None for no upper bound.
+        :param inclusive: A pair of booleans telling whether low and high themselves are included.
+        :param reverse: If True, values are produced in descending order.
+        :return: An iterator of the values within the bounds.
+        """
+        span = self._shard_span(low, high)
+        if reverse:
+            span = reversed(span)
+        return chain.from_iterable(self._shards[index].irange(low, high, inclusive, reverse) for index in span)
+
+    def values_in_range(self, low: object = None, high: object = None, inclusive=(True, False),
+                        executor=None) -> list:
+        """
+        Collect the values between two bounds, scanning the overlapping shards in parallel when an executor
+        is given and concatenating their results in order.
+
+        :param low: The lower bound, or None for no lower bound.
+        :param high: The upper bound, or None for no upper bound.
+        :param inclusive: A pair of booleans telling whether low and high themselves are included.
+        :param executor: A concurrent.futures executor to scan the shards in parallel, or None.
+        :return: A list of the values within the bounds, in ascending order.
+        """
+        indexes = list(self._shard_span(low, high))
+        parts = self._fan_out(_shard_range, indexes, [(low, high, inclusive)] * len(indexes), executor)
+        return list(chain.from_iterable(parts))
+
+    def aggregate(self, low: object = None, high: object = None, executor=None) -> object:
+        """
+        Combine the measures of the values v with low <= v <= high, for shards created by an AggregateAVL
+        factory. Each overlapping shard computes its partial aggregate, and the partials are combined in
+        shard order, so the combine function does not need to be commutative.
+
+        :param low: The lower bound (inclusive), or None for no lower bound.
+        :param high: The upper bound (inclusive), or None for no upper bound.
+        :param executor: A concurrent.futures executor to query the shards in parallel, or None.
+        :return: The aggregate of the range, or the identity if it is empty.
+        """
+        indexes = list(self._shard_span(low, high))
+        result = self._prototype._identity
+        for partial in self._fan_out(_shard_aggregate, indexes, [(low, high)] * len(indexes), executor):
+            result = self._prototype._combine(result, partial)
+        return result
+
+    def rank(self, value: object) -> int:
+        """
+        Count the values that are strictly less than a given value.
+
+        :param value: The value to rank. It does not need to be in the tree.
+        :return: The number of values less than value.
+        """
+        index = bisect_right(self._boundaries, self._prototype._key_of(value))
+        return sum(len(shard) for shard in self._shards[:index]) + self._shards[index].rank(value)
+
+    def select(self, k: int) -> object:
+        """
+        Return the k-th smallest value (0-based), skipping whole shards by their sizes.
+
+        :param k: The position of the value in sorted order.
+        :return: The value at position k.
+        :raises IndexError: If k is outside the range [0, len(tree)).
+        """
+        if k >= 0:
+            for shard in self._shards:
+                size = len(shard)
+                if k < size:
+                    return shard.select(k)
+                k -= size
+        raise IndexError("ShardedAVL index out of range")
+
+    def count_range(self, low: object, high: object) -> int:
+        """
+        Count the values v with low <= v <= high.
+
+        :param low: The lower bound (inclusive).
+        :param high: The upper bound (inclusive).
+        :return: The number of values within the bounds.
+        """
+        return sum(self._shards[index].count_range(low, high) for index in self._shard_span(low, high))
+
+    def find_min(self) -> object:
+        """
+        Find the minimum value, in the first non-empty shard.
+
+        :return: The minimum value, or None if the tree is empty.
+        """
+        for shard in self._shards:
+            if not shard.is_empty():
+                return shard.find_min()
+        return None
+
+    def find_max(self) -> object:
+        """
+        Find the maximum value, in the last non-empty shard.
+
+        :return: The maximum value, or None if the tree is empty.
+        """
+        for shard in reversed(self._shards):
+            if not shard.is_empty():
+                return shard.find_max()
+        return None
+
+    def is_empty(self) -> bool:
+        """
+        Check if every shard is empty.
+
+        :return: True if the tree is empty, False otherwise.
+        """
+        return all(shard.is_empty() for shard in self._shards)
+
+    def make_empty(self) -> None:
+        """
+        Empty every shard, keeping the boundaries.
+        """
+        for shard in self._shards:
+            shard.make_empty()
+
+
+if __name__ == '__main__':
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+    from aggregate_avl import AggregateAVL
+
+    print("\nPDF - ShardedAVL example 1")
+    print("--------------------------")
+    tree = ShardedAVL(range(0, 40, 3), shards=3, seed=1)
+    print(tree)
+    tree.add(10)
+    tree.remove(9)
+    print(tree, "valid:", tree.is_valid())
+    print("contains_many:", tree.contains_many([10, 11, 39]))
+    print("values in [10, 25):", tree.values_in_range(10, 25))
+
+    print("\nPDF - ShardedAVL process-pool build and parallel aggregate")
+    print("----------------------------------------------------------")
+    values = random.sample(range(1000000), 100000)
+    with ProcessPoolExecutor(2) as processes:
+        tree = ShardedAVL(values, shards=4, tree_factory=AggregateAVL, executor=processes)
+    with ThreadPoolExecutor(4) as threads:
+        print("Sum of [1000, 500000]:", tree.aggregate(1000, 500000, threads),
+              sum(value for value in values if 1000 <= value <= 500000))
+
+    print("\nPDF - ShardedAVL add() and remove() stress test")
+    print("-----------------------------------------------")
+    for _ in range(100):
+        case = list(set(random.randrange(1, 20000) for _ in range(900)))
+        tree = ShardedAVL(case[:300], shards=5)
+        for value in case[300:]:
+            tree.add(value)
+        for value in case[::2]:
+            tree.remove(value)
+        if not tree.is_valid() or list(tree) != sorted(case[1::2]):
+            raise Exception("PROBLEM WITH ADD/REMOVE OPERATION")
+    print('add() and remove() stress test finished')
@@ -1,5 +1,24 @@
+import io
+import os
+import pickle
+import tempfile
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from main import *
+from compact_avl import CompactAVL
+from avl_map import AVLMap
+from persistent_avl import PersistentAVL
+from concurrent_avl import ConcurrentAVL
+from mmap_avl import MmapAVL
+from aggregate_avl import AggregateAVL
+from interval_avl import IntervalAVL
+from instrumentation import enable_stats, disable_stats
+from engines import POLICIES, make_tree, is_valid_tree
+from block_list import BlockList
+from avl_multiset import AVLMultiset
+from sharded_avl import ShardedAVL
+from window_stats import WindowStats, rolling_quantiles
+from serialization import dump_values, load_values
 
 class TestAVLTree(unittest.TestCase):
 
@@ -62,5 +81,596 @@ class TestAVLTree(unittest.TestCase):
         self.avl_tree.add(1)
         assert str(self.avl_tree) == "AVL pre-order { 2, 1, 3 }"
 
+    def test_start_tree_balanced(self):
+        tree = AVL([28, 3, 26, 4, 25, 8, 24, 9, 23, 15, 19, 17, 3, 28])
+        self.assertEqual(str(tree), "AVL pre-order { 17, 8, 3, 4, 9, 15, 24, 19, 23, 26, 25, 28 }")
+        self.assertTrue(tree.is_valid_avl())
+
+    def test_from_sorted(self):
+        tree = AVL.from_sorted([1, 1, 2, 3, 3, 4, 5])
+        self.assertEqual(str(tree), "AVL pre-order { 3, 1, 2, 4, 5 }")
+        self.assertEqual(tree._get_height(tree._root), 2)
+        self.assertTrue(tree.is_valid_avl())
+        with self.assertRaises(ValueError):
+            AVL.from_sorted([2, 1])
+
+    def test_order_statistics(self):
+        values = [3, 4, 8, 9, 15, 17, 19, 23, 24, 25, 26, 28]
+        for value in values:
+            self.avl_tree.add(value)
+        self.avl_tree.remove(23)
+        self.assertEqual(len(self.avl_tree), 11)
+        self.assertEqual(self.avl_tree.rank(3), 0)
+        self.assertEqual(self.avl_tree.rank(23), 7)
+        self.assertEqual(self.avl_tree.select(7), 24)
+        self.assertEqual(self.avl_tree.count_range(8, 24), 6)
+        self.assertEqual(self.avl_tree.count_range(24, 8), 0)
+        with self.assertRaises(IndexError):
+            self.avl_tree.select(11)
+
+    def test_iterators(self):
+        values = [3, 4, 8, 9, 15, 17, 19, 23, 24, 25, 26, 28]
+        for value in values:
+            self.avl_tree.add(value)
+        self.assertEqual(list(self.avl_tree), values)
+        self.assertEqual(list(reversed(self.avl_tree)), values[::-1])
+        self.assertEqual(list(self.avl_tree.irange(9, 24)), [9, 15, 17, 19, 23])
+        self.assertEqual(list(self.avl_tree.irange(9, 24, inclusive=(False, True))), [15, 17, 19, 23, 24])
+        self.assertEqual(list(self.avl_tree.irange(high=9, reverse=True)), [8, 4, 3])
+        self.assertEqual(list(self.avl_tree.irange(29)), [])
+
+    def test_split_and_join(self):
+        tree = AVL([3, 4, 8, 9, 15, 17, 19, 23, 24, 25, 26, 28])
+        smaller, found, larger = tree.split(17)
+        self.assertTrue(found)
+        self.assertTrue(tree.is_empty())
+        self.assertEqual(list(smaller), [3, 4, 8, 9, 15])
+        self.assertEqual(list(larger), [19, 23, 24, 25, 26, 28])
+        joined = AVL.join(smaller, 16, larger)
+        self.assertEqual(list(joined), [3, 4, 8, 9, 15, 16, 19, 23, 24, 25, 26, 28])
+        self.assertEqual(len(joined), 12)
+        self.assertTrue(joined.is_valid_avl())
+        with self.assertRaises(ValueError):
+            AVL.join(AVL([5]), 4, AVL())
+
+    def test_set_operations(self):
+        first, second = set(range(0, 60, 2)), set(range(0, 60, 3))
+        for operation, expected in (('union', first | second), ('intersection', first & second),
+                                    ('difference', first - second), ('symmetric_difference', first ^ second)):
+            tree, other = AVL(first), AVL(second)
+            getattr(tree, operation)(other)
+            self.assertEqual(list(tree), sorted(expected))
+            self.assertEqual(len(tree), len(expected))
+            self.assertTrue(tree.is_valid_avl())
+            self.assertTrue(other.is_empty())
+
+    def test_batch_operations(self):
+        tree = AVL([3, 4, 8, 9, 15, 17, 19, 23, 24, 25, 26, 28])
+        self.assertEqual(tree.add_many([5, 4, 30, 5, 1]), 3)
+        self.assertEqual(tree.remove_many([3, 100, 23, 4]), 3)
+        self.assertEqual(list(tree), [1, 5, 8, 9, 15, 17, 19, 24, 25, 26, 28, 30])
+        self.assertEqual(tree.contains_many([30, 2, 8, 8, 23]), [True, False, True, True, False])
+        self.assertTrue(tree.is_valid_avl())
+
+    def test_dump_and_load(self):
+        for values in ([3, 4, 8, 9, 15, 17, 19, 23], [0.5, 1.5, 2.5], [b'a', b'bc', b''], ['a', 'b', 'c']):
+            tree = AVL(values)
+            fileobj = io.BytesIO()
+            tree.dump(fileobj)
+            fileobj.seek(0)
+            loaded = AVL.load(fileobj)
+            self.assertEqual(list(loaded), sorted(values))
+            self.assertTrue(loaded.is_valid_avl())
+
+    def test_dump_streams_blocks(self):
+        fileobj = io.BytesIO()
+        dump_values(iter([1, 2, 3, 4, 'a', 'b', 2.5]), fileobj, chunk_size=2)
+        dump_values(iter([]), fileobj, chunk_size=2)
+        fileobj.seek(0)
+        self.assertEqual(load_values(fileobj), [1, 2, 3, 4, 'a', 'b', 2.5])
+        self.assertEqual(load_values(fileobj), [])
+
+    def test_pickle(self):
+        tree = AVL(range(5000))
+        loaded = pickle.loads(pickle.dumps(tree))
+        self.assertEqual(list(loaded), list(range(5000)))
+        self.assertEqual(len(loaded), 5000)
+        self.assertTrue(loaded.is_valid_avl())
+        duplicates = pickle.loads(pickle.dumps(BST([1, 1, 1, 1])))
+        self.assertEqual(list(duplicates), [1, 1, 1, 1])
+
+    def test_retrace_matches_full_rebalance(self):
+        values = [(value * 7919) % 1000 for value in range(600)]
+        tree, reference = AVL(), AVL()
+        reference._retrace = reference._rebalance
+        for value in values:
+            tree.add(value)
+            reference.add(value)
+        for value in values[::3]:
+            tree.remove(value)
+            reference.remove(value)
+        self.assertEqual(str(tree), str(reference))
+        self.assertEqual(len(tree), len(reference))
+        self.assertTrue(tree.is_valid_avl())
+
+    def test_key_function(self):
+        tree = AVL(['pear', 'fig', 'banana', 'kiwi'], key=len)
+        self.assertEqual(list(tree), ['fig', 'pear', 'banana'])
+        tree.add('apple')
+        tree.add('plum')
+        self.assertEqual(list(tree), ['fig', 'pear', 'apple', 'banana'])
+        self.assertTrue(tree.contains('date'))
+        self.assertEqual(tree.rank('melon'), 2)
+        self.assertEqual(list(tree.irange('ab', 'abcdef')), ['fig', 'pear', 'apple'])
+        self.assertTrue(tree.remove('nuts'))
+        self.assertEqual(tree.contains_many(['kiwi', 'lime', 'ab']), [False, False, False])
+        smaller, found, larger = tree.split('grape')
+        self.assertTrue(found)
+        self.assertEqual((list(smaller), list(larger)), (['fig'], ['banana']))
+        self.assertTrue(smaller.is_valid_avl())
+
+    def test_neighbor_queries(self):
+        for tree in (AVL([10, 20, 5, 15, 17, 7, 12]), BST([10, 20, 5, 15, 17, 7, 12])):
+            self.assertEqual((tree.floor(14), tree.floor(15), tree.floor(4)), (12, 15, None))
+            self.assertEqual((tree.ceiling(14), tree.ceiling(15), tree.ceiling(21)), (15, 15, None))
+            self.assertEqual((tree.lower(15), tree.higher(15)), (12, 17))
+            self.assertEqual(tree.nearest(14, 3), [15, 12, 17])
+            self.assertEqual(tree.nearest(0, 10), [5, 7, 10, 12, 15, 17, 20])
+            node = tree.get_root()
+            while node.left is not None:
+                node = node.left
+            values = []
+            while node is not None:
+                values.append(node.value)
+                node = tree.successor(node)
+            self.assertEqual(values, [5, 7, 10, 12, 15, 17, 20])
+            node = tree.get_root()
+            while node.right is not None:
+                node = node.right
+            values = []
+            while node is not None:
+                values.append(node.value)
+                node = tree.predecessor(node)
+            self.assertEqual(values, [20, 17, 15, 12, 10, 7, 5])
+
+    def test_cursor(self):
+        tree = AVL(range(0, 100, 10))
+        cursor = tree.cursor(35)
+        self.assertEqual(cursor.get_value(), 40)
+        for value in (41, 42, 43, 39):
+            cursor.insert_near(value)
+            self.assertEqual(cursor.get_value(), value)
+        self.assertTrue(cursor.next())
+        self.assertEqual(cursor.get_value(), 40)
+        self.assertTrue(cursor.remove_here())
+        self.assertEqual(cursor.get_value(), 41)
+        self.assertTrue(cursor.prev())
+        self.assertEqual(cursor.get_value(), 39)
+        self.assertTrue(cursor.seek(90))
+        self.assertFalse(cursor.seek(95))
+        self.assertFalse(cursor.has_value())
+        self.assertFalse(cursor.next())
+        self.assertEqual(list(tree), [0, 10, 20, 30, 39, 41, 42, 43, 50, 60, 70, 80, 90])
+        self.assertTrue(tree.is_valid_avl())
+        self.assertEqual(len(tree), 13)
+
+    def test_min_max_cache_and_pop(self):
+        tree = AVL([5, 3, 8])
+        for value in range(9, 20):  # Appends take the fast path below the cached maximum
+            tree.add(value)
+        tree.add(1)
+        tree.add(4)
+        self.assertEqual((tree.find_min(), tree.find_max()), (1, 19))
+        self.assertEqual([tree.pop_min(), tree.pop_max(), tree.pop_max()], [1, 19, 18])
+        tree.remove(3)
+        tree.remove(17)
+        self.assertEqual((tree.find_min(), tree.find_max()), (4, 16))
+        self.assertTrue(tree.is_valid_avl())
+        copied = pickle.loads(pickle.dumps(tree))
+        self.assertNotIn('_min_node', copied.__dict__)
+        self.assertEqual((copied.find_min(), copied.find_max()), (4, 16))
+        while not tree.is_empty():
+            tree.pop_min()
+        self.assertIsNone(tree.find_max())
+        with self.assertRaises(IndexError):
+            tree.pop_max()
+
+class TestCompactAVL(unittest.TestCase):
+
+    def test_add_remove(self):
+        tree = CompactAVL()
+        values = [3, 4, 8, 9, 15, 17, 19, 23, 24, 25, 26, 28]
+        for value in values:
+            tree.add(value)
+        self.assertEqual(str(tree), "CompactAVL pre-order { 23, 9, 4, 3, 8, 17, 15, 19, 25, 24, 26, 28 }")
+        self.assertTrue(tree.remove(23))
+        self.assertFalse(tree.remove(23))
+        self.assertEqual(str(tree), "CompactAVL pre-order { 24, 9, 4, 3, 8, 17, 15, 19, 26, 25, 28 }")
+        self.assertTrue(tree.is_valid_avl())
+
+    def test_free_list_reuse(self):
+        tree = CompactAVL(range(10))
+        tree.remove(3)
+        tree.remove(7)
+        tree.add(30)
+        tree.add(31)
+        self.assertEqual(len(tree._keys), 10)
+        self.assertEqual(list(tree), [0, 1, 2, 4, 5, 6, 8, 9, 30, 31])
+        self.assertTrue(tree.contains(30))
+        self.assertFalse(tree.contains(3))
+
+class TestMmapAVL(unittest.TestCase):
+
+    def test_reopen(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'tree.avl')
+            with MmapAVL(path) as tree:
+                for value in range(100):  # Grows the file past its initial capacity
+                    tree.add(value)
+                for value in range(0, 100, 3):
+                    tree.remove(value)
+            with MmapAVL(path) as tree:
+                expected = [value for value in range(100) if value % 3]
+                self.assertEqual(list(tree), expected)
+                self.assertEqual(len(tree), len(expected))
+                self.assertEqual(list(tree.irange(10, 20)), [10, 11, 13, 14, 16, 17, 19])
+                self.assertEqual((tree.find_min(), tree.find_max()), (1, 98))
+                self.assertTrue(tree.is_valid_avl())
+
+class TestAggregateAVL(unittest.TestCase):
+
+    def test_range_sum(self):
+        tree = AggregateAVL([3, 4, 8, 9, 15, 17, 19, 23, 24, 25, 26, 28])
+        tree.remove(23)
+        tree.add(16)
+        self.assertEqual(tree.aggregate(), 194)
+        self.assertEqual(tree.aggregate(8, 19), 84)
+        self.assertEqual(tree.aggregate(low=25), 79)
+        self.assertEqual(tree.aggregate(20, 23), 0)
+
+    def test_range_min(self):
+        tree = AggregateAVL([5, 1, 4, 2, 3], combine=min, identity=float('inf'), measure=lambda value: value % 3)
+        self.assertEqual(tree.aggregate(2, 2), 2)
+        self.assertEqual(tree.aggregate(1, 2), 1)
+        self.assertEqual(tree.aggregate(1, 5), 0)
+
+class TestIntervalAVL(unittest.TestCase):
+
+    def test_overlapping_and_stabbing(self):
+        tree = IntervalAVL()
+        for interval in [(15, 20), (10, 30), (17, 19), (5, 20), (12, 15), (30, 40)]:
+            tree.add(interval)
+        tree.remove((17, 19))
+        self.assertEqual(list(tree.overlapping(14, 16)), [(5, 20), (10, 30), (12, 15), (15, 20)])
+        self.assertEqual(list(tree.stabbing(30)), [(10, 30), (30, 40)])
+        self.assertEqual(list(tree.stabbing(41)), [])
+        self.assertEqual(tree.get_root().max_end, 40)
+        with self.assertRaises(ValueError):
+            tree.add((3, 1))
+
+    def test_reversed_intervals_rejected_everywhere(self):
+        with self.assertRaises(ValueError):
+            IntervalAVL([(1, 2), (5, 4)])
+        tree = IntervalAVL([(1, 2), (6, 9)])
+        with self.assertRaises(ValueError):
+            tree.add_many([(3, 4), (8, 7)])
+        with self.assertRaises(ValueError):
+            IntervalAVL.join(IntervalAVL([(1, 2)]), (3, 2), IntervalAVL([(4, 5)]))
+        with self.assertRaises(ValueError):
+            tree.cursor((6, 9)).insert_near((7, 0))
+        self.assertEqual(list(tree), [(1, 2), (6, 9)])
+        self.assertTrue(tree.is_valid_avl())
+
+class TestAVLMap(unittest.TestCase):
+
+    def test_set_and_get(self):
+        tree = AVLMap([(2, 'b'), (1, 'a'), (3, 'c'), (1, 'z')])
+        tree[4] = 'd'
+        tree[2] = 'B'
+        self.assertEqual(tree[1], 'z')
+        self.assertEqual(tree[2], 'B')
+        self.assertEqual(tree.get(5, 'x'), 'x')
+        self.assertEqual(tree.setdefault(3, 'y'), 'c')
+        self.assertEqual(list(tree.items()), [(1, 'z'), (2, 'B'), (3, 'c'), (4, 'd')])
+        with self.assertRaises(KeyError):
+            tree[5]
+
+    def test_remove_moves_payloads(self):
+        tree = AVLMap((value, str(value)) for value in [3, 4, 8, 9, 15, 17, 19, 23, 24, 25, 26, 28])
+        self.assertEqual(tree.pop(9), '9')
+        del tree[23]
+        self.assertEqual(tree.pop(23, None), None)
+        self.assertTrue(all(key == int(data) for key, data in tree.items()))
+        self.assertEqual(len(tree), 10)
+        self.assertTrue(tree.is_valid_avl())
+
+    def test_dump_and_load(self):
+        tree = AVLMap([(2, 'b'), (1, 'a'), (3, 'c')])
+        fileobj = io.BytesIO()
+        tree.dump(fileobj)
+        fileobj.seek(0)
+        self.assertEqual(list(AVLMap.load(fileobj).items()), [(1, 'a'), (2, 'b'), (3, 'c')])
+        fileobj = io.BytesIO()
+        dump_values([3, 1, 3, 2], fileobj)
+        dump_values(['c', 'a', 'C', 'b'], fileobj)
+        fileobj.seek(0)
+        self.assertEqual(list(AVLMap.load(fileobj).items()), [(1, 'a'), (2, 'b'), (3, 'C')])
+
+class TestPersistentAVL(unittest.TestCase):
+
+    def test_add_remove(self):
+        tree = PersistentAVL()
+        for value in [3, 4, 8, 9, 15, 17, 19, 23, 24, 25, 26, 28]:
+            tree.add(value)
+        self.assertEqual(str(tree), "PersistentAVL pre-order { 23, 9, 4, 3, 8, 17, 15, 19, 25, 24, 26, 28 }")
+        self.assertTrue(tree.remove(23))
+        self.assertFalse(tree.remove(23))
+        self.assertEqual(str(tree), "PersistentAVL pre-order { 24, 9, 4, 3, 8, 17, 15, 19, 26, 25, 28 }")
+        self.assertTrue(tree.is_valid_avl())
+
+    def test_snapshot_isolation(self):
+        tree = PersistentAVL(range(10))
+        snapshot = tree.snapshot()
+        tree.add(10)
+        self.assertIs(snapshot.get_root().left, tree.get_root().left)
+        tree.remove(0)
+        tree.remove(5)
+        self.assertEqual(list(snapshot), list(range(10)))
+        self.assertEqual(list(tree), [1, 2, 3, 4, 6, 7, 8, 9, 10])
+        self.assertEqual(len(snapshot), 10)
+
+class TestConcurrentAVL(unittest.TestCase):
+
+    def test_batch_and_chunked_iteration(self):
+        tree = ConcurrentAVL(chunk_size=3)
+        with tree.batch():
+            for value in range(10):
+                tree.add(value)
+            self.assertTrue(tree.remove(4))
+            self.assertFalse(tree.contains(4))
+        self.assertEqual(list(tree), [0, 1, 2, 3, 5, 6, 7, 8, 9])
+        self.assertEqual(list(tree.irange(2, 8, reverse=True)), [7, 6, 5, 3, 2])
+        self.assertEqual(len(tree), 9)
+        self.assertTrue(tree.is_valid_avl())
+
+    def test_chunked_iteration_keeps_duplicates(self):
+        tree = ConcurrentAVL(AVLMultiset([1, 1, 1, 2, 2, 3]), chunk_size=2)
+        self.assertEqual(list(tree), [1, 1, 1, 2, 2, 3])
+        self.assertEqual(list(reversed(tree)), [3, 2, 2, 1, 1, 1])
+        self.assertEqual(list(tree.irange(1, 3, (False, True), reverse=True)), [3, 2, 2])
+        tree = ConcurrentAVL(AVLMultiset([4] + [5] * 1000 + [6]), chunk_size=7)
+        self.assertEqual(list(tree), [4] + [5] * 1000 + [6])
+        self.assertEqual(list(reversed(tree)), [6] + [5] * 1000 + [4])
+
+class TestBalancingPolicies(unittest.TestCase):
+
+    def test_shared_api(self):
+        values = [3, 4, 8, 9, 15, 17, 19, 23, 24, 25, 26, 28]
+        for policy in POLICIES:
+            tree = make_tree(values[:4], policy)
+            for value in values[::-1]:
+                tree.add(value)
+            for value in values[::3]:
+                self.assertTrue(tree.remove(value))
+            self.assertFalse(tree.remove(100))
+            expected = [value for index, value in enumerate(values) if index % 3]
+            self.assertEqual(list(tree), expected, policy)
+            self.assertEqual(len(tree), len(expected))
+            self.assertEqual(str(tree.inorder_traversal()), str(AVL(expected).inorder_traversal()))
+            self.assertEqual((tree.find_min(), tree.find_max()), (4, 28))
+            self.assertTrue(tree.contains(17))
+            self.assertFalse(tree.contains(9))
+            self.assertTrue(is_valid_tree(tree), policy)
+
+    def test_sorted_insertions_stay_balanced(self):
+        for policy in POLICIES:
+            tree = make_tree(policy=policy)
+            for value in range(2000):
+                tree.add(value)
+            for value in range(0, 2000, 2):
+                tree.remove(value)
+            self.assertTrue(is_valid_tree(tree), policy)
+            self.assertEqual(list(tree), list(range(1, 2000, 2)))
+        with self.assertRaises(ValueError):
+            make_tree(policy='splay')
+
+class TestAVLMultiset(unittest.TestCase):
+
+    def test_counts_duplicates(self):
+        tree = AVLMultiset((1, 1, 1, 1))
+        self.assertEqual(tree.get_root().count, 4)
+        self.assertEqual(tree.distinct_count(), 1)
+        values = [5, 3, 5, 8, 3, 5, 1]
+        tree = AVLMultiset(values)
+        tree.add(8)
+        values.append(8)
+        self.assertTrue(tree.remove(5))
+        values.remove(5)
+        self.assertFalse(tree.remove(4))
+        self.assertTrue(tree.is_valid_avl())
+        self.assertEqual(list(tree), sorted(values))
+        self.assertEqual(len(tree), len(values))
+        self.assertEqual(tree.count(5), 2)
+        self.assertEqual(tree.count(4), 0)
+        self.assertEqual(tree.rank(5), 3)
+        self.assertEqual([tree.select(k) for k in range(len(values))], sorted(values))
+        self.assertEqual(tree.count_range(3, 5), 4)
+        self.assertEqual(list(tree.items()), [(1, 1), (3, 2), (5, 2), (8, 2)])
+
+    def test_last_occurrence_unlinks_node(self):
+        tree = AVLMultiset([2, 2, 7])
+        tree.remove(2)
+        tree.remove(2)
+        self.assertFalse(tree.contains(2))
+        self.assertEqual(list(tree), [7])
+
+    def test_batched_add_and_remove(self):
+        tree = AVLMultiset([2, 5, 5])
+        self.assertEqual(tree.add_many([5, 9, 2, 5, 1, 9]), 6)
+        self.assertEqual(list(tree.items()), [(1, 1), (2, 2), (5, 4), (9, 2)])
+        self.assertEqual(tree.remove_many([5, 5, 9, 9, 9, 7, 1]), 5)
+        self.assertEqual(list(tree.items()), [(2, 2), (5, 2)])
+        self.assertEqual(len(tree), 4)
+        self.assertTrue(tree.is_valid_avl())
+
+    def test_copy_keeps_counts(self):
+        tree = AVLMultiset([4, 1, 4, 9, 4, 1])
+        copy = tree.copy()
+        tree.remove(4)
+        self.assertEqual(list(copy.items()), [(1, 2), (4, 3), (9, 1)])
+        self.assertEqual(len(copy), 6)
+        self.assertEqual(copy.select(4), 4)
+        self.assertEqual(copy.find_max(), 9)
+        self.assertTrue(copy.is_valid_avl())
+
+    def test_set_operations_combine_counts(self):
+        first, second = [1, 1, 1, 2, 4, 4], [1, 2, 2, 3, 4, 4]
+        for operation, expected in (('union', [1, 1, 1, 2, 2, 3, 4, 4]), ('intersection', [1, 2, 4, 4]),
+                                    ('difference', [1, 1]), ('symmetric_difference', [1, 1, 2, 3])):
+            tree, other = AVLMultiset(first), AVLMultiset(second)
+            getattr(tree, operation)(other)
+            self.assertEqual(list(tree), expected)
+            self.assertEqual(len(tree), len(expected))
+            self.assertTrue(tree.is_valid_avl())
+            self.assertEqual(len(other), 0)
+
+class TestBlockList(unittest.TestCase):
+
+    def test_copy_and_split_keep_subclass(self):
+        class Blocks(BlockList):
+            pass
+        blocks = Blocks(range(10), block_size=4)
+        self.assertIsInstance(blocks.copy(), Blocks)
+        smaller, found, larger = blocks.split(5)
+        self.assertTrue(found)
+        self.assertIsInstance(smaller, Blocks)
+        self.assertIsInstance(larger, Blocks)
+        self.assertEqual((list(smaller), list(larger)), ([0, 1, 2, 3, 4], [6, 7, 8, 9]))
+
+    def test_same_api_as_avl(self):
+        values = [3, 4, 8, 9, 15, 17, 19, 23, 24, 25, 26, 28]
+        blocks, tree = BlockList(block_size=2), AVL()
+        for value in values + [8, 17]:
+            blocks.add(value)
+            tree.add(value)
+        for value in (23, 100):
+            self.assertEqual(blocks.remove(value), tree.remove(value))
+        self.assertTrue(blocks.is_valid())
+        self.assertEqual(list(blocks), list(tree))
+        self.assertEqual(list(reversed(blocks)), list(reversed(tree)))
+        self.assertEqual(len(blocks), len(tree))
+        self.assertEqual(str(blocks.inorder_traversal()), str(tree.inorder_traversal()))
+        for low, high in ((9, 24), (1, 4), (25, 100), (20, 10)):
+            self.assertEqual(list(blocks.irange(low, high)), list(tree.irange(low, high)))
+            self.assertEqual(list(blocks.irange(low, high, (False, True), True)),
+                             list(tree.irange(low, high, (False, True), True)))
+            self.assertEqual(blocks.count_range(low, high), tree.count_range(low, high))
+            self.assertEqual(blocks.rank(high), tree.rank(high))
+        self.assertEqual([blocks.select(k) for k in range(len(tree))], list(tree))
+        self.assertEqual(blocks.contains_many([3, 5, 28]), tree.contains_many([3, 5, 28]))
+        self.assertEqual((blocks.find_min(), blocks.find_max()), (tree.find_min(), tree.find_max()))
+
+    def test_split_join_and_set_operations(self):
+        blocks = BlockList(range(0, 60, 2), block_size=4)
+        smaller, found, larger = blocks.split(30)
+        self.assertTrue(found)
+        self.assertEqual(list(smaller), list(range(0, 30, 2)))
+        joined = BlockList.join(smaller, 31, larger)
+        self.assertEqual(list(joined), list(range(0, 30, 2)) + [31] + list(range(32, 60, 2)))
+        joined.symmetric_difference(BlockList(range(0, 60, 3), block_size=4))
+        expected = (set(range(0, 30, 2)) | {31} | set(range(32, 60, 2))) ^ set(range(0, 60, 3))
+        self.assertEqual(list(joined), sorted(expected))
+        self.assertTrue(joined.is_valid())
+
+class TestShardedAVL(unittest.TestCase):
+
+    def test_routing_and_fan_out(self):
+        values = list(range(0, 200, 2))
+        tree = ShardedAVL(values, shards=4, tree_factory=AggregateAVL, seed=3)
+        self.assertEqual(len(tree.get_shards()), 4)
+        tree.add(51)
+        self.assertTrue(tree.remove(50))
+        self.assertFalse(tree.remove(49))
+        expected = sorted(set(values) - {50} | {51})
+        self.assertTrue(tree.is_valid())
+        self.assertEqual(list(tree), expected)
+        self.assertEqual(len(tree), len(expected))
+        with ThreadPoolExecutor(2) as executor:
+            self.assertEqual(tree.contains_many([51, 50, 198, -1], executor), [True, False, True, False])
+            self.assertEqual(tree.values_in_range(40, 60, (True, True), executor),
+                             [value for value in expected if 40 <= value <= 60])
+            self.assertEqual(tree.aggregate(10, 150, executor),
+                             sum(value for value in expected if 10 <= value <= 150))
+        self.assertEqual(list(tree.irange(90, 110, reverse=True)), [108, 106, 104, 102, 100, 98, 96, 94, 92, 90])
+        self.assertEqual((tree.rank(100), tree.select(50), tree.count_range(0, 9)), (50, 100, 5))
+
+    def test_explicit_boundaries(self):
+        tree = ShardedAVL([5, 15, 25, 35], boundaries=[10, 30])
+        self.assertEqual([list(shard) for shard in tree.get_shards()], [[5], [15, 25], [35]])
+        with self.assertRaises(ValueError):
+            ShardedAVL(boundaries=[30, 10])
+
+class TestWindowStats(unittest.TestCase):
+
+    def test_sliding_window(self):
+        window = WindowStats(4)
+        evicted = [window.push(value) for value in (5, 1, 4, 4, 9, 2)]
+        self.assertEqual(evicted, [None, None, None, None, 5, 1])
+        self.assertEqual(len(window), 4)
+        self.assertEqual(window.median(), 4.0)
+        self.assertEqual(window.quantile(0), 2)
+        self.assertEqual(window.quantile(1), 9)
+        self.assertAlmostEqual(window.quantile(0.9), 7.5)
+        self.assertEqual(window.rank(5), 3)
+        self.assertEqual((window.find_min(), window.find_max()), (2, 9))
+        with self.assertRaises(ValueError):
+            WindowStats(3).median()
+
+    def test_rolling_quantiles(self):
+        results = rolling_quantiles(iter([3, 1, 2, 8, 5, 5]), 3, (0.0, 0.5, 1.0))
+        self.assertEqual(list(results), [(3, 3, 3), (1, 2.0, 3), (1, 2, 3), (1, 2, 8), (2, 5, 8), (5, 5, 8)])
+
+class TestInstrumentation(unittest.TestCase):
+
+    def test_counters_and_hooks(self):
+        tree = AVL()
+        stats = enable_stats(tree)
+        events = []
+        stats.add_hook(events.append)
+        for value in (10, 20, 30, 25, 27):
+            tree.add(value)
+        self.assertTrue(tree.contains(27))
+        self.assertEqual(stats.single_rotations, 1)
+        self.assertEqual(stats.double_rotations, 1)
+        self.assertEqual(tree.stats()['operations'], {'add': 5, 'contains': 1})
+        self.assertEqual([event['rotations'] for event in events], [0, 0, 1, 0, 2, 0])
+        self.assertEqual(events[-1]['visited'], 2)
+        disable_stats(tree)
+        self.assertIs(type(tree), AVL)
+        self.assertEqual(str(tree), "AVL pre-order { 20, 10, 27, 25, 30 }")
+
+    def test_searches_run_once(self):
+        calls = []
+        tree = AVL([1, 2, 3], key=lambda value: calls.append(value) or value)
+        stats = enable_stats(tree)
+        del calls[:]
+        self.assertTrue(tree.contains(2))
+        tree.add(4)  # Goes straight below the largest value
+        self.assertEqual(calls, [2, 4])
+        self.assertEqual(stats.comparisons, 3)
+        self.assertEqual(stats.path_lengths, {1: 2})
+        self.assertEqual(list(tree), [1, 2, 3, 4])
+
+    def test_failed_operation_is_closed(self):
+        tree = AVL([1, 2, 3])
+        stats = enable_stats(tree)
+        with self.assertRaises(TypeError):
+            tree.add('x')
+        self.assertTrue(tree.contains(2))
+        tree.add(4)
+        self.assertTrue(tree.remove(1))
+        self.assertEqual(tree.stats()['operations'], {'add': 2, 'contains': 1, 'remove': 1})
+        self.assertIsNone(stats._event)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
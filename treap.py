@@ -0,0 +1,141 @@
+import random
+from linked_bst import LinkedBSTNode, LinkedBST
+
+
+# TreapNode is a node of the treap.
+class TreapNode(LinkedBSTNode):
+    def __init__(self, value: object, priority: float) -> None:
+        """
+        Initialize a treap node.
+
+        :param value: The value to be stored in the node.
+        :param priority: The random priority of the node.
+        """
+        super().__init__(value)
+        self.priority = priority  # No child has a higher priority than its parent
+
+    def __str__(self) -> str:
+        """
+        String representation of a treap node.
+
+        :return: A string representation of the node.
+        """
+        return 'Treap Node: {} (priority {:.3f})'.format(self.value, self.priority)
+
+
+# Treap is a BST whose shape is that of a random insertion order.
+class Treap(LinkedBST):
+    """
+    Treap Class.
+
+    This class gives every node a random priority and keeps the nodes in heap order of priority, so the tree
+    has the shape of a BST built by inserting the values in random order: its expected depth is O(log n)
+    whatever order the values arrive in. Updates make fewer than two rotations on average and keep no balance
+    data beyond the priority.
+    """
+    def __init__(self, start_tree=None, seed=None) -> None:
+        """
+        Initialize a treap.
+
+        :param start_tree: An iterable of values to initialize the tree.
+        :param seed: The seed of the random priorities, for reproducible shapes.
+        """
+        self._random = random.Random(seed)
+        super().__init__(start_tree)
+
+    def _create_node(self, value: object) -> TreapNode:
+        """
+        Create a detached node with a random priority.
+
+        :param value: The value to be stored in the node.
+        :return: The new node.
+        """
+        return TreapNode(value, self._random.random())
+
+    def _build_balanced(self, values: list) -> TreapNode:
+        """
+        Build a treap from a list of distinct values in ascending order in linear time, keeping the right
+        spine of the tree built so far on a stack.
+
+        :param values: The values to be stored in the tree.
+        :return: The root of the new tree, or None if values is empty.
+        """
+        self._count = len(values)
+        spine = []  # The right spine, from the root down
+        for value in values:
+            node = self._create_node(value)
+            last = None
+            while spine and spine[-1].priority < node.priority:  # Lower priorities go below the new node
+                last = spine.pop()
+            node.left = last
+            if last is not None:
+                last.parent = node
+            if spine:
+                spine[-1].right = node
+                node.parent = spine[-1]
+            spine.append(node)
+        return spine[0] if spine else None
+
+    def is_valid_treap(self) -> bool:
+        """
+        Check if the tree is a valid treap: a valid linked BST in heap order of priority.
+
+        :return: True if the tree is a valid treap, otherwise False.
+        """
+        if not self._is_linked_bst():
+            return False
+        for node in self._nodes():
+            for child in (node.left, node.right):
+                if child is not None and node.priority < child.priority:
+                    return False
+        return True
+
+    def _fix_after_insert(self, node: TreapNode) -> None:
+        """
+        Rotate a new leaf up while its priority is higher than its parent's.
+
+        :param node: The new leaf.
+        """
+        while node.parent is not None and node.parent.priority < node.priority:
+            if node is node.parent.left:
+                self._rotate_right(node.parent)
+            else:
+                self._rotate_left(node.parent)
+
+    def _remove_node(self, node: TreapNode) -> None:
+        """
+        Rotate a node down, always lifting its child of higher priority, until it has at most one child,
+        then unlink it.
+
+        :param node: The node to remove.
+        """
+        while node.left is not None and node.right is not None:
+            if node.right.priority < node.left.priority:
+                self._rotate_right(node)
+            else:
+                self._rotate_left(node)
+        self._splice(node)
+
+
+if __name__ == '__main__':
+    print("\nPDF - Treap example 1")
+    print("---------------------")
+    tree = Treap(seed=1)
+    for value in (10, 20, 30, 40, 50, 25):
+        tree.add(value)
+    print(tree)
+    tree.remove(20)
+    print(tree)
+
+    print("\nPDF - Treap add() and remove() stress test")
+    print("------------------------------------------")
+    for _ in range(100):
+        case = list(set(random.randrange(1, 20000) for _ in range(900)))
+        tree = Treap(case[:300])
+        for value in case[300:]:
+            tree.add(value)
+        for value in case[::2]:
+            tree.remove(value)
+        if not tree.is_valid_treap() or list(tree) != sorted(case[1::2]):
+            raise Exception("PROBLEM WITH ADD/REMOVE OPERATION")
+    print('add() and remove() stress test finished')
@@ -0,0 +1,199 @@
+import random
+from linked_bst import LinkedBSTNode, LinkedBST
+
+
+# WAVLNode is a node of the weak AVL tree.
+class WAVLNode(LinkedBSTNode):
+    def __init__(self, value: object) -> None:
+        """
+        Initialize a WAVL node. New nodes are leaves of rank 0.
+
+        :param value: The value to be stored in the node.
+        """
+        super().__init__(value)
+        self.rank = 0  # The rank of the node; missing children have rank -1
+
+    def __str__(self) -> str:
+        """
+        String representation of a WAVL node.
+
+        :return: A string representation of the node.
+        """
+        return 'WAVL Node: {} (rank {})'.format(self.value, self.rank)
+
+
+def _rank(node: WAVLNode) -> int:
+    """
+    Get the rank of a node.
+
+    :param node: The node, or None.
+    :return: The rank of the node, -1 for a missing node.
+    """
+    return -1 if node is None else node.rank
+
+
+# WAVL is a weak AVL tree, a rank-balanced tree between AVL and red-black trees.
+class WAVL(LinkedBST):
+    """
+    WAVL Class.
+
+    This class keeps a rank in every node such that each rank difference between a parent and a child is
+    1 or 2, and every leaf has rank 0. Built only by insertions it is an AVL tree with ranks equal to heights,
+    so searches stay as shallow; a removal never makes more than two rotations (the AVL tree may rotate at
+    every level) and rebalancing work is O(1) amortized.
+    """
+    def _create_node(self, value: object) -> WAVLNode:
+        """
+        Create a detached leaf of rank 0.
+
+        :param value: The value to be stored in the node.
+        :return: The new node.
+        """
+        return WAVLNode(value)
+
+    def _finish_built_node(self, node: WAVLNode, depth: int) -> None:
+        """
+        Rank a built node by its height, which makes the perfectly balanced tree a valid WAVL tree.
+
+        :param node: The node.
+        :param depth: The depth of the node.
+        """
+        node.rank = max(_rank(node.left), _rank(node.right)) + 1
+
+    def is_valid_wavl(self) -> bool:
+        """
+        Check if the tree is a valid WAVL tree: a valid linked BST whose rank differences are all 1 or 2,
+        with every leaf of rank 0.
+
+        :return: True if the tree is a valid WAVL tree, otherwise False.
+        """
+        if not self._is_linked_bst():
+            return False
+        for node in self._nodes():
+            if node.left is None and node.right is None and node.rank != 0:
+                return False
+            for child in (node.left, node.right):
+                if node.rank - _rank(child) not in (1, 2):
+                    return False
+        return True
+
+    def _fix_after_insert(self, node: WAVLNode) -> None:
+        """
+        Restore the rank rule after a leaf was linked. Ranks are promoted up the tree while the parent has
+        a 0-child and a 1-child, and a single or double rotation ends the fix.
+
+        :param node: The new leaf.
+        """
+        parent = node.parent
+        while parent is not None and parent.rank == node.rank:  # node is a 0-child
+            sibling = parent.right if node is parent.left else parent.left
+            if parent.rank - _rank(sibling) == 1:  # The parent is 0,1: promote it and continue above
+                parent.rank += 1
+                node, parent = parent, parent.parent
+                continue
+            # The parent is 0,2: rotate
+            if node is parent.left:
+                inner = node.right
+                if node.rank - _rank(inner) == 2:
+                    self._rotate_right(parent)
+                    parent.rank -= 1
+                else:
+                    self._rotate_left(node)
+                    self._rotate_right(parent)
+                    inner.rank += 1
+                    node.rank -= 1
+                    parent.rank -= 1
+            else:
+                inner = node.left
+                if node.rank - _rank(inner) == 2:
+                    self._rotate_left(parent)
+                    parent.rank -= 1
+                else:
+                    self._rotate_right(node)
+                    self._rotate_left(parent)
+                    inner.rank += 1
+                    node.rank -= 1
+                    parent.rank -= 1
+            return
+
+    def _remove_node(self, node: WAVLNode) -> None:
+        """
+        Unlink a node and restore the rank rule. Ranks are demoted up the tree while a 3-child appears, and
+        a single or double rotation ends the fix.
+
+        :param node: The node to remove.
+        """
+        parent, node = self._splice(self._take_successor(node))
+        if parent is None:
+            return
+        if parent.left is None and parent.right is None and parent.rank == 1:  # A 2,2 leaf: demote it
+            parent.rank = 0
+            node, parent = parent, parent.parent
+        while parent is not None and parent.rank - _rank(node) == 3:  # node is a 3-child
+            if node is parent.left:
+                sibling = parent.right
+            else:
+                sibling = parent.left
+            if parent.rank - sibling.rank == 2:  # The parent is 3,2: demote it and continue above
+                parent.rank -= 1
+            elif sibling.rank - _rank(sibling.left) == 2 and sibling.rank - _rank(sibling.right) == 2:
+                parent.rank -= 1  # The sibling is 2,2: demote both and continue above
+                sibling.rank -= 1
+            else:
+                self._rotate_after_remove(parent, sibling, node is parent.left)
+                return
+            node, parent = parent, parent.parent
+
+    def _rotate_after_remove(self, parent: WAVLNode, sibling: WAVLNode, left_side: bool) -> None:
+        """
+        Fix a 3,1 parent whose 1-child is not 2,2 with a single or double rotation.
+
+        :param parent: The parent of the 3-child.
+        :param sibling: The sibling of the 3-child.
+        :param left_side: Whether the 3-child is the left child of the parent.
+        """
+        outer = sibling.right if left_side else sibling.left
+        if sibling.rank - _rank(outer) == 1:  # Single rotation
+            if left_side:
+                self._rotate_left(parent)
+            else:
+                self._rotate_right(parent)
+            sibling.rank += 1
+            parent.rank -= 1
+            if parent.left is None and parent.right is None:  # Never leave a 2,2 leaf
+                parent.rank -= 1
+        else:  # Double rotation through the inner nephew
+            inner = sibling.left if left_side else sibling.right
+            if left_side:
+                self._rotate_right(sibling)
+                self._rotate_left(parent)
+            else:
+                self._rotate_left(sibling)
+                self._rotate_right(parent)
+            inner.rank += 2
+            sibling.rank -= 1
+            parent.rank -= 2
+
+
+if __name__ == '__main__':
+    print("\nPDF - WAVL example 1")
+    print("--------------------")
+    tree = WAVL()
+    for value in (10, 20, 30, 40, 50, 25):
+        tree.add(value)
+    print(tree)
+    tree.remove(20)
+    print(tree)
+
+    print("\nPDF - WAVL add() and remove() stress test")
+    print("-----------------------------------------")
+    for _ in range(100):
+        case = list(set(random.randrange(1, 20000) for _ in range(900)))
+        tree = WAVL(case[:300])
+        for value in case[300:]:
+            tree.add(value)
+        for value in case[::2]:
+            tree.remove(value)
+        if not tree.is_valid_wavl() or list(tree) != sorted(case[1::2]):
+            raise Exception("PROBLEM WITH ADD/REMOVE OPERATION")
+    print('add() and remove() stress test finished')
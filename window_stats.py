@@ -0,0 +1,167 @@
+import math
+import random
+from collections import deque
+from avl_multiset import AVLMultiset
+
+
+# WindowStats keeps order statistics of the most recent values of a stream.
+class WindowStats:
+    """
+    WindowStats Class.
+
+    This class keeps the last window_size values of a stream twice: in arrival order in a deque, to know which
+    value expires next, and in an AVLMultiset, which holds duplicates and answers order statistics. Each new
+    value costs one insertion plus, once the window is full, one removal, and median(), quantile() and rank()
+    then cost O(log window_size) instead of sorting the window.
+    """
+    def __init__(self, window_size: int) -> None:
+        """
+        Initialize an empty window.
+
+        :param window_size: The number of most recent values to keep.
+        :raises ValueError: If window_size is less than 1.
+        """
+        if window_size < 1:
+            raise ValueError("window_size must be at least 1")
+        self._window_size = window_size
+        self._arrivals = deque()  # The values of the window, oldest first
+        self._values = AVLMultiset()  # The same values, in sorted order
+
+    def __str__(self) -> str:
+        """
+        String representation of the window.
+
+        :return: A string representation of the values in the window, oldest first.
+        """
+        return "WindowStats { " + ", ".join(str(value) for value in self._arrivals) + " }"
+
+    def __len__(self) -> int:
+        """
+        Return the number of values in the window.
+
+        :return: The number of values, at most window_size.
+        """
+        return len(self._arrivals)
+
+    def push(self, value: object) -> object:
+        """
+        Add the newest value of the stream, evicting the oldest one if the window is full.
+
+        :param value: The new value.
+        :return: The evicted value, or None if the window was not full.
+        """
+        self._arrivals.append(value)
+        self._values.add(value)
+        if len(self._arrivals) > self._window_size:
+            evicted = self._arrivals.popleft()
+            self._values.remove(evicted)
+            return evicted
+        return None
+
+    def median(self) -> object:
+        """
+        Get the median of the window: the middle value, or the mean of the two middle values if the window
+        holds an even number of them.
+
+        :return: The median.
+        :raises ValueError: If the window is empty.
+        """
+        count = len(self._arrivals)
+        if count == 0:
+            raise ValueError("median of an empty window")
+        if count % 2:
+            return self._values.select(count // 2)
+        return (self._values.select(count // 2 - 1) + self._values.select(count // 2)) / 2
+
+    def quantile(self, q: float) -> object:
+        """
+        Get a quantile of the window, interpolating linearly between the two nearest ranks (the default method
+        of numpy.quantile), so quantile(0.5) equals median().
+
+        :param q: The quantile, between 0 and 1.
+        :return: The quantile.
+        :raises ValueError: If the window is empty or q is outside [0, 1].
+        """
+        if not 0 <= q <= 1:
+            raise ValueError("q must be between 0 and 1")
+        count = len(self._arrivals)
+        if count == 0:
+            raise ValueError("quantile of an empty window")
+        position = q * (count - 1)
+        low = math.floor(position)
+        fraction = position - low
+        value = self._values.select(low)
+        if fraction == 0:
+            return value
+        return value + (self._values.select(low + 1) - value) * fraction
+
+    def rank(self, value: object) -> int:
+        """
+        Count the values in the window that are strictly less than a given value.
+
+        :param value: The value to rank. It does not need to be in the window.
+        :return: The number of values less than value.
+        """
+        return self._values.rank(value)
+
+    def find_min(self) -> object:
+        """
+        Find the smallest value in the window.
+
+        :return: The smallest value, or None if the window is empty.
+        """
+        return self._values.find_min()
+
+    def find_max(self) -> object:
+        """
+        Find the largest value in the window.
+
+        :return: The largest value, or None if the window is empty.
+        """
+        return self._values.find_max()
+
+
+def rolling_quantiles(values, window_size: int, quantiles=(0.5,)):
+    """
+    Lazily compute quantiles over a sliding window of a stream, one result per value, without materializing
+    the windows.
+
+    :param values: An iterable (or generator) of values.
+    :param window_size: The number of most recent values each result covers.
+    :param quantiles: The quantiles to compute, each between 0 and 1.
+    :return: A generator of tuples, one per value of the stream, with the quantiles of the window ending at it.
+    """
+    window = WindowStats(window_size)
+    for value in values:
+        window.push(value)
+        yield tuple(window.quantile(q) for q in quantiles)
+
+
+if __name__ == '__main__':
+    print("\nPDF - WindowStats example 1")
+    print("---------------------------")
+    window = WindowStats(4)
+    for value in (5, 1, 4, 4, 9, 2):
+        window.push(value)
+        print(window, "median:", window.median(), "p90:", round(window.quantile(0.9), 2), "rank(4):", window.rank(4))
+
+    print("\nPDF - rolling_quantiles() example 1")
+    print("-----------------------------------")
+    print(list(rolling_quantiles([3, 1, 2, 8, 5, 5], 3, (0.0, 0.5, 1.0))))
+
+    print("\nPDF - WindowStats stress test")
+    print("-----------------------------")
+    for _ in range(20):
+        stream = [random.randrange(50) for _ in range(500)]
+        size = random.randrange(1, 40)
+        for index, (median, p99) in enumerate(rolling_quantiles(stream, size, (0.5, 0.99))):
+            ordered = sorted(stream[max(0, index + 1 - size):index + 1])
+            position = 0.99 * (len(ordered) - 1)
+            low = math.floor(position)
+            high = min(low + 1, len(ordered) - 1)
+            expected = ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+            middle = len(ordered) // 2
+            expected_median = ordered[middle] if len(ordered) % 2 else (ordered[middle - 1] + ordered[middle]) / 2
+            if median != expected_median or abs(p99 - expected) > 1e-9:
+                raise Exception("PROBLEM WITH QUANTILE OPERATION")
+    print('quantile stress test finished')